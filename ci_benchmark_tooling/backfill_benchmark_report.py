@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime
+import logging
+import typing
+
+import daiquiri
+
+from ci_benchmark_tooling import cache
+from ci_benchmark_tooling import constants
+from ci_benchmark_tooling import create_benchmark_report
+from ci_benchmark_tooling import instrumentation
+from ci_benchmark_tooling import rate_limit
+from ci_benchmark_tooling import report_writer
+from ci_benchmark_tooling import steps
+from ci_benchmark_tooling import transport
+from ci_benchmark_tooling import utils
+
+
+if typing.TYPE_CHECKING:
+    from ci_benchmark_tooling import types
+
+
+daiquiri.setup(level=logging.INFO)
+LOG = daiquiri.getLogger(__name__)
+
+
+def parse_date(date_str: str) -> datetime.datetime:
+    try:
+        date = datetime.datetime.fromisoformat(date_str)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"Invalid date `{date_str}`, expected an ISO 8601 date",
+        ) from None
+
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=constants.UTC)
+    return date
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Create a benchmark report from every benchmark workflow run of a date range",
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    parser.add_argument(
+        "--since",
+        type=parse_date,
+        required=True,
+        metavar="DATE",
+        help="Only use the benchmark workflows runs created at or after DATE (ISO 8601, UTC if no timezone).",
+    )
+    parser.add_argument(
+        "--until",
+        type=parse_date,
+        default=None,
+        metavar="DATE",
+        help="Only use the benchmark workflows runs created before DATE (ISO 8601, UTC if no timezone), defaults to now.",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=constants.DEFAULT_MAX_CONCURRENCY,
+        help="Maximum number of requests in flight at the same time per ci provider.",
+    )
+    create_benchmark_report.add_report_arguments(parser)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = get_parser()
+
+    args = parser.parse_args(argv)
+    if args.until is not None and args.until <= args.since:
+        parser.error("--until must be after --since")
+    if args.check_regressions and args.store is None:
+        parser.error("--check-regressions requires a --store")
+
+    github_repository = utils.get_required_env_variable("GITHUB_REPOSITORY")
+    repo_owner, repo_name = github_repository.split("/")
+
+    response_cache = cache.ResponseCache() if args.use_cache else None
+    steps_grouping = (
+        steps.StepsGrouping(utils.get_benchmark_steps_groups())
+        if args.detailed_steps
+        else None
+    )
+
+    workflows_ids_per_ci: list[tuple[types.CiToBenchmark, list[str]]] = []
+    for ci_to_benchmark in utils.CIS_TO_BENCHMARK:
+        ci_prefix = ci_to_benchmark["workflow_ids_env_variable_prefix"]
+        with ci_to_benchmark["client"](
+            utils.get_required_env_variable(ci_to_benchmark["token_env_variable"]),
+            response_cache=response_cache,
+        ) as client:
+            workflows_runs = client.get_benchmark_workflows_runs(
+                repo_owner,
+                repo_name,
+                args.since,
+                args.until,
+            )
+
+        # Oldest first, so the report is in chronological order
+        workflows_ids = list(
+            dict.fromkeys(
+                run.workflow_id
+                for run in sorted(workflows_runs, key=lambda run: run.created_at)
+                if run.finished
+            ),
+        )
+        LOG.info(
+            "%d finished benchmark workflows runs to backfill for %s",
+            len(workflows_ids),
+            ci_prefix,
+            unfinished_runs=sum(not run.finished for run in workflows_runs),
+        )
+        workflows_ids_per_ci.append((ci_to_benchmark, workflows_ids))
+
+    with report_writer.ReportWriter(
+        create_benchmark_report.OUTPUT_CSV_FILE,
+        parameters=create_benchmark_report.get_report_parameters(
+            "backfill-benchmark-report",
+            repo_owner,
+            repo_name,
+            workflows_ids_per_ci,
+            since=args.since.isoformat(),
+            until=None if args.until is None else args.until.isoformat(),
+            detailed_steps=steps_grouping is not None,
+        ),
+    ) as report:
+        # Skip the workflows runs already written before an interruption
+        workflows_ids_per_ci = [
+            (ci_to_benchmark, [i for i in ids if i not in report.workflows_ids])
+            for ci_to_benchmark, ids in workflows_ids_per_ci
+        ]
+
+        asyncio.run(
+            create_benchmark_report.write_workflows_data_async(
+                report,
+                workflows_ids_per_ci,
+                repo_owner,
+                repo_name,
+                args.max_concurrency,
+                response_cache,
+                steps_grouping,
+            ),
+        )
+
+        ret = create_benchmark_report.write_report_analyses(args, report)
+        report.commit()
+
+    rate_limit.log_budgets()
+    transport.log_connection_timings()
+    if args.instrumentation is not None:
+        instrumentation.write_export(args.instrumentation, args.instrumentation_format)
+    return ret
@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import collections
+import itertools
+import typing
+
+import numpy as np
+import numpy.typing as npt
+
+from ci_benchmark_tooling import benchmark_table
+from ci_benchmark_tooling import steps
+
+
+if typing.TYPE_CHECKING:
+    from collections import abc
+
+    from ci_benchmark_tooling import types
+
+
+# Samples with a modified z-score above this value are considered outliers,
+# as recommended by Iglewicz and Hoaglin.
+OUTLIER_MODIFIED_Z_SCORE = 3.5
+BOOTSTRAP_RESAMPLES = 10000
+CONFIDENCE_LEVEL = 0.95
+# Below this number of samples, once the outliers are rejected, the bootstrap
+# confidence interval collapses to a few points and tells nothing
+MIN_SAMPLES = 3
+
+FloatArray = npt.NDArray[np.float64]
+
+
+class Configuration(typing.NamedTuple):
+    ci_provider: str
+    runner_os: str
+    runner_type: str
+    runner_cores: int
+    tested_repository: str
+    step_name: str
+    additional_infos: str
+
+    @classmethod
+    def from_csv_data_line(cls, line: types.CsvDataLine) -> Configuration:
+        return cls(
+            ci_provider=line.ci_provider,
+            runner_os=line.runner_os,
+            runner_type=line.runner_type,
+            runner_cores=line.runner_cores,
+            tested_repository=line.tested_repository,
+            step_name=line.step_name,
+            additional_infos=line.additional_infos,
+        )
+
+    def __str__(self) -> str:
+        name = f"{self.ci_provider} - {self.runner_os} - {self.runner_type} - {self.runner_cores} cores"
+        if self.additional_infos:
+            name += f" - {self.additional_infos}"
+        return name
+
+
+class ConfigurationStatistics(typing.NamedTuple):
+    configuration: Configuration
+    samples: int
+    outliers: int
+    mean: float
+    stddev: float
+    # `None` when there are less than `MIN_SAMPLES` samples
+    ci_low: float | None
+    ci_high: float | None
+
+
+class Comparison(typing.NamedTuple):
+    first: Configuration
+    second: Configuration
+    # Mean of `first` minus mean of `second`, negative when `first` is faster
+    mean_difference: float
+    # `None` when any of the configurations has less than `MIN_SAMPLES` samples
+    ci_low: float | None
+    ci_high: float | None
+
+    @property
+    def significant(self) -> bool:
+        # The difference is significant if the confidence interval excludes 0
+        if self.ci_low is None or self.ci_high is None:
+            return False
+        return self.ci_low > 0 or self.ci_high < 0
+
+    @property
+    def verdict(self) -> str:
+        if self.ci_low is None:
+            return "Not enough samples"
+        if not self.significant:
+            return "No significant difference"
+        if self.mean_difference < 0:
+            return f"{self.first} is faster"
+        return f"{self.second} is faster"
+
+
+def get_outliers_mask(samples: FloatArray) -> npt.NDArray[np.bool_]:
+    """
+    Returns a mask of the outliers of `samples`, based on the modified z-score
+    which uses the median absolute deviation (MAD).
+    """
+    median = float(np.median(samples))
+    mad = float(np.median(np.abs(samples - median)))
+    if mad == 0:
+        # More than half of the samples are identical, we can't tell outliers apart
+        return np.zeros(samples.shape, dtype=np.bool_)
+
+    modified_z_scores = 0.6745 * (samples - median) / mad
+    return typing.cast(
+        npt.NDArray[np.bool_],
+        np.abs(modified_z_scores) > OUTLIER_MODIFIED_Z_SCORE,
+    )
+
+
+def bootstrap_means(samples: FloatArray, rng: np.random.Generator) -> FloatArray:
+    """
+    Returns the means of `BOOTSTRAP_RESAMPLES` resamples, with replacement, of `samples`.
+    """
+    indexes = rng.integers(0, len(samples), size=(BOOTSTRAP_RESAMPLES, len(samples)))
+    return typing.cast(FloatArray, samples[indexes].mean(axis=1))
+
+
+def get_confidence_interval(values: FloatArray) -> tuple[float, float]:
+    alpha = (1 - CONFIDENCE_LEVEL) / 2
+    low, high = np.quantile(values, [alpha, 1 - alpha])
+    return float(low), float(high)
+
+
+def get_configurations_samples(
+    csv_data: abc.Iterable[types.CsvDataLine],
+) -> dict[Configuration, FloatArray]:
+    return {
+        Configuration(*typing.cast(tuple[typing.Any, ...], key)): times
+        for key, times in benchmark_table.BenchmarkTable.from_csv_data(csv_data)
+        .group_by(Configuration._fields)
+        .items()
+    }
+
+
+def get_statistics(
+    samples_per_configuration: dict[Configuration, FloatArray],
+    rng: np.random.Generator,
+) -> list[ConfigurationStatistics]:
+    """
+    Returns the statistics of each configuration, computed on its samples
+    without the outliers.
+    """
+    statistics = []
+    for configuration, samples in samples_per_configuration.items():
+        outliers_mask = get_outliers_mask(samples)
+        kept_samples = samples[~outliers_mask]
+
+        ci_low = ci_high = None
+        if len(kept_samples) >= MIN_SAMPLES:
+            ci_low, ci_high = get_confidence_interval(
+                bootstrap_means(kept_samples, rng),
+            )
+
+        statistics.append(
+            ConfigurationStatistics(
+                configuration,
+                len(kept_samples),
+                int(outliers_mask.sum()),
+                float(kept_samples.mean()),
+                float(kept_samples.std(ddof=1)) if len(kept_samples) > 1 else 0.0,
+                ci_low,
+                ci_high,
+            ),
+        )
+
+    return statistics
+
+
+def get_comparisons(
+    samples_per_configuration: dict[Configuration, FloatArray],
+    rng: np.random.Generator,
+) -> list[Comparison]:
+    """
+    Compare each pair of configurations of the same step of the benchmarked
+    application build of the same repository, using the bootstrap confidence
+    interval of the difference of their means.
+    """
+    configurations_per_step: dict[
+        tuple[str, str],
+        list[Configuration],
+    ] = collections.defaultdict(list)
+    for configuration in samples_per_configuration:
+        if steps.is_build_step(configuration.step_name):
+            configurations_per_step[
+                (configuration.tested_repository, configuration.step_name)
+            ].append(configuration)
+
+    kept_samples = {
+        configuration: samples[~get_outliers_mask(samples)]
+        for configuration, samples in samples_per_configuration.items()
+    }
+
+    comparisons = []
+    for configurations in configurations_per_step.values():
+        for first, second in itertools.combinations(sorted(configurations), 2):
+            ci_low = ci_high = None
+            if min(len(kept_samples[first]), len(kept_samples[second])) >= MIN_SAMPLES:
+                differences = bootstrap_means(
+                    kept_samples[first],
+                    rng,
+                ) - bootstrap_means(kept_samples[second], rng)
+                ci_low, ci_high = get_confidence_interval(differences)
+
+            comparisons.append(
+                Comparison(
+                    first,
+                    second,
+                    float(kept_samples[first].mean() - kept_samples[second].mean()),
+                    ci_low,
+                    ci_high,
+                ),
+            )
+
+    return comparisons
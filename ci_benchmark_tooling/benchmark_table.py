@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import array
+import typing
+
+import numpy as np
+import numpy.typing as npt
+
+from ci_benchmark_tooling import store
+from ci_benchmark_tooling import types
+
+
+if typing.TYPE_CHECKING:
+    from collections import abc
+
+
+STRING_COLUMNS = (
+    "ci_provider",
+    "runner_os",
+    "runner_type",
+    "tested_repository",
+    "step_name",
+    "additional_infos",
+)
+INTEGER_COLUMNS = ("runner_cores",)
+FLOAT_COLUMNS = ("time_spent_in_secs",)
+
+# Strings are dictionary-encoded as unsigned 32 bits codes, as in the store
+STRING_CODE_TYPECODE = "I"
+INTEGER_TYPECODE = "q"
+FLOAT_TYPECODE = "d"
+# Whether each time was an `int`, the times of the reports without the
+# detailed steps being whole seconds
+INTEGRAL_TYPECODE = "B"
+
+FloatArray = npt.NDArray[np.float64]
+ColumnValueT = str | int | float
+
+
+class BenchmarkTable:
+    """
+    Columnar in-memory table of `types.CsvDataLine`.
+
+    The string columns are dictionary-encoded, each distinct value being
+    stored once whatever the number of rows, and the other columns are
+    arrays of machine integers and floats, readable as NumPy arrays without
+    any copy. A table iterates as the `types.CsvDataLine` it was built from.
+
+    The tables filtered from a table share its dictionaries.
+    """
+
+    def __init__(self, dictionaries: dict[str, list[str]] | None = None) -> None:
+        self.dictionaries = dictionaries or {column: [] for column in STRING_COLUMNS}
+        self._codes = {
+            column: {value: code for code, value in enumerate(dictionary)}
+            for column, dictionary in self.dictionaries.items()
+        }
+        self.columns: dict[str, array.array[typing.Any]] = {
+            **{column: array.array(STRING_CODE_TYPECODE) for column in STRING_COLUMNS},
+            **{column: array.array(INTEGER_TYPECODE) for column in INTEGER_COLUMNS},
+            **{column: array.array(FLOAT_TYPECODE) for column in FLOAT_COLUMNS},
+        }
+        self._integral_times = array.array(INTEGRAL_TYPECODE)
+
+    @classmethod
+    def from_csv_data(
+        cls,
+        csv_data: abc.Iterable[types.CsvDataLine],
+    ) -> BenchmarkTable:
+        if isinstance(csv_data, BenchmarkTable):
+            return csv_data
+
+        table = cls()
+        table.extend(csv_data)
+        return table
+
+    def __len__(self) -> int:
+        return len(self._integral_times)
+
+    def _get_code(self, column: str, value: str) -> int:
+        codes = self._codes[column]
+        if value not in codes:
+            codes[value] = len(self.dictionaries[column])
+            self.dictionaries[column].append(value)
+        return codes[value]
+
+    def append(self, line: types.CsvDataLine) -> None:
+        for column in STRING_COLUMNS:
+            self.columns[column].append(self._get_code(column, getattr(line, column)))
+        for column in INTEGER_COLUMNS + FLOAT_COLUMNS:
+            self.columns[column].append(getattr(line, column))
+        self._integral_times.append(isinstance(line.time_spent_in_secs, int))
+
+    def extend(self, csv_data: abc.Iterable[types.CsvDataLine]) -> None:
+        for line in csv_data:
+            self.append(line)
+
+    def __iter__(self) -> abc.Iterator[types.CsvDataLine]:
+        # The strings are the ones of the dictionaries, not copies
+        strings = [
+            map(self.dictionaries[column].__getitem__, self.columns[column])
+            for column in STRING_COLUMNS
+        ]
+        for (
+            ci_provider,
+            runner_os,
+            runner_type,
+            tested_repository,
+            step_name,
+            additional_infos,
+            runner_cores,
+            time_spent_in_secs,
+            integral_time,
+        ) in zip(
+            *strings,
+            self.columns["runner_cores"],
+            self.columns["time_spent_in_secs"],
+            self._integral_times,
+            strict=True,
+        ):
+            yield types.CsvDataLine(
+                ci_provider=ci_provider,
+                runner_os=runner_os,
+                runner_type=runner_type,
+                runner_cores=runner_cores,
+                tested_repository=tested_repository,
+                step_name=step_name,
+                time_spent_in_secs=int(time_spent_in_secs)
+                if integral_time
+                else time_spent_in_secs,
+                additional_infos=additional_infos,
+            )
+
+    def get_column(self, column: str) -> npt.NDArray[typing.Any]:
+        """
+        Returns the raw values of `column`, which are codes of
+        `self.dictionaries[column]` for string columns, as a read-only view.
+        """
+        values = self.columns[column]
+        view = np.frombuffer(values, dtype=values.typecode)
+        view.flags.writeable = False
+        return view
+
+    def _decode(self, column: str, value: int) -> ColumnValueT:
+        if column in STRING_COLUMNS:
+            return self.dictionaries[column][value]
+        return value
+
+    def _take(self, indexes: npt.NDArray[np.intp]) -> BenchmarkTable:
+        table = BenchmarkTable(self.dictionaries)
+        for column, _values in self.columns.items():
+            table.columns[column].frombytes(self.get_column(column)[indexes].tobytes())
+        table._integral_times.frombytes(
+            np.frombuffer(self._integral_times, dtype=np.uint8)[indexes].tobytes(),
+        )
+        return table
+
+    def filter(
+        self,
+        filters: abc.Mapping[str, abc.Collection[ColumnValueT]],
+    ) -> BenchmarkTable:
+        """
+        Returns the rows whose value of each column of `filters` is one of
+        its values.
+        """
+        mask = np.ones(len(self), dtype=np.bool_)
+        for column, values in filters.items():
+            if column in STRING_COLUMNS:
+                codes = self._codes[column]
+                filter_values: list[ColumnValueT] = [
+                    codes[v] for v in values if isinstance(v, str) and v in codes
+                ]
+            else:
+                filter_values = list(values)
+            mask &= np.isin(self.get_column(column), filter_values)
+
+        return self._take(np.flatnonzero(mask))
+
+    def group_by(
+        self,
+        columns: abc.Sequence[str],
+    ) -> dict[tuple[ColumnValueT, ...], FloatArray]:
+        """
+        Returns the times spent of the rows of each group of `columns`, the
+        string and integer ones, in the order the groups first appear in the
+        table.
+        """
+        return {
+            tuple(
+                self._decode(column, value)
+                for column, value in zip(columns, key, strict=True)
+            ): times
+            for key, times in store.get_groups(
+                [self.get_column(column) for column in columns],
+                self.get_column("time_spent_in_secs"),
+            )
+        }
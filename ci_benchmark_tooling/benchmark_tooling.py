@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark of the report generation of this tooling, replaying the
+responses of synthetic benchmark workflows runs.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import datetime
+import json
+import logging
+import os
+import pathlib
+import statistics
+import sys
+import tempfile
+import time
+import typing
+import uuid
+
+import daiquiri
+
+from ci_benchmark_tooling import constants
+from ci_benchmark_tooling import create_benchmark_report
+from ci_benchmark_tooling import fixtures
+from ci_benchmark_tooling import report_writer
+from ci_benchmark_tooling import utils
+
+
+if typing.TYPE_CHECKING:
+    from ci_benchmark_tooling import types
+
+
+daiquiri.setup(level=logging.WARNING)
+LOG = daiquiri.getLogger(__name__)
+
+DEFAULT_JOBS_COUNTS = (10, 100, 1000)
+SYNTHETIC_REPOSITORY = "synthetic-owner/synthetic-repository"
+SYNTHETIC_WORKFLOW_NAME = "Benchmark CPython"
+SYNTHETIC_CIRCLECI_JOB_NAME = "CPython - Ubuntu"
+SYNTHETIC_STEPS = (
+    "Clone CPython",
+    "Install Dependencies",
+    "Configure CPython",
+    "Build CPython",
+    "Run tests",
+)
+SYNTHETIC_CREATED_AT = datetime.datetime(2023, 6, 1, tzinfo=constants.UTC)
+
+GITHUB_API_URL = "https://api.github.com"
+CIRCLECI_API_URL = "https://circleci.com/api"
+
+
+class BenchmarkResult(typing.NamedTuple):
+    jobs: int
+    mode: str
+    rounds: int
+    min_secs: float
+    median_secs: float
+    mean_secs: float
+
+
+def get_date(offset_secs: float) -> str:
+    return (SYNTHETIC_CREATED_AT + datetime.timedelta(seconds=offset_secs)).isoformat()
+
+
+def get_json_interaction(
+    url: str,
+    data: typing.Any,
+    headers: dict[str, str] | None = None,
+) -> fixtures.Interaction:
+    return {
+        "method": "GET",
+        "url": url,
+        "status_code": 200,
+        "headers": {"Content-Type": "application/json", **(headers or {})},
+        "content": base64.b64encode(json.dumps(data).encode()).decode(),
+    }
+
+
+def get_github_interactions(
+    run_id: int,
+    jobs: int,
+) -> list[fixtures.Interaction]:
+    repository_url = f"{GITHUB_API_URL}/repos/{SYNTHETIC_REPOSITORY}"
+    jobs_url = f"{repository_url}/actions/runs/{run_id}/jobs"
+    interactions = [
+        get_json_interaction(
+            f"{repository_url}/actions/runs/{run_id}",
+            {
+                "id": run_id,
+                "workflow_id": 1,
+                "name": SYNTHETIC_WORKFLOW_NAME,
+                "event": "workflow_dispatch",
+                "status": "completed",
+                "conclusion": "success",
+                "jobs_url": jobs_url,
+                "head_sha": "0" * 40,
+                "run_attempt": 1,
+                "run_started_at": get_date(0),
+                "created_at": get_date(0),
+                "updated_at": get_date(jobs + 3600),
+            },
+        ),
+    ]
+
+    per_page = constants.PAGINATION_PER_PAGE
+    last_page = max((jobs + per_page - 1) // per_page, 1)
+    for page in range(1, last_page + 1):
+        page_jobs = []
+        for job_number in range((page - 1) * per_page, min(page * per_page, jobs)):
+            started_at = job_number % 60
+            steps_names = ("Set up job", *SYNTHETIC_STEPS, "Complete job")
+            page_jobs.append(
+                {
+                    "id": run_id * 10000 + job_number,
+                    "run_id": run_id,
+                    "name": f"CPython - ubuntu-22.04 - GitHub-Hosted - {2 ** (job_number % 4 + 1)} cores",
+                    "status": "completed",
+                    "conclusion": "success",
+                    "created_at": get_date(0),
+                    "started_at": get_date(started_at),
+                    "completed_at": get_date(started_at + 60 * len(steps_names)),
+                    "steps": [
+                        {
+                            "name": step_name,
+                            "status": "completed",
+                            "conclusion": "success",
+                            "number": number + 1,
+                            "started_at": get_date(started_at + 60 * number),
+                            "completed_at": get_date(
+                                started_at + 60 * number + 30 + job_number % 30,
+                            ),
+                        }
+                        for number, step_name in enumerate(steps_names)
+                    ],
+                    "labels": ["ubuntu-22.04"],
+                    "runner_name": f"runner-{job_number}",
+                    "workflow_name": SYNTHETIC_WORKFLOW_NAME,
+                },
+            )
+
+        links = []
+        if page < last_page:
+            links.append(
+                f'<{jobs_url}?per_page={per_page}&page={page + 1}>; rel="next"',
+            )
+            links.append(
+                f'<{jobs_url}?per_page={per_page}&page={last_page}>; rel="last"',
+            )
+
+        interactions.append(
+            get_json_interaction(
+                f"{jobs_url}?per_page={per_page}"
+                + ("" if page == 1 else f"&page={page}"),
+                {"total_count": jobs, "jobs": page_jobs},
+                {"Link": ", ".join(links)} if links else None,
+            ),
+        )
+
+    return interactions
+
+
+def get_circleci_interactions(
+    workflow_id: str,
+    first_job_number: int,
+    jobs: int,
+) -> list[fixtures.Interaction]:
+    workflow_url = f"{CIRCLECI_API_URL}/v2/workflow/{workflow_id}"
+    with open(utils.DOT_CIRCLECI_FOLDER / "config.yml") as f:
+        circle_yml = f.read()
+
+    interactions = [
+        get_json_interaction(
+            workflow_url,
+            {
+                "id": workflow_id,
+                "name": SYNTHETIC_WORKFLOW_NAME,
+                "pipeline_id": str(uuid.UUID(int=0)),
+                "status": "success",
+                "created_at": get_date(0),
+                "stopped_at": get_date(jobs + 3600),
+            },
+        ),
+    ]
+
+    workflow_jobs = [
+        {
+            "id": str(uuid.UUID(int=first_job_number + job_number)),
+            "job_number": first_job_number + job_number,
+            "name": SYNTHETIC_CIRCLECI_JOB_NAME,
+            "type": "build",
+            "status": "success",
+            "started_at": get_date(job_number % 60),
+            "stopped_at": get_date(job_number % 60 + 60 * len(SYNTHETIC_STEPS)),
+            "dependencies": [],
+        }
+        for job_number in range(jobs)
+    ]
+    per_page = constants.PAGINATION_PER_PAGE
+    for start in range(0, max(jobs, 1), per_page):
+        next_page_token = (
+            f"page-{start + per_page}" if start + per_page < jobs else None
+        )
+        interactions.append(
+            get_json_interaction(
+                f"{workflow_url}/job"
+                + ("" if start == 0 else f"?page-token=page-{start}"),
+                {
+                    "items": workflow_jobs[start : start + per_page],
+                    "next_page_token": next_page_token,
+                },
+            ),
+        )
+
+    for job_number, job in enumerate(workflow_jobs):
+        started_at = job_number % 60
+        interactions.append(
+            get_json_interaction(
+                f"{CIRCLECI_API_URL}/v1.1/project/github/{SYNTHETIC_REPOSITORY}/{job['job_number']}",
+                {
+                    "build_num": job["job_number"],
+                    "vcs_revision": "0" * 40,
+                    "lifecycle": "finished",
+                    "status": "success",
+                    "start_time": get_date(started_at),
+                    "stop_time": job["stopped_at"],
+                    "circle_yml": {"string": circle_yml},
+                    "picard": {
+                        "resource_class": {
+                            "class": "medium",
+                            "name": "Medium",
+                            "cpu": 2 ** (job_number % 4 + 1),
+                            "ram": 7680,
+                        },
+                    },
+                    "workflows": {
+                        "job_name": SYNTHETIC_CIRCLECI_JOB_NAME,
+                        "workflow_name": SYNTHETIC_WORKFLOW_NAME,
+                        "workflow_id": workflow_id,
+                    },
+                    "steps": [
+                        {
+                            "name": step_name,
+                            "actions": [
+                                {
+                                    "status": "success",
+                                    "run_time_millis": 1000 * (30 + job_number % 30)
+                                    + number,
+                                    "start_time": get_date(started_at + 60 * number),
+                                    "end_time": get_date(
+                                        started_at + 60 * number + 30,
+                                    ),
+                                },
+                            ],
+                        }
+                        for number, step_name in enumerate(
+                            ("Spin up environment", *SYNTHETIC_STEPS),
+                        )
+                    ],
+                },
+            ),
+        )
+
+    return interactions
+
+
+def write_synthetic_fixtures(
+    path: pathlib.Path,
+    jobs: int,
+) -> list[tuple[types.CiToBenchmark, list[str]]]:
+    """
+    Writes the fixtures of a benchmark workflow run of `jobs` jobs on each ci
+    provider to `path`, and returns the id of the runs per ci provider.
+    """
+    github_run_id = 1
+    circleci_workflow_id = str(uuid.UUID(int=1))
+    fixtures.write_interactions(
+        path,
+        [
+            *get_github_interactions(github_run_id, jobs),
+            *get_circleci_interactions(circleci_workflow_id, 1, jobs),
+        ],
+    )
+
+    workflows_ids = {
+        constants.GITHUB_WORKFLOW_IDS_ENV_PREFIX: [str(github_run_id)],
+        constants.CIRCLECI_WORKFLOW_IDS_ENV_PREFIX: [circleci_workflow_id],
+    }
+    return [
+        (ci, workflows_ids[ci["workflow_ids_env_variable_prefix"]])
+        for ci in utils.CIS_TO_BENCHMARK
+    ]
+
+
+def generate_report(
+    report_path: pathlib.Path,
+    workflows_ids_per_ci: list[tuple[types.CiToBenchmark, list[str]]],
+    use_async: bool,
+    max_concurrency: int,
+) -> None:
+    owner, repository = SYNTHETIC_REPOSITORY.split("/")
+    with report_writer.ReportWriter(report_path) as report:
+        if use_async:
+            asyncio.run(
+                create_benchmark_report.write_workflows_data_async(
+                    report,
+                    workflows_ids_per_ci,
+                    owner,
+                    repository,
+                    max_concurrency,
+                    None,
+                    None,
+                ),
+            )
+        else:
+            for ci_to_benchmark, workflows_ids in workflows_ids_per_ci:
+                with ci_to_benchmark["client"](
+                    utils.get_required_env_variable(
+                        ci_to_benchmark["token_env_variable"],
+                    ),
+                ) as client:
+                    for (
+                        workflow_data
+                    ) in client.generate_workflows_data_from_workflows_ids(
+                        workflows_ids,
+                        owner,
+                        repository,
+                    ):
+                        report.write(workflow_data)
+
+        # Read back the data the analyses are computed from
+        report.read_table()
+        report.commit()
+
+
+def run_benchmark(
+    directory: pathlib.Path,
+    jobs: int,
+    use_async: bool,
+    rounds: int,
+    latency_secs: float,
+    max_concurrency: int,
+) -> BenchmarkResult:
+    fixtures_path = directory / f"fixtures-{jobs}.jsonl.gz"
+    workflows_ids_per_ci = write_synthetic_fixtures(fixtures_path, jobs)
+    os.environ[fixtures.REPLAY_FIXTURES_ENV_VARIABLE] = str(fixtures_path)
+    os.environ[fixtures.REPLAY_LATENCY_ENV_VARIABLE] = str(latency_secs)
+    for ci_to_benchmark in utils.CIS_TO_BENCHMARK:
+        # The replayed requests never reach the apis
+        os.environ.setdefault(ci_to_benchmark["token_env_variable"], "synthetic-token")
+
+    durations = []
+    for _ in range(rounds):
+        started_at = time.perf_counter()
+        generate_report(
+            directory / f"report-{jobs}.csv",
+            workflows_ids_per_ci,
+            use_async,
+            max_concurrency,
+        )
+        durations.append(time.perf_counter() - started_at)
+
+    return BenchmarkResult(
+        jobs=jobs,
+        mode="async" if use_async else "sync",
+        rounds=rounds,
+        min_secs=min(durations),
+        median_secs=statistics.median(durations),
+        mean_secs=statistics.mean(durations),
+    )
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the report generation offline, by replaying the responses of synthetic benchmark workflows runs of each ci provider.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        nargs="+",
+        default=DEFAULT_JOBS_COUNTS,
+        help="Number of jobs of the synthetic benchmark workflow run of each ci provider, one benchmark per number.",
+    )
+    parser.add_argument(
+        "--rounds",
+        type=int,
+        default=3,
+        help="Number of times each benchmark is run.",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        metavar="SECONDS",
+        help="Latency injected in each replayed response.",
+    )
+    parser.add_argument(
+        "--mode",
+        choices=["sync", "async"],
+        nargs="+",
+        default=["sync", "async"],
+        help="Clients used to generate the report.",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=constants.DEFAULT_MAX_CONCURRENCY,
+        help="Maximum number of requests in flight at the same time per ci provider, with the async clients.",
+    )
+    parser.add_argument(
+        "--json",
+        type=pathlib.Path,
+        default=None,
+        metavar="FILE",
+        help="Also write the results to FILE.",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = get_parser().parse_args(argv)
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for jobs in args.jobs:
+            for mode in args.mode:
+                result = run_benchmark(
+                    pathlib.Path(directory),
+                    jobs,
+                    mode == "async",
+                    args.rounds,
+                    args.latency,
+                    args.max_concurrency,
+                )
+                results.append(result)
+                print(
+                    f"{result.jobs:>6} jobs {result.mode:>5}: "
+                    f"min {result.min_secs:.3f}s, median {result.median_secs:.3f}s, "
+                    f"mean {result.mean_secs:.3f}s over {result.rounds} rounds",
+                )
+
+    if args.json is not None:
+        with open(args.json, "w") as f:
+            json.dump([r._asdict() for r in results], f, indent=2)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import collections
+import hashlib
+import os
+import pathlib
+import threading
+import typing
+
+import daiquiri
+
+
+if typing.TYPE_CHECKING:
+    import httpx
+
+
+LOG = daiquiri.getLogger(__name__)
+
+DEFAULT_MAX_SIZE_BYTES = 512 * 1024 * 1024
+DEFAULT_CONDITIONAL_MAX_ENTRIES = 1000
+
+
+def get_default_cache_directory() -> pathlib.Path:
+    cache_home = os.getenv("XDG_CACHE_HOME")
+    if cache_home:
+        return pathlib.Path(cache_home) / "ci-benchmark-tooling"
+
+    return pathlib.Path.home() / ".cache" / "ci-benchmark-tooling"
+
+
+class ResponseCache:
+    """
+    On-disk cache of response bodies, keyed by a hash of the full url
+    (params included).
+
+    The clients only store the responses of runs and jobs that reached
+    a terminal state, since they will never change afterwards.
+    When the size of the cache goes over `max_size_bytes`, the least
+    recently used entries are evicted.
+    It is shared by the threads fetching the pages of a listing concurrently.
+    """
+
+    def __init__(
+        self,
+        directory: pathlib.Path | None = None,
+        max_size_bytes: int = DEFAULT_MAX_SIZE_BYTES,
+    ) -> None:
+        self.directory = directory or get_default_cache_directory()
+        self.max_size_bytes = max_size_bytes
+        # Entries of the cache ordered from the least to the most recently used,
+        # with their size in bytes.
+        self._entries: collections.OrderedDict[str, int] | None = None
+        self._total_size = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def get_key(url: httpx.URL) -> str:
+        # Sort the params so the same request always ends up with the same key
+        sorted_url = url.copy_with(params=sorted(url.params.multi_items()))
+        return hashlib.sha256(str(sorted_url).encode()).hexdigest()
+
+    def _get_path(self, key: str) -> pathlib.Path:
+        return self.directory / f"{key}.json"
+
+    def _load_entries(self) -> collections.OrderedDict[str, int]:
+        if self._entries is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            files = sorted(
+                (f.stat().st_mtime, f.stem, f.stat().st_size)
+                for f in self.directory.glob("*.json")
+            )
+            self._entries = collections.OrderedDict(
+                (key, size) for _mtime, key, size in files
+            )
+            self._total_size = sum(self._entries.values())
+
+        return self._entries
+
+    def get(self, url: httpx.URL) -> bytes | None:
+        key = self.get_key(url)
+        with self.lock:
+            entries = self._load_entries()
+            if key not in entries:
+                return None
+
+            path = self._get_path(key)
+            try:
+                content = path.read_bytes()
+            except FileNotFoundError:
+                self._total_size -= entries.pop(key)
+                return None
+
+            # Update the mtime so the LRU order survives between runs
+            os.utime(path)
+            entries.move_to_end(key)
+            return content
+
+    def set(self, url: httpx.URL, content: bytes) -> None:
+        key = self.get_key(url)
+        path = self._get_path(key)
+        with self.lock:
+            entries = self._load_entries()
+
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_bytes(content)
+            tmp_path.replace(path)
+
+            self._total_size += len(content) - entries.pop(key, 0)
+            entries[key] = len(content)
+
+            self._evict()
+
+    def evict(self) -> None:
+        with self.lock:
+            self._evict()
+
+    def _evict(self) -> None:
+        entries = self._load_entries()
+        while self._total_size > self.max_size_bytes and entries:
+            key, size = entries.popitem(last=False)
+            self._get_path(key).unlink(missing_ok=True)
+            self._total_size -= size
+            LOG.debug("Evicted %s from the response cache", key)
+
+
+class ValidatedResponse(typing.NamedTuple):
+    etag: str | None
+    last_modified: str | None
+    link: str | None
+    content: bytes
+
+
+class ConditionalRequestsCache:
+    """
+    In-memory store of the `ETag` and `Last-Modified` validators of the latest
+    GET responses, along with their body, keyed like the `ResponseCache`.
+
+    It is used to send conditional requests for the resources we keep
+    fetching again, like when polling the workflows. When they did not change,
+    the api answers `304 Not Modified`, without a body and, for GitHub, without
+    counting the request in the rate limit, and the stored body is used instead.
+    Like the `ResponseCache`, it is shared by the threads fetching pages.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_CONDITIONAL_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self._entries: collections.OrderedDict[
+            str,
+            ValidatedResponse,
+        ] = collections.OrderedDict()
+        self.not_modified_responses = 0
+        self.lock = threading.Lock()
+
+    def get(self, url: httpx.URL) -> ValidatedResponse | None:
+        key = ResponseCache.get_key(url)
+        with self.lock:
+            validated_response = self._entries.get(key)
+            if validated_response is not None:
+                self._entries.move_to_end(key)
+            return validated_response
+
+    def get_not_modified(self, url: httpx.URL) -> ValidatedResponse | None:
+        """
+        Returns the stored response of `url`, answered `304 Not Modified`.
+        """
+        validated_response = self.get(url)
+        if validated_response is not None:
+            with self.lock:
+                self.not_modified_responses += 1
+        return validated_response
+
+    def get_conditional_headers(self, url: httpx.URL) -> dict[str, str]:
+        validated_response = self.get(url)
+        if validated_response is None:
+            return {}
+
+        headers = {}
+        if validated_response.etag is not None:
+            headers["If-None-Match"] = validated_response.etag
+        if validated_response.last_modified is not None:
+            headers["If-Modified-Since"] = validated_response.last_modified
+        return headers
+
+    def set(self, response: httpx.Response) -> None:
+        # Only the json data of the api is polled, not the artifacts archives,
+        # whose bodies would push the json pages out of the cache.
+        content_type = response.headers.get("Content-Type", "")
+        if content_type.partition(";")[0].strip() != "application/json":
+            return
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag is None and last_modified is None:
+            return
+
+        key = ResponseCache.get_key(response.request.url)
+        validated_response = ValidatedResponse(
+            etag=etag,
+            last_modified=last_modified,
+            link=response.headers.get("Link"),
+            content=response.content,
+        )
+        with self.lock:
+            self._entries[key] = validated_response
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
@@ -1,21 +1,333 @@
 from __future__ import annotations
 
 import abc
+import asyncio
+import collections
+import concurrent.futures
+import datetime
+import json
 import typing
 
 import daiquiri
 import httpx
 import tenacity
 
+from ci_benchmark_tooling import cache
+from ci_benchmark_tooling import constants
+from ci_benchmark_tooling import fixtures
+from ci_benchmark_tooling import instrumentation
+from ci_benchmark_tooling import rate_limit
+from ci_benchmark_tooling import transport
+
 
 if typing.TYPE_CHECKING:
+    from collections import abc as collections_abc
+
+    from ci_benchmark_tooling import polling
+    from ci_benchmark_tooling import steps
     from ci_benchmark_tooling import types
 
 
-class BaseClient(httpx.Client, abc.ABC):
-    def __init__(self, *args: typing.Any, **kwargs: typing.Any) -> None:
-        httpx.Client.__init__(self, *args, **kwargs)
+T = typing.TypeVar("T")
+
+CONDITIONAL_REQUEST_HEADERS = ("if-none-match", "if-modified-since")
+
+
+def get_cached_response(
+    response_cache: cache.ResponseCache | None,
+    request: httpx.Request,
+) -> httpx.Response | None:
+    if response_cache is None or request.method != "GET":
+        return None
+
+    content = response_cache.get(request.url)
+    if content is None:
+        return None
+
+    return httpx.Response(
+        200,
+        headers={"Content-Type": "application/json"},
+        content=content,
+        request=request,
+    )
+
+
+def store_response_if_cacheable(
+    response_cache: cache.ResponseCache | None,
+    response: httpx.Response,
+    is_response_cacheable: typing.Callable[[typing.Any], bool],
+    get_cached_data: typing.Callable[[typing.Any], typing.Any],
+) -> None:
+    if response_cache is None or response.request.method != "GET":
+        return
+
+    # Only the body is cached, a cached page would lose the `Link` header
+    # pointing to the next one
+    if "next" in response.links:
+        return
+
+    # e.g. the archives of the artifacts
+    if "json" not in response.headers.get("Content-Type", "application/json"):
+        return
+
+    data = response.json()
+    if not is_response_cacheable(data):
+        return
+
+    cached_data = get_cached_data(data)
+    response_cache.set(
+        response.request.url,
+        response.content if cached_data is data else json.dumps(cached_data).encode(),
+    )
+
+
+def get_conditional_request_headers(
+    conditional_requests_cache: cache.ConditionalRequestsCache,
+    request: httpx.Request,
+    headers: typing.Any,
+) -> dict[str, str]:
+    """
+    Returns `headers` along with the headers making `request` conditional,
+    if the validators of its latest response are known.
+    """
+    if request.method != "GET":
+        return dict(headers or {})
+
+    return {
+        **dict(headers or {}),
+        **conditional_requests_cache.get_conditional_headers(request.url),
+    }
+
+
+def get_unconditional_request_headers(headers: dict[str, str]) -> dict[str, str]:
+    return {
+        name: value
+        for name, value in headers.items()
+        if name.lower() not in CONDITIONAL_REQUEST_HEADERS
+    }
+
+
+def is_unvalidated_not_modified(response: httpx.Response) -> bool:
+    """
+    Returns whether `response`, as returned by `handle_conditional_response`,
+    is still a `304 Not Modified`. The body of the latest response was then
+    evicted from the conditional requests cache, there is none to answer with.
+    """
+    return response.status_code == 304
+
+
+def handle_conditional_response(
+    conditional_requests_cache: cache.ConditionalRequestsCache,
+    response: httpx.Response,
+) -> httpx.Response:
+    """
+    Returns the stored response if `response` tells it was not modified,
+    and stores the validators of `response` otherwise.
+    """
+    if response.request.method != "GET":
+        return response
+
+    if response.status_code == 304:
+        validated_response = conditional_requests_cache.get_not_modified(
+            response.request.url,
+        )
+        if validated_response is None:
+            return response
+
+        headers = {"Content-Type": "application/json"}
+        if validated_response.link is not None:
+            headers["Link"] = validated_response.link
+        return httpx.Response(
+            200,
+            headers=headers,
+            content=validated_response.content,
+            request=response.request,
+        )
+
+    if response.is_success:
+        conditional_requests_cache.set(response)
+
+    return response
+
+
+def get_remaining_pages_urls(response: httpx.Response) -> list[httpx.URL] | None:
+    """
+    Returns the urls of all the pages after `response`, when its `Link` header
+    gives the number of the next and of the last page, as GitHub does.
+    Returns `None` when the remaining pages can't be known in advance.
+    """
+    if "next" not in response.links or "last" not in response.links:
+        return None
+
+    next_url = httpx.URL(response.links["next"]["url"])
+    last_url = httpx.URL(response.links["last"]["url"])
+    try:
+        next_page = int(next_url.params["page"])
+        last_page = int(last_url.params["page"])
+    except (KeyError, ValueError):
+        return None
+
+    return [
+        next_url.copy_set_param("page", page)
+        for page in range(next_page, last_page + 1)
+    ]
+
+
+def get_next_page_url(response: httpx.Response) -> httpx.URL | None:
+    """
+    Returns the url of the page after `response`, either from its `Link` header
+    or from the `next_page_token` of its json data, as CircleCI does.
+    """
+    if "next" in response.links:
+        return httpx.URL(response.links["next"]["url"])
+
+    data = response.json()
+    if isinstance(data, dict) and data.get("next_page_token"):
+        return response.request.url.copy_set_param(
+            "page-token",
+            data["next_page_token"],
+        )
+
+    return None
+
+
+# Retries of the requests failing because of the network or of the apis
+RETRY_ARGUMENTS: dict[str, typing.Any] = {
+    "reraise": True,
+    "retry": tenacity.retry_if_exception_type((httpx.StreamError, httpx.HTTPError)),
+    "wait": tenacity.wait_exponential(0.2),
+    "stop": tenacity.stop_after_attempt(5),
+}
+
+
+class ClientMixin:
+    """
+    State and handling of the requests and responses shared by `BaseClient`
+    and `AsyncBaseClient`, which only differ in how they send the requests.
+    """
+
+    def init_client(
+        self,
+        response_cache: cache.ResponseCache | None,
+        request_priority: rate_limit.RequestPriorityT,
+        steps_grouping: steps.StepsGrouping | None,
+    ) -> None:
         self.logger = daiquiri.getLogger(self.__class__.__name__)
+        self.response_cache = response_cache
+        self.request_priority = request_priority
+        self.steps_grouping = steps_grouping
+        self.conditional_requests_cache = cache.ConditionalRequestsCache()
+
+    def is_response_cacheable(self, _data: typing.Any) -> bool:
+        """
+        Returns whether the json data of a GET response will never change
+        anymore, meaning it can be stored in the `response_cache`.
+        """
+        return False
+
+    def get_cached_data(self, data: typing.Any) -> typing.Any:
+        """
+        Returns the part of the json data of a cacheable response that is
+        stored in the `response_cache`, all of it by default.
+        """
+        return data
+
+    def get_pagination_params(self) -> dict[str, int]:
+        """
+        Returns the params to add to the first request of a paginated listing,
+        to set the number of items per page.
+        """
+        return {}
+
+    def get_first_page_params(
+        self,
+        params: dict[str, str | int] | None,
+    ) -> dict[str, str | int]:
+        return {**(params or {}), **self.get_pagination_params()}
+
+    def prepare_request(
+        self,
+        request: httpx.Request,
+        kwargs: dict[str, typing.Any],
+    ) -> httpx.Response | None:
+        """
+        Returns the cached response of `request`, if any. Otherwise adds the
+        headers making it conditional to the `kwargs` it will be sent with.
+        """
+        cached_response = get_cached_response(self.response_cache, request)
+        if cached_response is None:
+            kwargs["headers"] = get_conditional_request_headers(
+                self.conditional_requests_cache,
+                request,
+                kwargs.get("headers"),
+            )
+        return cached_response
+
+    def handle_response(
+        self,
+        resp: httpx.Response,
+        tracer: transport.RequestTracer,
+        measure: instrumentation.RequestMeasure,
+        rate_limiter: rate_limit.RateLimiter,
+    ) -> httpx.Response:
+        transport.record_connection_timing(tracer.get_timing(resp))
+        measure.set_response(resp)
+        rate_limiter.update(resp)
+        return handle_conditional_response(self.conditional_requests_cache, resp)
+
+    def get_next_poll_delay(
+        self,
+        scheduler: polling.PollingScheduler,
+        running_workflows: list[polling.PolledWorkflow],
+    ) -> float | None:
+        """
+        Returns the delay before polling the `running_workflows` again, or
+        `None` once none of them is running anymore.
+        """
+        if not running_workflows:
+            self.logger.info("Workflows polling finished")
+            return None
+
+        delay = scheduler.get_next_delay(
+            running_workflows,
+            datetime.datetime.now(tz=constants.UTC),
+        )
+        self.logger.info(
+            "%d workflows still running, next poll in %d seconds",
+            len(running_workflows),
+            delay,
+        )
+        return delay
+
+    def store_response(self, resp: httpx.Response) -> None:
+        store_response_if_cacheable(
+            self.response_cache,
+            resp,
+            self.is_response_cacheable,
+            self.get_cached_data,
+        )
+
+
+def add_trace_extension(
+    kwargs: dict[str, typing.Any],
+    tracer: transport.RequestTracer,
+) -> None:
+    kwargs["extensions"] = {**(kwargs.get("extensions") or {}), "trace": tracer}
+
+
+class BaseClient(ClientMixin, httpx.Client, abc.ABC):
+    def __init__(
+        self,
+        *args: typing.Any,
+        response_cache: cache.ResponseCache | None = None,
+        request_priority: rate_limit.RequestPriorityT = "low",
+        steps_grouping: steps.StepsGrouping | None = None,
+        **kwargs: typing.Any,
+    ) -> None:
+        if "transport" not in kwargs:
+            kwargs["transport"] = fixtures.get_transport()
+        httpx.Client.__init__(self, *args, **kwargs)
+        self.init_client(response_cache, request_priority, steps_grouping)
 
     @abc.abstractmethod
     def send_dispatch_events(
@@ -23,9 +335,11 @@ class BaseClient(httpx.Client, abc.ABC):
         repository_owner: str,
         repository_name: str,
         workflow_dispatch_ref: str,
+        repetitions: int = 1,
     ) -> int:
         """
-        Send workflow dispatch events to the relevant CI Provider, and save
+        Send workflow dispatch events to the relevant CI Provider, `repetitions`
+        times for each benchmark workflow, and save
         the required data in the instance of the object to be able to
         poll the workflows to know if they finished or not.
         This function also needs to write the worklows ids to the GITHUB_ENV
@@ -34,41 +348,373 @@ class BaseClient(httpx.Client, abc.ABC):
         ...
 
     @abc.abstractmethod
-    def wait_for_workflows_to_end(self) -> None:
+    def wait_for_workflows_to_end(self) -> dict[str, datetime.datetime]:
         """
         Use the data saved in the object instance, by `send_dispatch_events`,
         to check if the workflows we dispatch ended.
+        Returns the date at which each workflow, identified by its id, finished.
         """
         ...
 
     @abc.abstractmethod
-    def generate_csv_data_from_workflows_ids(
+    def generate_workflows_data_from_workflows_ids(
         self,
         workflows_ids: list[str],
         repository_owner: str,
         repository_name: str,
-    ) -> list[types.CsvDataLine]:
+    ) -> collections_abc.Iterator[types.WorkflowRunData]:
+        """
+        Lazily yields the CSV lines of each workflow, along with infos about
+        its run, in the order of `workflows_ids`.
+        """
         ...
 
+    def generate_csv_data_from_workflows_ids(
+        self,
+        workflows_ids: list[str],
+        repository_owner: str,
+        repository_name: str,
+    ) -> collections_abc.Iterator[types.CsvDataLine]:
+        for workflow_data in self.generate_workflows_data_from_workflows_ids(
+            workflows_ids,
+            repository_owner,
+            repository_name,
+        ):
+            yield from workflow_data.csv_data
+
     @abc.abstractmethod
     def get_latest_benchmark_workflows_ids(
         self,
         repository_owner: str,
         repository_name: str,
+        repetitions: int = 1,
     ) -> list[str]:
+        """
+        Returns the ids of the `repetitions` latest runs of each benchmark workflow.
+        """
+        ...
+
+    @abc.abstractmethod
+    def get_benchmark_workflows_runs(
+        self,
+        repository_owner: str,
+        repository_name: str,
+        created_since: datetime.datetime | None,
+        created_until: datetime.datetime | None = None,
+    ) -> list[types.BenchmarkWorkflowRun]:
+        """
+        Returns every benchmark workflow run created since `created_since`,
+        and before `created_until`, finished or not. Each bound is ignored
+        when None.
+        """
+        ...
+
+    def get_jobs_durations_trends(
+        self,
+        _repository_owner: str,
+        _repository_name: str,
+        _reporting_window: str,
+    ) -> list[types.JobDurationTrend] | None:
+        """
+        Returns the duration of the jobs of each runner configuration of the
+        benchmark workflows over the `reporting_window`, one of
+        `constants.TREND_REPORTING_WINDOWS_DAYS`, from the metrics aggregated
+        by the ci provider instead of the details of each job.
+        Returns `None` when the ci provider doesn't aggregate them.
+        """
+        return None
+
+    def paginate(
+        self,
+        url: httpx.URL | str,
+        items_key: str,
+        params: dict[str, str | int] | None = None,
+    ) -> collections_abc.Iterator[typing.Any]:
+        """
+        Lazily yields the `items_key` items of every page of a listing.
+        When the number of the last page is known, the following pages are
+        fetched concurrently, at most `PAGINATION_MAX_PREFETCHED_PAGES` ahead
+        of the page being read.
+        """
+        resp = self.get(url, params=self.get_first_page_params(params))
+        yield from resp.json()[items_key]
+
+        pages_urls = get_remaining_pages_urls(resp)
+        if pages_urls is not None:
+            with concurrent.futures.ThreadPoolExecutor(
+                constants.PAGINATION_MAX_PREFETCHED_PAGES,
+            ) as executor:
+                pages: collections.deque[
+                    concurrent.futures.Future[httpx.Response]
+                ] = collections.deque()
+                try:
+                    for page_url in pages_urls:
+                        pages.append(executor.submit(self.get, page_url))
+                        if len(pages) >= constants.PAGINATION_MAX_PREFETCHED_PAGES:
+                            yield from pages.popleft().result().json()[items_key]
+
+                    while pages:
+                        yield from pages.popleft().result().json()[items_key]
+                finally:
+                    # The caller may stop reading before the last page
+                    for page in pages:
+                        page.cancel()
+            return
+
+        next_url = get_next_page_url(resp)
+        while next_url is not None:
+            resp = self.get(next_url)
+            yield from resp.json()[items_key]
+            next_url = get_next_page_url(resp)
+
+    def send_request(
+        self,
+        method: str,
+        url: httpx.URL | str,
+        measure: instrumentation.RequestMeasure,
+        rate_limiter: rate_limit.RateLimiter,
+        **kwargs: typing.Any,
+    ) -> httpx.Response:
+        # Rate limited responses are retried once the rate limiter
+        # waited as long as the api asked.
+        rate_limiter.acquire(self.request_priority)
+        tracer = transport.RequestTracer()
+        add_trace_extension(kwargs, tracer)
+        resp = super().request(method, url, **kwargs)
+        return self.handle_response(resp, tracer, measure, rate_limiter)
+
+    def request(
+        self,
+        method: str,
+        url: httpx.URL | str,
+        **kwargs: typing.Any,
+    ) -> httpx.Response:
+        request = self.build_request(method, url, params=kwargs.get("params"))
+        cached_response = self.prepare_request(request, kwargs)
+        if cached_response is not None:
+            return cached_response
+
+        rate_limiter = rate_limit.get_rate_limiter(request.url.host)
+        with instrumentation.RequestMeasure(request) as measure:
+            for attempt in tenacity.Retrying(**RETRY_ARGUMENTS):
+                with attempt:
+                    measure.add_attempt()
+                    resp = self.send_request(
+                        method,
+                        url,
+                        measure,
+                        rate_limiter,
+                        **kwargs,
+                    )
+                    if is_unvalidated_not_modified(resp):
+                        # Ask for the whole response once, every retry of the
+                        # same conditional request would be answered with a 304
+                        kwargs["headers"] = get_unconditional_request_headers(
+                            kwargs["headers"],
+                        )
+                        measure.add_attempt()
+                        resp = self.send_request(
+                            method,
+                            url,
+                            measure,
+                            rate_limiter,
+                            **kwargs,
+                        )
+                    resp.raise_for_status()
+
+        self.store_response(resp)
+        return resp
+
+
+class AsyncBaseClient(ClientMixin, httpx.AsyncClient, abc.ABC):
+    """
+    Asynchronous counterpart of `BaseClient`, used to fetch the report data
+    concurrently. The number of requests in flight at the same time is
+    bounded by `max_concurrency`.
+    """
+
+    def __init__(
+        self,
+        *args: typing.Any,
+        max_concurrency: int = constants.DEFAULT_MAX_CONCURRENCY,
+        response_cache: cache.ResponseCache | None = None,
+        request_priority: rate_limit.RequestPriorityT = "low",
+        steps_grouping: steps.StepsGrouping | None = None,
+        **kwargs: typing.Any,
+    ) -> None:
+        if "transport" not in kwargs:
+            kwargs["transport"] = fixtures.get_async_transport()
+        httpx.AsyncClient.__init__(self, *args, **kwargs)
+        self.init_client(response_cache, request_priority, steps_grouping)
+        self.max_concurrency = max_concurrency
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+
+    @abc.abstractmethod
+    async def send_dispatch_events(
+        self,
+        repository_owner: str,
+        repository_name: str,
+        workflow_dispatch_ref: str,
+        repetitions: int = 1,
+    ) -> int:
+        """
+        Asynchronous counterpart of `BaseClient.send_dispatch_events`, which
+        sends all the dispatch events at once.
+        """
+        ...
+
+    @abc.abstractmethod
+    async def wait_for_workflows_to_end(self) -> dict[str, datetime.datetime]:
+        """
+        Asynchronous counterpart of `BaseClient.wait_for_workflows_to_end`.
+        """
+        ...
+
+    @abc.abstractmethod
+    def generate_workflows_data_from_workflows_ids(
+        self,
+        workflows_ids: list[str],
+        repository_owner: str,
+        repository_name: str,
+    ) -> collections_abc.AsyncIterator[types.WorkflowRunData]:
+        """
+        Must yield the same data, in the same order, as the synchronous
+        client's `generate_workflows_data_from_workflows_ids`.
+        """
         ...
 
-    def request(self, *args: typing.Any, **kwargs: typing.Any) -> httpx.Response:
-        for attempt in tenacity.Retrying(
-            reraise=True,
-            retry=tenacity.retry_if_exception_type(
-                (httpx.StreamError, httpx.HTTPError),
-            ),
-            wait=tenacity.wait_exponential(0.2),
-            stop=tenacity.stop_after_attempt(5),
+    async def generate_csv_data_from_workflows_ids(
+        self,
+        workflows_ids: list[str],
+        repository_owner: str,
+        repository_name: str,
+    ) -> collections_abc.AsyncIterator[types.CsvDataLine]:
+        async for workflow_data in self.generate_workflows_data_from_workflows_ids(
+            workflows_ids,
+            repository_owner,
+            repository_name,
         ):
-            with attempt:
-                resp = super().request(*args, **kwargs)
-                resp.raise_for_status()
+            for line in workflow_data.csv_data:
+                yield line
+
+    async def iter_in_order(
+        self,
+        coroutines: collections_abc.Iterable[
+            collections_abc.Coroutine[typing.Any, typing.Any, T]
+        ],
+    ) -> collections_abc.AsyncIterator[T]:
+        """
+        Yields the results of `coroutines` in order, running at most
+        `max_concurrency` of them at the same time.
+        """
+        tasks: collections.deque[asyncio.Task[T]] = collections.deque()
+        try:
+            for coroutine in coroutines:
+                tasks.append(asyncio.create_task(coroutine))
+                if len(tasks) >= self.max_concurrency:
+                    yield await tasks.popleft()
+
+            while tasks:
+                yield await tasks.popleft()
+        finally:
+            # The caller may stop reading before the last result
+            for task in tasks:
+                task.cancel()
+
+    async def paginate(
+        self,
+        url: httpx.URL | str,
+        items_key: str,
+        params: dict[str, str | int] | None = None,
+    ) -> collections_abc.AsyncIterator[typing.Any]:
+        """
+        Asynchronous counterpart of `BaseClient.paginate`.
+        """
+        resp = await self.get(url, params=self.get_first_page_params(params))
+        for item in resp.json()[items_key]:
+            yield item
+
+        pages_urls = get_remaining_pages_urls(resp)
+        if pages_urls is not None:
+            pages: collections.deque[asyncio.Task[httpx.Response]] = collections.deque()
+            try:
+                for page_url in pages_urls:
+                    pages.append(asyncio.create_task(self.get(page_url)))
+                    if len(pages) >= constants.PAGINATION_MAX_PREFETCHED_PAGES:
+                        for item in (await pages.popleft()).json()[items_key]:
+                            yield item
+
+                while pages:
+                    for item in (await pages.popleft()).json()[items_key]:
+                        yield item
+            finally:
+                # The caller may stop reading before the last page
+                for page in pages:
+                    page.cancel()
+            return
+
+        next_url = get_next_page_url(resp)
+        while next_url is not None:
+            resp = await self.get(next_url)
+            for item in resp.json()[items_key]:
+                yield item
+            next_url = get_next_page_url(resp)
+
+    async def send_request(
+        self,
+        method: str,
+        url: httpx.URL | str,
+        measure: instrumentation.RequestMeasure,
+        rate_limiter: rate_limit.RateLimiter,
+        **kwargs: typing.Any,
+    ) -> httpx.Response:
+        await rate_limiter.acquire_async(self.request_priority)
+        # Only hold a concurrency slot while the request is in flight,
+        # not while waiting for the next retry.
+        async with self.semaphore:
+            tracer = transport.AsyncRequestTracer()
+            add_trace_extension(kwargs, tracer)
+            resp = await super().request(method, url, **kwargs)
+        return self.handle_response(resp, tracer, measure, rate_limiter)
+
+    async def request(
+        self,
+        method: str,
+        url: httpx.URL | str,
+        **kwargs: typing.Any,
+    ) -> httpx.Response:
+        request = self.build_request(method, url, params=kwargs.get("params"))
+        cached_response = self.prepare_request(request, kwargs)
+        if cached_response is not None:
+            return cached_response
+
+        rate_limiter = rate_limit.get_rate_limiter(request.url.host)
+        with instrumentation.RequestMeasure(request) as measure:
+            async for attempt in tenacity.AsyncRetrying(**RETRY_ARGUMENTS):
+                with attempt:
+                    measure.add_attempt()
+                    resp = await self.send_request(
+                        method,
+                        url,
+                        measure,
+                        rate_limiter,
+                        **kwargs,
+                    )
+                    if is_unvalidated_not_modified(resp):
+                        # Ask for the whole response once, every retry of the
+                        # same conditional request would be answered with a 304
+                        kwargs["headers"] = get_unconditional_request_headers(
+                            kwargs["headers"],
+                        )
+                        measure.add_attempt()
+                        resp = await self.send_request(
+                            method,
+                            url,
+                            measure,
+                            rate_limiter,
+                            **kwargs,
+                        )
+                    resp.raise_for_status()
 
+        self.store_response(resp)
         return resp
@@ -1,68 +1,546 @@
+import asyncio
+from collections import abc
+import datetime
+import itertools
 import time
 import typing
 
-import yaml
+import daiquiri
+import httpx
 
+from ci_benchmark_tooling import cache
 from ci_benchmark_tooling import constants
+from ci_benchmark_tooling import polling
+from ci_benchmark_tooling import rate_limit
+from ci_benchmark_tooling import steps
 from ci_benchmark_tooling import types
 from ci_benchmark_tooling import utils
+from ci_benchmark_tooling import yaml_cache
 from ci_benchmark_tooling.clients import base
 from ci_benchmark_tooling.http_types import circleci_types
 
 
+BASE_URL = "https://circleci.com/api/v2"
+# Only the v1.1 api gives the steps of the jobs, its requests go through the
+# same pooled connection as the v2 ones since both are on the same host.
+# Neither the v2 nor the Insights endpoints give the time spent in each
+# step, and the v1.1 job details can't be restricted to some fields: their
+# whole payload, `circle_yml` included, is downloaded for each job that ran.
 BASE_URL_V1_1 = "https://circleci.com/api/v1.1"
 
+# Number of cores of the machines of each resource class, as in
+# `runner_prices.csv`. The Insights api only gives the name of the jobs, the
+# cores of a job are known from the resource class its matrix is named after.
+RESOURCE_CLASSES_CORES = {
+    "medium": 2,
+    "large": 4,
+    "xlarge": 8,
+    "2xlarge": 16,
+    "2xlarge+": 32,
+    "windows.medium": 4,
+    "windows.large": 8,
+    "windows.xlarge": 16,
+    "windows.2xlarge": 32,
+    "macos.x86.medium.gen2": 4,
+    "macos.m1.medium.gen1": 4,
+    "macos.m1.large.gen1": 8,
+    "macos.x86.metal.gen1": 12,
+}
+
+
+def get_headers(token: str) -> dict[str, str]:
+    return {
+        "Accept": "application/json",
+        "Circle-Token": token,
+    }
+
 
 def get_time_spent_per_job_steps(
-    steps: list[circleci_types.JobDetailsStep],
-) -> dict[str, int]:
+    job_steps: list[circleci_types.JobDetailsStep],
+    tested_repository: str = "",
+    steps_grouping: steps.StepsGrouping | None = None,
+) -> dict[str, datetime.timedelta]:
     time_per_step = {}
-    for step in steps:
-        # Skip the time spent cloning the repository we are testing since
-        # it is not relevant to the benchmarking
-        if step["name"].startswith("Clone "):
+    for step in job_steps:
+        if not steps.is_benchmark_step(step["name"]):
             continue
 
-        if step["name"] not in constants.CIRCLECI_JOB_STEPS:
-            step_name = constants.CSV_BENCHMARKED_APPLICATION_STEP_NAME
-        else:
-            step_name = step["name"]
+        step_name = steps.get_step_name(
+            step["name"],
+            tested_repository,
+            constants.CIRCLECI_JOB_STEPS,
+            steps_grouping,
+        )
+        run_time_millis = step["actions"][0]["run_time_millis"]
+        if steps_grouping is None:
+            # Each step is truncated to whole seconds before being summed,
+            # as the report always did
+            run_time_millis = int(run_time_millis / 1000) * 1000
+        time_spent = datetime.timedelta(milliseconds=run_time_millis)
 
         if step_name not in time_per_step:
-            time_per_step[step_name] = int(step["actions"][0]["run_time_millis"] / 1000)
+            time_per_step[step_name] = time_spent
         else:
-            time_per_step[step_name] += int(
-                step["actions"][0]["run_time_millis"] / 1000,
-            )
+            time_per_step[step_name] += time_spent
 
     return time_per_step
 
 
+def get_jobs_machine_images(yml_dict: typing.Any) -> dict[str, str]:
+    """
+    Returns the image of the machine of each job of a CircleCI config.
+    """
+    machine_images = {}
+    for job_name, job in yml_dict["jobs"].items():
+        if "machine" in job:
+            machine_images[job_name] = str(job["machine"]["image"])
+        elif "macos" in job:
+            machine_images[job_name] = f"xcode:{job['macos']['xcode']}"
+
+    return machine_images
+
+
 def get_machine_image_from_job_name_and_yaml_string(
     yml_string: str,
     job_name: str,
 ) -> str:
-    yml_dict = yaml.safe_load(yml_string)
+    # Every job of a pipeline has the same config, it is only parsed once
+    return yaml_cache.get_index(yml_string, get_jobs_machine_images)[job_name]
+
+
+def get_job_machine_image(details: circleci_types.JobDetails) -> str:
+    if "machine_image" in details:
+        return details["machine_image"]
+
+    return get_machine_image_from_job_name_and_yaml_string(
+        details["circle_yml"]["string"],
+        details["workflows"]["job_name"],
+    )
+
+
+def get_job_details_subset(
+    details: circleci_types.JobDetails,
+) -> circleci_types.JobDetails:
+    """
+    Returns the v1.1 `details` of a job with only the fields used by the
+    report. The `circle_yml` of the pipeline, by far the heaviest one, is
+    replaced by the machine image of the job.
+
+    The details are trimmed once received, this doesn't reduce the bytes
+    downloaded, only the ones kept in memory and in the response cache.
+    """
+    if "circle_yml" not in details:
+        # Already trimmed, e.g. by the response cache
+        return details
+
+    return typing.cast(
+        circleci_types.JobDetails,
+        {
+            "lifecycle": details["lifecycle"],
+            "vcs_revision": details["vcs_revision"],
+            "start_time": details["start_time"],
+            "machine_image": get_job_machine_image(details),
+            "picard": {
+                "resource_class": {"cpu": details["picard"]["resource_class"]["cpu"]},
+            },
+            "workflows": {
+                "job_name": details["workflows"]["job_name"],
+                "workflow_name": details["workflows"]["workflow_name"],
+            },
+            "steps": [
+                {
+                    "name": step["name"],
+                    "actions": [
+                        {"run_time_millis": step["actions"][0]["run_time_millis"]},
+                    ],
+                }
+                for step in details["steps"]
+            ],
+        },
+    )
+
+
+def has_job_details(job: circleci_types.WorkflowsJob) -> bool:
+    """
+    Returns whether `job` ran, and thus has details with the time spent in
+    each of its steps. The approval jobs and the jobs that never started
+    don't.
+    """
+    return (
+        job["type"] == "build"
+        and job.get("job_number") is not None
+        and job.get("started_at") is not None
+    )
+
+
+def get_job_queue_time(
+    details: circleci_types.JobDetails,
+    workflow_created_at: str | None,
+) -> datetime.timedelta | None:
+    """
+    Returns the time the job of `details` waited for a machine, from the
+    creation of its workflow.
+    """
+    if not workflow_created_at or not details["start_time"]:
+        return None
+
+    queue_time = datetime.datetime.fromisoformat(
+        details["start_time"],
+    ) - datetime.datetime.fromisoformat(workflow_created_at)
+    return max(queue_time, datetime.timedelta(0))
+
+
+def get_csv_data_from_job_details(
+    details: circleci_types.JobDetails,
+    steps_grouping: steps.StepsGrouping | None = None,
+    workflow_created_at: str | None = None,
+) -> list[types.CsvDataLine]:
+    csv_data: list[types.CsvDataLine] = []
+
+    tested_repository = details["workflows"]["workflow_name"].replace(
+        "Benchmark ",
+        "",
+    )
+
+    time_per_step = get_time_spent_per_job_steps(
+        details["steps"],
+        tested_repository,
+        steps_grouping,
+    )
+    runner_os = get_job_machine_image(details)
+    runner_cores = details["picard"]["resource_class"]["cpu"]
+
+    queue_time = get_job_queue_time(details, workflow_created_at)
+    if queue_time is not None:
+        csv_data.append(
+            types.CsvDataLine(
+                ci_provider="CircleCI",
+                runner_os=runner_os,
+                runner_type="CircleCI-Hosted",
+                runner_cores=runner_cores,
+                tested_repository=tested_repository,
+                step_name=constants.CSV_QUEUE_TIME_STEP_NAME,
+                time_spent_in_secs=steps.get_time_spent_in_secs(
+                    queue_time,
+                    steps_grouping,
+                ),
+                additional_infos="",
+            ),
+        )
+
+    for step_name, time_spent in time_per_step.items():
+        additional_infos = ""
+        if step_name in constants.CIRCLECI_JOB_STEPS:
+            additional_infos = constants.CIRCLECI_JOB_STEPS_ADDITIONAL_INFOS
+
+        csv_data.append(
+            types.CsvDataLine(
+                ci_provider="CircleCI",
+                runner_os=runner_os,
+                runner_type="CircleCI-Hosted",
+                runner_cores=runner_cores,
+                tested_repository=tested_repository,
+                step_name=step_name,
+                time_spent_in_secs=steps.get_time_spent_in_secs(
+                    time_spent,
+                    steps_grouping,
+                ),
+                additional_infos=additional_infos,
+            ),
+        )
+
+    return csv_data
+
+
+def get_workflow_jobs(
+    jobs: list[circleci_types.WorkflowsJob],
+) -> list[types.WorkflowJob]:
+    jobs_names = {job["id"]: job["name"] for job in jobs}
+    return [
+        types.WorkflowJob(
+            name=job["name"],
+            started_at=datetime.datetime.fromisoformat(job["started_at"])
+            if job.get("started_at")
+            else None,
+            stopped_at=datetime.datetime.fromisoformat(job["stopped_at"])
+            if job.get("stopped_at")
+            else None,
+            dependencies=tuple(
+                jobs_names[job_id]
+                for job_id in job["dependencies"]
+                if job_id in jobs_names
+            ),
+        )
+        for job in jobs
+    ]
+
+
+def get_workflow_data(
+    workflow: circleci_types.Workflow,
+    jobs_details: list[circleci_types.JobDetails],
+    steps_grouping: steps.StepsGrouping | None = None,
+    jobs: list[circleci_types.WorkflowsJob] | None = None,
+) -> types.WorkflowRunData:
+    return types.WorkflowRunData(
+        workflow_id=workflow["id"],
+        created_at=datetime.datetime.fromisoformat(workflow["created_at"]),
+        commit_sha=jobs_details[0]["vcs_revision"] if jobs_details else "",
+        csv_data=[
+            line
+            for details in jobs_details
+            for line in get_csv_data_from_job_details(
+                details,
+                steps_grouping,
+                workflow["created_at"],
+            )
+        ],
+        ci_provider="CircleCI",
+        workflow_name=workflow["name"],
+        jobs=get_workflow_jobs(jobs or []),
+    )
+
+
+def is_finished_response(data: typing.Any) -> bool:
+    """
+    Returns whether `data` is the v1.1 details of a job, a workflow, or the list
+    of jobs of a workflow, that finished and will thus never change anymore.
+    """
+    if not isinstance(data, dict):
+        return False
+
+    if "lifecycle" in data and "steps" in data:
+        return bool(data["lifecycle"] == "finished")
+
+    if "pipeline_id" in data and "stopped_at" in data:
+        return data["stopped_at"] is not None
+
+    if "items" in data and "next_page_token" in data:
+        return bool(data["items"]) and all(
+            "job_number" in job and job.get("stopped_at") is not None
+            for job in data["items"]
+        )
+
+    return False
+
+
+def get_cached_data(data: typing.Any) -> typing.Any:
+    """
+    Only cache the fields of the v1.1 details of the jobs used by the report.
+    """
+    if isinstance(data, dict) and "lifecycle" in data and "steps" in data:
+        return get_job_details_subset(typing.cast(circleci_types.JobDetails, data))
+    return data
+
+
+def get_workflows_expected_durations_from_insights(
+    insights: circleci_types.InsightsWorkflows,
+) -> dict[str, datetime.timedelta]:
+    return {
+        w["name"]: datetime.timedelta(
+            seconds=w["metrics"]["duration_metrics"]["median"],
+        )
+        for w in insights["items"]
+    }
+
+
+def get_job_name_and_resource_class(
+    insights_job_name: str,
+    jobs_names: abc.Iterable[str],
+) -> tuple[str, str] | None:
+    """
+    Returns the name of the job of the config, among `jobs_names`, that
+    `insights_job_name` is a run of, along with the resource class of its
+    matrix, e.g. `("CPython - Ubuntu", "medium")` for `CPython - Ubuntu-medium`.
+    """
+    # The longest names first, in case a job name is the prefix of another one
+    for job_name in sorted(jobs_names, key=len, reverse=True):
+        if insights_job_name == job_name:
+            return job_name, ""
+        if insights_job_name.startswith(f"{job_name}-"):
+            return job_name, insights_job_name.removeprefix(f"{job_name}-")
+
+    return None
+
+
+def get_jobs_durations_trends_from_insights(
+    insights_jobs: abc.Iterable[circleci_types.InsightsJob],
+    workflow_name: str,
+    yml_dict: typing.Any,
+) -> list[types.JobDurationTrend]:
+    machine_images = get_jobs_machine_images(yml_dict)
+    tested_repository = workflow_name.replace("Benchmark ", "")
+
+    trends = []
+    for insights_job in insights_jobs:
+        metrics = insights_job["metrics"]
+        job_name_and_resource_class = get_job_name_and_resource_class(
+            insights_job["name"],
+            machine_images,
+        )
+        # The durations are only computed over the successful runs
+        if job_name_and_resource_class is None or not metrics["successful_runs"]:
+            continue
+
+        job_name, resource_class = job_name_and_resource_class
+        trends.append(
+            types.JobDurationTrend(
+                ci_provider="CircleCI",
+                runner_os=machine_images[job_name],
+                runner_type="CircleCI-Hosted",
+                runner_cores=RESOURCE_CLASSES_CORES.get(resource_class, 0),
+                tested_repository=tested_repository,
+                runs=metrics["successful_runs"],
+                median_secs=metrics["duration_metrics"]["median"],
+                p95_secs=metrics["duration_metrics"]["p95"],
+            ),
+        )
+
+    return trends
+
+
+def update_polled_workflows(
+    workflows: list[circleci_types.Workflow],
+    workflows_finished_at: dict[str, datetime.datetime],
+) -> tuple[list[polling.PolledWorkflow], list[circleci_types.Workflow]]:
+    """
+    Adds the `workflows` that stopped to `workflows_finished_at`, and returns
+    the ones still running along with the ones that just stopped.
+    """
+    running_workflows = []
+    stopped_workflows = []
+    for workflow in workflows:
+        if workflow["id"] in workflows_finished_at:
+            continue
+
+        if workflow["stopped_at"] is not None:
+            workflows_finished_at[workflow["id"]] = datetime.datetime.fromisoformat(
+                workflow["stopped_at"],
+            )
+            stopped_workflows.append(workflow)
+        else:
+            running_workflows.append(
+                polling.PolledWorkflow(
+                    workflow["name"],
+                    datetime.datetime.fromisoformat(workflow["created_at"]),
+                ),
+            )
+
+    return running_workflows, stopped_workflows
+
+
+def log_stopped_workflows(
+    logger: daiquiri.KeywordArgumentAdapter,
+    stopped_workflows: list[circleci_types.Workflow],
+    workflows_finished_at: dict[str, datetime.datetime],
+) -> None:
+    for workflow in stopped_workflows:
+        logger.info(
+            "Workflow '%s' (%s) finished at %s",
+            workflow["name"],
+            workflow["id"],
+            workflows_finished_at[workflow["id"]].isoformat(),
+            status=workflow["status"],
+        )
+
+
+def get_job_details_url(
+    job: circleci_types.WorkflowsJob,
+    repository_owner: str,
+    repository_name: str,
+) -> str:
+    # The v2 api doesn't have build time per steps, so we need to use v1.1
+    return f"{BASE_URL_V1_1}/project/github/{repository_owner}/{repository_name}/{job['job_number']}"
+
+
+def get_job_details_from_response(resp: httpx.Response) -> circleci_types.JobDetails:
+    return get_job_details_subset(
+        typing.cast(circleci_types.JobDetails, resp.json()),
+    )
+
+
+def get_workflows_ids_if_created(
+    workflows: list[circleci_types.Workflow],
+) -> list[str] | None:
+    """
+    Returns the ids of the workflows of a pipeline, or `None` if some of them
+    don't have one yet, which can happen when they are listed too fast after
+    the pipeline was created.
+    """
+    if any(not w["id"] for w in workflows):
+        return None
+    return [w["id"] for w in workflows]
+
+
+def get_new_pipeline_id(
+    logger: daiquiri.KeywordArgumentAdapter,
+    resp_new_pipeline: httpx.Response,
+) -> str | None:
+    if resp_new_pipeline.status_code != 201:
+        logger.error(
+            "Failed to create new pipeline: %s",
+            resp_new_pipeline.text,
+            status_code=resp_new_pipeline.status_code,
+        )
+        return None
+
+    pipeline_id: str = resp_new_pipeline.json()["id"]
+    logger.info("New pipeline ID: %s", pipeline_id)
+    return pipeline_id
+
+
+def write_workflows_ids_to_github_env(
+    logger: daiquiri.KeywordArgumentAdapter,
+    workflows_ids: abc.Iterable[str],
+) -> None:
+    workflows_ids_for_env = ",".join(workflows_ids)
+    logger.info("Workflows IDS: %s", workflows_ids_for_env)
+
+    utils.write_workflow_ids_to_github_env(
+        constants.CIRCLECI_WORKFLOW_IDS_ENV_PREFIX,
+        workflows_ids_for_env,
+    )
+
+
+def log_insights_unavailable(logger: daiquiri.KeywordArgumentAdapter) -> None:
+    logger.warning(
+        "Could not retrieve the workflows durations from Insights, "
+        "polling without history",
+    )
+
+
+class CircleCiClientMixin(base.ClientMixin):
+    """
+    Handling of the CircleCI responses shared by the synchronous and
+    asynchronous clients.
+    """
 
-    if "machine" in yml_dict["jobs"][job_name]:
-        # Need to cast the return into str because the whole dict is of type Any
-        return str(yml_dict["jobs"][job_name]["machine"]["image"])
+    def is_response_cacheable(self, data: typing.Any) -> bool:
+        return is_finished_response(data)
 
-    # macos image
-    return f"xcode:{yml_dict['jobs'][job_name]['macos']['xcode']}"
+    def get_cached_data(self, data: typing.Any) -> typing.Any:
+        return get_cached_data(data)
 
+    def init_dispatch_state(self) -> None:
+        self.pipelines_ids: list[str] = []
+        self.project_slug: str | None = None
 
-class CircleCiClient(base.BaseClient):
-    def __init__(self, token: str) -> None:
+
+class CircleCiClient(CircleCiClientMixin, base.BaseClient):
+    def __init__(
+        self,
+        token: str,
+        response_cache: cache.ResponseCache | None = None,
+        request_priority: rate_limit.RequestPriorityT = "low",
+        steps_grouping: steps.StepsGrouping | None = None,
+    ) -> None:
         super().__init__(
-            base_url="https://circleci.com/api/v2",
-            headers={
-                "Accept": "application/json",
-                "Circle-Token": token,
-            },
-            http2=True,
+            base_url=BASE_URL,
+            headers=get_headers(token),
+            response_cache=response_cache,
+            request_priority=request_priority,
+            steps_grouping=steps_grouping,
         )
-        self.pipeline_id: str | None = None
+        self.init_dispatch_state()
 
     ##############################
     ############ WORKFLOW DISPATCH
@@ -72,14 +550,60 @@ class CircleCiClient(base.BaseClient):
         self,
         repo_owner: str,
         _repo_name: str,
+        repetitions: int = 1,
     ) -> list[str]:
-        resp_pipeline = self.get(
-            "/pipeline",
-            params={"org-slug": f"gh/{repo_owner}"},
+        latest_pipelines = itertools.islice(
+            self.paginate(
+                "/pipeline",
+                "items",
+                params={"org-slug": f"gh/{repo_owner}"},
+            ),
+            repetitions,
+        )
+
+        return [
+            workflow_id
+            for pipeline in latest_pipelines
+            for workflow_id in self.get_workflows_ids_of_pipeline(pipeline["id"])
+        ]
+
+    def get_benchmark_workflows_runs(
+        self,
+        repository_owner: str,
+        repository_name: str,
+        created_since: datetime.datetime | None,
+        created_until: datetime.datetime | None = None,
+    ) -> list[types.BenchmarkWorkflowRun]:
+        workflows_runs: list[types.BenchmarkWorkflowRun] = []
+        pipelines: abc.Iterator[circleci_types.Pipeline] = self.paginate(
+            f"/project/gh/{repository_owner}/{repository_name}/pipeline",
+            "items",
         )
-        latest_pipeline_id = resp_pipeline.json()["items"][0]["id"]
 
-        return self.get_workflows_ids_of_pipeline(latest_pipeline_id)
+        # Pipelines are sorted from the most recent to the oldest
+        for pipeline in pipelines:
+            created_at = datetime.datetime.fromisoformat(pipeline["created_at"])
+            if created_since is not None and created_at < created_since:
+                break
+            if created_until is not None and created_at >= created_until:
+                continue
+
+            workflows: abc.Iterator[circleci_types.Workflow] = self.paginate(
+                f"/pipeline/{pipeline['id']}/workflow",
+                "items",
+            )
+            workflows_runs.extend(
+                types.BenchmarkWorkflowRun(
+                    workflow_id=w["id"],
+                    # The workflows are created after their pipeline, which
+                    # is what the listing stops at
+                    created_at=created_at,
+                    finished=w["stopped_at"] is not None,
+                )
+                for w in workflows
+            )
+
+        return workflows_runs
 
     def get_workflows_ids_of_pipeline(self, pipeline_id: str) -> list[str]:
         """
@@ -91,124 +615,383 @@ class CircleCiClient(base.BaseClient):
         """
 
         while True:
-            resp_pipeline_workflows = self.get(f"/pipeline/{pipeline_id}/workflow")
-
-            if any(not w["id"] for w in resp_pipeline_workflows.json()["items"]):
+            workflows_ids = get_workflows_ids_if_created(
+                list(self.paginate(f"/pipeline/{pipeline_id}/workflow", "items")),
+            )
+            if workflows_ids is None:
                 time.sleep(2)
                 continue
 
-            return [w["id"] for w in resp_pipeline_workflows.json()["items"]]
+            return workflows_ids
 
     def send_dispatch_events(
         self,
         repository_owner: str,
         repository_name: str,
         workflow_dispatch_ref: str,
+        repetitions: int = 1,
     ) -> int:
         self.logger.info("Sending dispatch events for CircleCI workflows")
+        self.project_slug = f"gh/{repository_owner}/{repository_name}"
 
-        resp_new_pipeline = self.post(
-            f"/project/github/{repository_owner}/{repository_name}/pipeline",
-            json={"branch": workflow_dispatch_ref},
-        )
-        if resp_new_pipeline.status_code != 201:
-            self.logger.error(
-                "Failed to create new pipeline: %s",
-                resp_new_pipeline.text,
-                status_code=resp_new_pipeline.status_code,
+        workflows_ids = []
+        for _ in range(repetitions):
+            resp_new_pipeline = self.post(
+                f"/project/github/{repository_owner}/{repository_name}/pipeline",
+                json={"branch": workflow_dispatch_ref},
             )
-            return 1
+            pipeline_id = get_new_pipeline_id(self.logger, resp_new_pipeline)
+            if pipeline_id is None:
+                return 1
 
-        self.pipeline_id = resp_new_pipeline.json()["id"]
-        self.logger.info("New pipeline ID: %s", self.pipeline_id)
+            self.pipelines_ids.append(pipeline_id)
 
-        if self.pipeline_id is None:
-            raise RuntimeError("self.pipeline_id should not be None")
+            workflows_ids.extend(self.get_workflows_ids_of_pipeline(pipeline_id))
 
-        workflows_ids = self.get_workflows_ids_of_pipeline(self.pipeline_id)
-        workflows_ids_for_env = ",".join(workflows_ids)
-        self.logger.info("Workflows IDS: %s", workflows_ids_for_env)
-
-        utils.write_workflow_ids_to_github_env(
-            constants.CIRCLECI_WORKFLOW_IDS_ENV_PREFIX,
-            workflows_ids_for_env,
-        )
+        write_workflows_ids_to_github_env(self.logger, workflows_ids)
 
         return 0
 
-    def wait_for_workflows_to_end(self) -> None:
+    def get_workflows_expected_durations(self) -> dict[str, datetime.timedelta]:
+        """
+        Returns the median duration of the latest runs of each workflow,
+        as computed by CircleCI Insights.
+        """
+        try:
+            resp_insights = self.get(f"/insights/{self.project_slug}/workflows")
+        except httpx.HTTPError:
+            log_insights_unavailable(self.logger)
+            return {}
+
+        return get_workflows_expected_durations_from_insights(
+            typing.cast(circleci_types.InsightsWorkflows, resp_insights.json()),
+        )
+
+    def wait_for_workflows_to_end(self) -> dict[str, datetime.datetime]:
         self.logger.info("Starting workflows polling...")
 
+        scheduler = polling.PollingScheduler(self.get_workflows_expected_durations())
+        workflows_finished_at: dict[str, datetime.datetime] = {}
+
         while True:
-            resp_pipeline_workflows = self.get(
-                f"/pipeline/{self.pipeline_id}/workflow",
+            workflows: list[circleci_types.Workflow] = []
+            for pipeline_id in self.pipelines_ids:
+                workflows.extend(
+                    self.paginate(f"/pipeline/{pipeline_id}/workflow", "items"),
+                )
+
+            running_workflows, stopped_workflows = update_polled_workflows(
+                workflows,
+                workflows_finished_at,
             )
+            log_stopped_workflows(self.logger, stopped_workflows, workflows_finished_at)
 
-            if all(
-                w["stopped_at"] is not None
-                for w in resp_pipeline_workflows.json()["items"]
-            ):
-                return
+            delay = self.get_next_poll_delay(
+                scheduler,
+                running_workflows,
+            )
+            if delay is None:
+                return workflows_finished_at
 
-            time.sleep(60)
+            time.sleep(delay)
 
     ##############################
     ############ CSV RELATED STUFF
     ##############################
 
-    def generate_csv_data_from_workflows_ids(
+    def _get_job_details(
         self,
-        workflows_ids: list[str],
+        job: circleci_types.WorkflowsJob,
+        repository_owner: str,
+        repository_name: str,
+    ) -> circleci_types.JobDetails:
+        return get_job_details_from_response(
+            self.get(get_job_details_url(job, repository_owner, repository_name)),
+        )
+
+    def _get_workflow_data(
+        self,
+        workflow_id: str,
         repository_owner: str,
         repository_name: str,
-    ) -> list[types.CsvDataLine]:
-        csv_data: list[types.CsvDataLine] = []
+    ) -> types.WorkflowRunData:
+        resp_workflow = self.get(f"/workflow/{workflow_id}")
+        workflow = typing.cast(circleci_types.Workflow, resp_workflow.json())
 
+        jobs: list[circleci_types.WorkflowsJob] = list(
+            self.paginate(f"/workflow/{workflow_id}/job", "items"),
+        )
+
+        jobs_details = [
+            self._get_job_details(job, repository_owner, repository_name)
+            for job in jobs
+            if has_job_details(job)
+        ]
+
+        return get_workflow_data(
+            workflow,
+            jobs_details,
+            self.steps_grouping,
+            jobs,
+        )
+
+    def generate_workflows_data_from_workflows_ids(
+        self,
+        workflows_ids: list[str],
+        repository_owner: str,
+        repository_name: str,
+    ) -> abc.Iterator[types.WorkflowRunData]:
         for workflow_id in workflows_ids:
-            resp_wf_jobs = self.get(f"/workflow/{workflow_id}/job")
+            yield self._get_workflow_data(
+                workflow_id,
+                repository_owner,
+                repository_name,
+            )
+
+    ##############################
+    ############ TREND RELATED STUFF
+    ##############################
 
-            jobs = typing.cast(
-                circleci_types.WorkflowsJobs,
-                resp_wf_jobs.json(),
+    def get_jobs_durations_trends(
+        self,
+        repository_owner: str,
+        repository_name: str,
+        reporting_window: str,
+    ) -> list[types.JobDurationTrend]:
+        config = utils.get_circleci_config()
+
+        trends: list[types.JobDurationTrend] = []
+        for workflow_name in utils.get_circleci_benchmark_workflows_names():
+            # A single listing of all the jobs of the workflow, with the
+            # percentiles of their durations already computed
+            insights_jobs: abc.Iterator[circleci_types.InsightsJob] = self.paginate(
+                f"/insights/gh/{repository_owner}/{repository_name}/workflows/{workflow_name}/jobs",
+                "items",
+                params={"reporting-window": reporting_window, "all-branches": "true"},
+            )
+            trends.extend(
+                get_jobs_durations_trends_from_insights(
+                    insights_jobs,
+                    workflow_name,
+                    config,
+                ),
             )
-            for job in jobs["items"]:
-                # The v2 api doesn't have build time per steps, so we need to use v1.1
-                resp_job_details = self.get(
-                    f"{BASE_URL_V1_1}/project/github/{repository_owner}/{repository_name}/{job['job_number']}",
-                )
 
-                details = typing.cast(
-                    circleci_types.JobDetails,
-                    resp_job_details.json(),
-                )
+        return trends
 
-                tested_repository = details["workflows"]["workflow_name"].replace(
-                    "Benchmark ",
-                    "",
-                )
 
-                time_per_step = get_time_spent_per_job_steps(details["steps"])
-                runner_os = get_machine_image_from_job_name_and_yaml_string(
-                    details["circle_yml"]["string"],
-                    details["workflows"]["job_name"],
+class AsyncCircleCiClient(CircleCiClientMixin, base.AsyncBaseClient):
+    def __init__(
+        self,
+        token: str,
+        max_concurrency: int = constants.DEFAULT_MAX_CONCURRENCY,
+        response_cache: cache.ResponseCache | None = None,
+        request_priority: rate_limit.RequestPriorityT = "low",
+        steps_grouping: steps.StepsGrouping | None = None,
+    ) -> None:
+        super().__init__(
+            base_url=BASE_URL,
+            headers=get_headers(token),
+            max_concurrency=max_concurrency,
+            response_cache=response_cache,
+            request_priority=request_priority,
+            steps_grouping=steps_grouping,
+        )
+        self.init_dispatch_state()
+
+    ##############################
+    ############ WORKFLOW DISPATCH
+    ##############################
+
+    async def _get_pipeline_workflows(
+        self,
+        pipeline_id: str,
+    ) -> list[circleci_types.Workflow]:
+        return [
+            w async for w in self.paginate(f"/pipeline/{pipeline_id}/workflow", "items")
+        ]
+
+    async def get_workflows_ids_of_pipeline(self, pipeline_id: str) -> list[str]:
+        """
+        Asynchronous counterpart of `CircleCiClient.get_workflows_ids_of_pipeline`.
+        """
+        while True:
+            workflows_ids = get_workflows_ids_if_created(
+                await self._get_pipeline_workflows(pipeline_id),
+            )
+            if workflows_ids is None:
+                await asyncio.sleep(2)
+                continue
+
+            return workflows_ids
+
+    async def _create_pipeline(
+        self,
+        repository_owner: str,
+        repository_name: str,
+        workflow_dispatch_ref: str,
+    ) -> str | None:
+        resp_new_pipeline = await self.post(
+            f"/project/github/{repository_owner}/{repository_name}/pipeline",
+            json={"branch": workflow_dispatch_ref},
+        )
+        return get_new_pipeline_id(self.logger, resp_new_pipeline)
+
+    async def send_dispatch_events(
+        self,
+        repository_owner: str,
+        repository_name: str,
+        workflow_dispatch_ref: str,
+        repetitions: int = 1,
+    ) -> int:
+        self.logger.info("Sending dispatch events for CircleCI workflows")
+        self.project_slug = f"gh/{repository_owner}/{repository_name}"
+
+        # Create all the pipelines at once, so every benchmark starts
+        # at the same time
+        pipelines_ids = await asyncio.gather(
+            *(
+                self._create_pipeline(
+                    repository_owner,
+                    repository_name,
+                    workflow_dispatch_ref,
                 )
+                for _ in range(repetitions)
+            ),
+        )
+        self.pipelines_ids.extend(p for p in pipelines_ids if p is not None)
+        if None in pipelines_ids:
+            return 1
+
+        pipelines_workflows_ids = await asyncio.gather(
+            *(
+                self.get_workflows_ids_of_pipeline(pipeline_id)
+                for pipeline_id in self.pipelines_ids
+            ),
+        )
 
-                for step_name, time_spent in time_per_step.items():
-                    additional_infos = ""
-                    if step_name in constants.CIRCLECI_JOB_STEPS:
-                        additional_infos = "CircleCI machine setup step"
-
-                    csv_data.append(
-                        types.CsvDataLine(
-                            ci_provider="CircleCI",
-                            runner_os=runner_os,
-                            runner_type="CircleCI-Hosted",
-                            runner_cores=details["picard"]["resource_class"]["cpu"],
-                            tested_repository=tested_repository,
-                            step_name=step_name,
-                            time_spent_in_secs=time_spent,
-                            additional_infos=additional_infos,
-                        ),
-                    )
-
-        return csv_data
+        write_workflows_ids_to_github_env(
+            self.logger,
+            (
+                workflow_id
+                for workflows_ids in pipelines_workflows_ids
+                for workflow_id in workflows_ids
+            ),
+        )
+
+        return 0
+
+    async def get_workflows_expected_durations(
+        self,
+    ) -> dict[str, datetime.timedelta]:
+        """
+        Returns the median duration of the latest runs of each workflow,
+        as computed by CircleCI Insights.
+        """
+        try:
+            resp_insights = await self.get(f"/insights/{self.project_slug}/workflows")
+        except httpx.HTTPError:
+            log_insights_unavailable(self.logger)
+            return {}
+
+        return get_workflows_expected_durations_from_insights(
+            typing.cast(circleci_types.InsightsWorkflows, resp_insights.json()),
+        )
+
+    async def wait_for_workflows_to_end(self) -> dict[str, datetime.datetime]:
+        self.logger.info("Starting workflows polling...")
+
+        scheduler = polling.PollingScheduler(
+            await self.get_workflows_expected_durations(),
+        )
+        workflows_finished_at: dict[str, datetime.datetime] = {}
+
+        while True:
+            pipelines_workflows = await asyncio.gather(
+                *(
+                    self._get_pipeline_workflows(pipeline_id)
+                    for pipeline_id in self.pipelines_ids
+                ),
+            )
+
+            running_workflows, stopped_workflows = update_polled_workflows(
+                [w for workflows in pipelines_workflows for w in workflows],
+                workflows_finished_at,
+            )
+            log_stopped_workflows(self.logger, stopped_workflows, workflows_finished_at)
+
+            delay = self.get_next_poll_delay(
+                scheduler,
+                running_workflows,
+            )
+            if delay is None:
+                return workflows_finished_at
+
+            await asyncio.sleep(delay)
+
+    ##############################
+    ############ CSV RELATED STUFF
+    ##############################
+
+    async def _get_job_details(
+        self,
+        job: circleci_types.WorkflowsJob,
+        repository_owner: str,
+        repository_name: str,
+    ) -> circleci_types.JobDetails:
+        return get_job_details_from_response(
+            await self.get(get_job_details_url(job, repository_owner, repository_name)),
+        )
+
+    async def _get_workflow_jobs(
+        self,
+        workflow_id: str,
+    ) -> list[circleci_types.WorkflowsJob]:
+        return [
+            job async for job in self.paginate(f"/workflow/{workflow_id}/job", "items")
+        ]
+
+    async def _get_workflow_data(
+        self,
+        workflow_id: str,
+        repository_owner: str,
+        repository_name: str,
+    ) -> types.WorkflowRunData:
+        resp_workflow, jobs = await asyncio.gather(
+            self.get(f"/workflow/{workflow_id}"),
+            self._get_workflow_jobs(workflow_id),
+        )
+        workflow = typing.cast(circleci_types.Workflow, resp_workflow.json())
+
+        jobs_details = await asyncio.gather(
+            *(
+                self._get_job_details(job, repository_owner, repository_name)
+                for job in jobs
+                if has_job_details(job)
+            ),
+        )
+
+        return get_workflow_data(
+            workflow,
+            jobs_details,
+            self.steps_grouping,
+            jobs,
+        )
+
+    async def generate_workflows_data_from_workflows_ids(
+        self,
+        workflows_ids: list[str],
+        repository_owner: str,
+        repository_name: str,
+    ) -> abc.AsyncIterator[types.WorkflowRunData]:
+        # `iter_in_order` yields the results in the order of the coroutines,
+        # so the data is in the same order as with the synchronous client.
+        async for workflow_data in self.iter_in_order(
+            self._get_workflow_data(
+                workflow_id,
+                repository_owner,
+                repository_name,
+            )
+            for workflow_id in workflows_ids
+        ):
+            yield workflow_data
@@ -1,18 +1,40 @@
+import asyncio
+import collections
+from collections import abc
 import datetime
+import io
 import re
 import time
 import typing
+import zipfile
 
+import daiquiri
+
+from ci_benchmark_tooling import cache
 from ci_benchmark_tooling import constants
+from ci_benchmark_tooling import polling
+from ci_benchmark_tooling import rate_limit
+from ci_benchmark_tooling import resource_sampler
+from ci_benchmark_tooling import steps
 from ci_benchmark_tooling import types
 from ci_benchmark_tooling import utils
 from ci_benchmark_tooling.clients import base
 from ci_benchmark_tooling.http_types import github_types
 
 
+BASE_URL = "https://api.github.com"
+
 RE_IMAGE_NAME_CORES = re.compile(r"-\d+-cores$")
 
 
+def get_headers(token: str) -> dict[str, str]:
+    return {
+        "Accept": "application/vnd.github+json",
+        "X-GitHub-Api-Version": "2022-11-28",
+        "Authorization": f"Bearer {token}",
+    }
+
+
 def get_infos_from_github_job_name(job_name: str) -> types.GitHubJobNameInfos:
     if job_name.count(" - ") == 3:
         (
@@ -53,12 +75,12 @@ def get_infos_from_github_job_name(job_name: str) -> types.GitHubJobNameInfos:
 
 def get_time_spent_per_job_step(
     job_steps: list[github_types.GitHubJobRunStep],
+    tested_repository: str = "",
+    steps_grouping: steps.StepsGrouping | None = None,
 ) -> dict[str, datetime.timedelta]:
     time_per_step = {}
     for s in job_steps:
-        if s["name"].startswith("Clone "):
-            # Ignore the `Clone` of the repo we are benchmarking,
-            # since it is not relevant to the benchmark itself
+        if not steps.is_benchmark_step(s["name"]):
             continue
 
         time_spent = datetime.datetime.fromisoformat(
@@ -66,10 +88,12 @@ def get_time_spent_per_job_step(
         ) - datetime.datetime.fromisoformat(s["started_at"])
 
         # Group the build steps of the repository we tested
-        if s["name"] not in constants.GITHUB_JOB_STEPS:
-            step_name = constants.CSV_BENCHMARKED_APPLICATION_STEP_NAME
-        else:
-            step_name = s["name"]
+        step_name = steps.get_step_name(
+            s["name"],
+            tested_repository,
+            constants.GITHUB_JOB_STEPS,
+            steps_grouping,
+        )
 
         if step_name not in time_per_step:
             time_per_step[step_name] = time_spent
@@ -79,20 +103,478 @@ def get_time_spent_per_job_step(
     return time_per_step
 
 
-class GitHubClient(base.BaseClient):
-    def __init__(self, token: str) -> None:
-        super().__init__(
-            base_url="https://api.github.com",
-            headers={
-                "Accept": "application/vnd.github+json",
-                "X-GitHub-Api-Version": "2022-11-28",
-                "Authorization": f"Bearer {token}",
-            },
-            http2=True,
+def get_job_queue_time(
+    job: github_types.GitHubJobRun,
+    workflow_run_created_at: str | None = None,
+) -> datetime.timedelta | None:
+    """
+    Returns the time `job` waited for a runner, from its creation, or the
+    creation of its workflow run for the jobs without `created_at`.
+    """
+    created_at = job.get("created_at") or workflow_run_created_at
+    if not created_at or not job["started_at"]:
+        return None
+
+    queue_time = datetime.datetime.fromisoformat(
+        job["started_at"],
+    ) - datetime.datetime.fromisoformat(created_at)
+    # The dates don't have the same precision, the job can seem to start
+    # a bit before being created.
+    return max(queue_time, datetime.timedelta(0))
+
+
+def get_csv_data_from_job_list(
+    job_list: github_types.GitHubJobRunList,
+    steps_grouping: steps.StepsGrouping | None = None,
+    workflow_run_created_at: str | None = None,
+) -> list[types.CsvDataLine]:
+    csv_data: list[types.CsvDataLine] = []
+
+    for job in job_list["jobs"]:
+        # Retrieve all the infos we will put in the CSV from the job name
+        job_infos = get_infos_from_github_job_name(job["name"])
+
+        queue_time = get_job_queue_time(job, workflow_run_created_at)
+        if queue_time is not None:
+            csv_data.append(
+                types.CsvDataLine(
+                    ci_provider="GitHub",
+                    runner_os=job_infos.runner_os,
+                    runner_type=job_infos.runner_type,
+                    runner_cores=job_infos.runner_cores,
+                    tested_repository=job_infos.tested_repository,
+                    step_name=constants.CSV_QUEUE_TIME_STEP_NAME,
+                    time_spent_in_secs=steps.get_time_spent_in_secs(
+                        queue_time,
+                        steps_grouping,
+                    ),
+                    additional_infos=job_infos.additional_infos,
+                ),
+            )
+
+        time_per_step = get_time_spent_per_job_step(
+            job["steps"],
+            job_infos.tested_repository,
+            steps_grouping,
         )
+
+        for step_name, time_spent in time_per_step.items():
+            additional_infos = job_infos.additional_infos
+            if step_name in constants.GITHUB_JOB_STEPS:
+                if additional_infos:
+                    additional_infos += " / "
+
+                additional_infos += constants.GITHUB_JOB_STEPS_ADDITIONAL_INFOS
+
+            csv_data.append(
+                types.CsvDataLine(
+                    ci_provider="GitHub",
+                    runner_os=job_infos.runner_os,
+                    runner_type=job_infos.runner_type,
+                    runner_cores=job_infos.runner_cores,
+                    tested_repository=job_infos.tested_repository,
+                    step_name=step_name,
+                    time_spent_in_secs=steps.get_time_spent_in_secs(
+                        time_spent,
+                        steps_grouping,
+                    ),
+                    additional_infos=additional_infos,
+                ),
+            )
+
+    return csv_data
+
+
+def get_workflow_jobs(
+    jobs: list[github_types.GitHubJobRun],
+    jobs_needs: list[types.GitHubJobNeeds],
+) -> list[types.WorkflowJob]:
+    """
+    Returns the jobs of a workflow run along with the jobs they depend on,
+    found by matching their names with the jobs of the workflow `jobs_needs`.
+    """
+    jobs_ids: dict[str, str] = {}
+    for job in jobs:
+        for job_needs in jobs_needs:
+            if job_needs.name_pattern.fullmatch(job["name"]):
+                jobs_ids[job["name"]] = job_needs.job_id
+                break
+
+    jobs_names_per_id: dict[str, list[str]] = collections.defaultdict(list)
+    for job_name, job_id in jobs_ids.items():
+        jobs_names_per_id[job_id].append(job_name)
+
+    needs_per_id = {job_needs.job_id: job_needs.needs for job_needs in jobs_needs}
+
+    return [
+        types.WorkflowJob(
+            name=job["name"],
+            started_at=datetime.datetime.fromisoformat(job["started_at"])
+            if job["started_at"]
+            else None,
+            stopped_at=datetime.datetime.fromisoformat(job["completed_at"])
+            if job["completed_at"]
+            else None,
+            dependencies=tuple(
+                job_name
+                for need in needs_per_id.get(jobs_ids.get(job["name"], ""), ())
+                for job_name in jobs_names_per_id[need]
+            ),
+        )
+        for job in jobs
+    ]
+
+
+def get_workflow_data(
+    workflow_run: github_types.GitHubWorkflowRun,
+    job_list: github_types.GitHubJobRunList,
+    steps_grouping: steps.StepsGrouping | None = None,
+    jobs_needs: list[types.GitHubJobNeeds] | None = None,
+) -> types.WorkflowRunData:
+    return types.WorkflowRunData(
+        workflow_id=str(workflow_run["id"]),
+        created_at=datetime.datetime.fromisoformat(workflow_run["created_at"]),
+        commit_sha=workflow_run["head_sha"],
+        csv_data=get_csv_data_from_job_list(
+            job_list,
+            steps_grouping,
+            workflow_run["created_at"],
+        ),
+        ci_provider="GitHub",
+        workflow_name=workflow_run["name"],
+        jobs=get_workflow_jobs(job_list["jobs"], jobs_needs or []),
+    )
+
+
+def get_created_filters(
+    created_since: datetime.datetime | None,
+    created_until: datetime.datetime | None,
+) -> list[str | None]:
+    """
+    Returns the `created` filters of the workflow runs listings covering the
+    runs created between `created_since` and `created_until`.
+
+    GitHub returns at most 1000 workflow runs for a filtered listing, so a
+    range starting at `created_since` is split in windows of
+    `GITHUB_RUNS_LISTING_WINDOW`, from the latest to the oldest.
+    """
+    if created_since is None:
+        if created_until is None:
+            return [None]
+        return [f"<{created_until.isoformat()}"]
+
+    # The filters only have a precision of a second
+    created_since = created_since.replace(microsecond=0)
+    end = (created_until or datetime.datetime.now(tz=constants.UTC)).replace(
+        microsecond=0,
+    )
+    filters: list[str | None] = []
+    while end > created_since:
+        start = max(end - constants.GITHUB_RUNS_LISTING_WINDOW, created_since)
+        # Both bounds of a range are inclusive, the runs created exactly at
+        # `end` are in the previous window, or after `created_until`.
+        filters.append(
+            f"{start.isoformat()}..{(end - datetime.timedelta(seconds=1)).isoformat()}",
+        )
+        end = start
+    return filters
+
+
+def get_latest_benchmark_workflows_ids_from_runs(
+    workflow_runs: abc.Iterable[github_types.GitHubWorkflowRun],
+    repetitions: int = 1,
+) -> list[str]:
+    """
+    Returns the ids of the `repetitions` most recent runs of every benchmark workflow,
+    `workflow_runs` being sorted from the most recent to the oldest.
+    Stops reading `workflow_runs` as soon as all of them are found.
+    """
+    ids: list[str] = []
+    benchmark_files = utils.get_github_benchmark_filenames_and_yaml_name_section()
+    remaining_runs_per_name = {
+        b.yaml_name_section_value: repetitions for b in benchmark_files
+    }
+
+    for job in workflow_runs:
+        if remaining_runs_per_name.get(job["name"], 0) > 0:
+            ids.append(str(job["id"]))
+            remaining_runs_per_name[job["name"]] -= 1
+
+            if not any(remaining_runs_per_name.values()):
+                break
+
+    return ids
+
+
+def get_job_steps_intervals(
+    job: github_types.GitHubJobRun,
+    steps_grouping: steps.StepsGrouping | None = None,
+) -> list[tuple[str, float, float]]:
+    """
+    Returns the name of each step of `job`, as in the report, along with its
+    start and end as POSIX timestamps.
+    """
+    tested_repository = get_infos_from_github_job_name(job["name"]).tested_repository
+    return [
+        (
+            steps.get_step_name(
+                s["name"],
+                tested_repository,
+                constants.GITHUB_JOB_STEPS,
+                steps_grouping,
+            ),
+            datetime.datetime.fromisoformat(s["started_at"]).timestamp(),
+            datetime.datetime.fromisoformat(s["completed_at"]).timestamp(),
+        )
+        for s in job["steps"]
+        if steps.is_benchmark_step(s["name"]) and s["started_at"] and s["completed_at"]
+    ]
+
+
+def is_finished_response(data: typing.Any) -> bool:
+    """
+    Returns whether `data` is a workflow run, or the list of jobs of a workflow run,
+    that is completed and will thus never change anymore.
+    """
+    if not isinstance(data, dict):
+        return False
+
+    if "workflow_id" in data and "jobs_url" in data:
+        return bool(data["status"] == "completed")
+
+    if "jobs" in data:
+        return bool(data["jobs"]) and all(
+            job["status"] == "completed" for job in data["jobs"]
+        )
+
+    return False
+
+
+def get_dispatch_date_str(now: datetime.datetime) -> str:
+    now_as_str = now.strftime("%Y-%m-%dT%H:%M:%S")
+    # GitHub needs the utcoffset to be "+XX:XX", the `%z` option of
+    # `strftime` returns us "+XXXX", so we need to manually add the `:`
+    z = now.strftime("%z")
+    return now_as_str + f"{z[:3]}:{z[3:]}"
+
+
+def add_dispatched_workflows_ids(
+    workflow_runs: abc.Iterable[github_types.GitHubWorkflowRun],
+    workflows_names_and_ids: dict[str, list[int]],
+    repetitions: int,
+) -> list[github_types.GitHubWorkflowRun]:
+    """
+    Adds the ids of `workflow_runs` to the ids of their workflow, until there
+    are `repetitions` of them, and returns the runs whose id was added.
+    """
+    added_runs = []
+    for workflow_run in workflow_runs:
+        ids = workflows_names_and_ids.get(workflow_run["name"])
+        if ids is not None and len(ids) < repetitions and workflow_run["id"] not in ids:
+            ids.append(workflow_run["id"])
+            added_runs.append(workflow_run)
+
+    return added_runs
+
+
+def get_workflows_ids_for_env(workflows_names_and_ids: dict[str, list[int]]) -> str:
+    return ",".join(
+        str(run_id) for ids in workflows_names_and_ids.values() for run_id in ids
+    )
+
+
+def get_workflows_expected_durations_from_runs(
+    workflow_runs: list[github_types.GitHubWorkflowRun],
+) -> dict[str, datetime.timedelta]:
+    durations: dict[str, list[datetime.timedelta]] = collections.defaultdict(list)
+    for workflow_run in workflow_runs:
+        durations[workflow_run["name"]].append(
+            datetime.datetime.fromisoformat(workflow_run["updated_at"])
+            - datetime.datetime.fromisoformat(workflow_run["run_started_at"]),
+        )
+
+    return polling.get_median_durations(durations)
+
+
+def update_polled_workflows(
+    workflow_runs: abc.Iterable[github_types.GitHubWorkflowRun],
+    workflows_ids_and_names: dict[int, str],
+    workflows_finished_at: dict[str, datetime.datetime],
+) -> tuple[dict[int, polling.PolledWorkflow], list[github_types.GitHubWorkflowRun]]:
+    """
+    Adds the runs of `workflows_ids_and_names` that completed to
+    `workflows_finished_at`, and returns the ones still running along with
+    the ones that just completed.
+    """
+    running_workflows = {
+        run_id: polling.PolledWorkflow(workflow_name, None)
+        for run_id, workflow_name in workflows_ids_and_names.items()
+        if str(run_id) not in workflows_finished_at
+    }
+    completed_runs = []
+    for workflow_run in workflow_runs:
+        run_id = workflow_run["id"]
+        if run_id not in running_workflows:
+            continue
+
+        if workflow_run["status"] == "completed":
+            workflows_finished_at[str(run_id)] = datetime.datetime.fromisoformat(
+                workflow_run["updated_at"],
+            )
+            completed_runs.append(workflow_run)
+            del running_workflows[run_id]
+        elif workflow_run["status"] == "in_progress":
+            running_workflows[run_id] = polling.PolledWorkflow(
+                workflow_run["name"],
+                datetime.datetime.fromisoformat(workflow_run["run_started_at"]),
+            )
+
+    return running_workflows, completed_runs
+
+
+def log_completed_runs(
+    logger: daiquiri.KeywordArgumentAdapter,
+    completed_runs: list[github_types.GitHubWorkflowRun],
+    workflows_finished_at: dict[str, datetime.datetime],
+) -> None:
+    for workflow_run in completed_runs:
+        logger.info(
+            "Workflow '%s' (%s) finished at %s",
+            workflow_run["name"],
+            workflow_run["id"],
+            workflows_finished_at[str(workflow_run["id"])].isoformat(),
+            conclusion=workflow_run["conclusion"],
+        )
+
+
+def get_workflow_runs_url(repository_owner: str, repository_name: str) -> str:
+    return f"/repos/{repository_owner}/{repository_name}/actions/runs"
+
+
+def get_workflow_dispatches_url(
+    repository_owner: str,
+    repository_name: str,
+    benchmark_filename: str,
+) -> str:
+    return f"/repos/{repository_owner}/{repository_name}/actions/workflows/{benchmark_filename}/dispatches"
+
+
+def get_dispatched_workflow_runs_params(dispatch_date_str: str) -> dict[str, str | int]:
+    return {"event": "workflow_dispatch", "created": f"{dispatch_date_str}..*"}
+
+
+def get_expected_durations_params() -> dict[str, str | int]:
+    return {
+        "event": "workflow_dispatch",
+        "status": "success",
+        "per_page": constants.PAGINATION_PER_PAGE,
+    }
+
+
+def get_workflows_ids_and_names(
+    workflows_names_and_ids: dict[str, list[int]],
+) -> dict[int, str]:
+    return {
+        run_id: workflow_name
+        for workflow_name, ids in workflows_names_and_ids.items()
+        for run_id in ids
+    }
+
+
+def get_workflow_data_from_run_and_jobs(
+    workflow_run: github_types.GitHubWorkflowRun,
+    jobs: list[github_types.GitHubJobRun],
+    steps_grouping: steps.StepsGrouping | None = None,
+) -> types.WorkflowRunData:
+    return get_workflow_data(
+        workflow_run,
+        github_types.GitHubJobRunList(total_count=len(jobs), jobs=jobs),
+        steps_grouping,
+        utils.get_github_benchmark_jobs_needs().get(workflow_run["name"]),
+    )
+
+
+def log_found_workflows_ids(
+    logger: daiquiri.KeywordArgumentAdapter,
+    added_runs: list[github_types.GitHubWorkflowRun],
+) -> None:
+    for workflow_run in added_runs:
+        logger.info(
+            "Found workflow_id (%s) for workflow '%s'",
+            workflow_run["id"],
+            workflow_run["name"],
+        )
+
+
+def write_workflows_ids_to_github_env(
+    logger: daiquiri.KeywordArgumentAdapter,
+    workflows_names_and_ids: dict[str, list[int]],
+) -> None:
+    workflows_ids_for_env = get_workflows_ids_for_env(workflows_names_and_ids)
+    logger.info("Workflows IDs: %s", workflows_ids_for_env)
+
+    utils.write_workflow_ids_to_github_env(
+        constants.GITHUB_WORKFLOW_IDS_ENV_PREFIX,
+        workflows_ids_for_env,
+    )
+
+
+class GitHubClientMixin(base.ClientMixin):
+    """
+    Handling of the GitHub responses shared by the synchronous and
+    asynchronous clients.
+    """
+
+    def is_response_cacheable(self, data: typing.Any) -> bool:
+        return is_finished_response(data)
+
+    def get_pagination_params(self) -> dict[str, int]:
+        return {"per_page": constants.PAGINATION_PER_PAGE}
+
+    def init_dispatch_state(self) -> None:
         self.repository_owner: str | None = None
         self.repository_name: str | None = None
-        self.workflows_names_and_ids: dict[str, int] | None = None
+        self.workflows_names_and_ids: dict[str, list[int]] | None = None
+        self.dispatch_date_str: str | None = None
+
+    def get_dispatch_workflow_runs_url(self) -> str:
+        if self.repository_owner is None or self.repository_name is None:
+            raise RuntimeError(
+                "self.repository_owner and self.repository_name should not be None",
+            )
+        return get_workflow_runs_url(self.repository_owner, self.repository_name)
+
+    def get_dispatched_workflow_runs_listing(
+        self,
+    ) -> tuple[str, dict[str, str | int]]:
+        """
+        Returns the url and params of the listing of the runs created since
+        the dispatch events were sent.
+        """
+        if self.dispatch_date_str is None:
+            raise RuntimeError("self.dispatch_date_str should not be None")
+        return (
+            self.get_dispatch_workflow_runs_url(),
+            get_dispatched_workflow_runs_params(self.dispatch_date_str),
+        )
+
+
+class GitHubClient(GitHubClientMixin, base.BaseClient):
+    def __init__(
+        self,
+        token: str,
+        response_cache: cache.ResponseCache | None = None,
+        request_priority: rate_limit.RequestPriorityT = "low",
+        steps_grouping: steps.StepsGrouping | None = None,
+    ) -> None:
+        super().__init__(
+            base_url=BASE_URL,
+            headers=get_headers(token),
+            response_cache=response_cache,
+            request_priority=request_priority,
+            steps_grouping=steps_grouping,
+        )
+        self.init_dispatch_state()
 
     ##############################
     ############ WORKFLOW DISPATCH
@@ -102,55 +584,77 @@ class GitHubClient(base.BaseClient):
         self,
         repository_owner: str,
         repository_name: str,
+        repetitions: int = 1,
     ) -> list[str]:
-        ids: list[str] = []
-        benchmark_files = utils.get_github_benchmark_filenames_and_yaml_name_section()
-        benchmark_names = [b.yaml_name_section_value for b in benchmark_files]
-
-        resp_workflows = self.get(
-            f"/repos/{repository_owner}/{repository_name}/actions/runs",
-            params={
-                "event": "workflow_dispatch",
-            },
-        )
-        job_runs = typing.cast(
-            github_types.GitHubWorkflowRunsList,
-            resp_workflows.json(),
+        return get_latest_benchmark_workflows_ids_from_runs(
+            self.paginate(
+                get_workflow_runs_url(repository_owner, repository_name),
+                "workflow_runs",
+                params={"event": "workflow_dispatch"},
+            ),
+            repetitions,
         )
 
-        for job in job_runs["workflow_runs"]:
-            if job["name"] in benchmark_names:
-                ids.append(str(job["id"]))
-                benchmark_names.remove(job["name"])
+    def get_benchmark_workflows_runs(
+        self,
+        repository_owner: str,
+        repository_name: str,
+        created_since: datetime.datetime | None,
+        created_until: datetime.datetime | None = None,
+    ) -> list[types.BenchmarkWorkflowRun]:
+        benchmark_names = {
+            b.yaml_name_section_value
+            for b in utils.get_github_benchmark_filenames_and_yaml_name_section()
+        }
+
+        workflows_runs: list[types.BenchmarkWorkflowRun] = []
+        for created_filter in get_created_filters(created_since, created_until):
+            params: dict[str, str | int] = {"event": "workflow_dispatch"}
+            if created_filter is not None:
+                params["created"] = created_filter
 
-        return ids
+            workflow_runs: abc.Iterator[github_types.GitHubWorkflowRun] = self.paginate(
+                get_workflow_runs_url(repository_owner, repository_name),
+                "workflow_runs",
+                params=params,
+            )
+            workflows_runs.extend(
+                types.BenchmarkWorkflowRun(
+                    workflow_id=str(workflow_run["id"]),
+                    created_at=datetime.datetime.fromisoformat(
+                        workflow_run["created_at"],
+                    ),
+                    finished=workflow_run["status"] == "completed",
+                )
+                for workflow_run in workflow_runs
+                if workflow_run["name"] in benchmark_names
+            )
+
+        return workflows_runs
 
     def retrieve_workflows_ids(
         self,
         owner: str,
         repository: str,
         now_as_str: str,
-        workflows_names_and_ids: dict[str, int],
+        workflows_names_and_ids: dict[str, list[int]],
+        repetitions: int = 1,
     ) -> None:
-        while -1 in workflows_names_and_ids.values():
-            required_names = [k for k, v in workflows_names_and_ids.items() if v == -1]
-
-            resp_wr = self.get(
-                f"/repos/{owner}/{repository}/actions/runs",
-                params={
-                    "event": "workflow_dispatch",
-                    "created": f"{now_as_str}..*",
-                },
+        while any(len(ids) < repetitions for ids in workflows_names_and_ids.values()):
+            workflow_runs: abc.Iterator[github_types.GitHubWorkflowRun] = self.paginate(
+                get_workflow_runs_url(owner, repository),
+                "workflow_runs",
+                params=get_dispatched_workflow_runs_params(now_as_str),
             )
 
-            for workflow_run in resp_wr.json()["workflow_runs"]:
-                if workflow_run["name"] in required_names:
-                    workflows_names_and_ids[workflow_run["name"]] = workflow_run["id"]
-                    self.logger.info(
-                        "Found workflow_id (%s) for workflow '%s'",
-                        workflow_run["id"],
-                        workflow_run["name"],
-                    )
+            log_found_workflows_ids(
+                self.logger,
+                add_dispatched_workflows_ids(
+                    workflow_runs,
+                    workflows_names_and_ids,
+                    repetitions,
+                ),
+            )
 
             time.sleep(2)
 
@@ -160,10 +664,11 @@ class GitHubClient(base.BaseClient):
         repository: str,
         workflow_dispatch_ref: str,
         benchmark_filenames: list[str],
+        repetitions: int = 1,
     ) -> int:
-        for benchmark_filename in benchmark_filenames:
+        for benchmark_filename in benchmark_filenames * repetitions:
             self.post(
-                f"/repos/{owner}/{repository}/actions/workflows/{benchmark_filename}/dispatches",
+                get_workflow_dispatches_url(owner, repository, benchmark_filename),
                 json={
                     "ref": workflow_dispatch_ref,
                 },
@@ -181,6 +686,7 @@ class GitHubClient(base.BaseClient):
         repository_owner: str,
         repository_name: str,
         workflow_dispatch_ref: str,
+        repetitions: int = 1,
     ) -> int:
         self.repository_owner = repository_owner
         self.repository_name = repository_name
@@ -194,27 +700,24 @@ class GitHubClient(base.BaseClient):
 
         # Need to retrieve `datetime.now` before the dispatch requests so we can properly
         # filter the workflow_runs
-        now = datetime.datetime.now(tz=constants.UTC)
-        now_as_str = now.strftime("%Y-%m-%dT%H:%M:%S")
-        # GitHub needs the utcoffset to be "+XX:XX", the `%z` option of
-        # `strftime` returns us "+XXXX", so we need to manually add the `:`
-        z = now.strftime("%z")
-        now_as_str += f"{z[:3]}:{z[3:]}"
+        now_as_str = get_dispatch_date_str(datetime.datetime.now(tz=constants.UTC))
+        self.dispatch_date_str = now_as_str
 
         ret_value = self._send_dispatch_event_for_benchmark_files(
             self.repository_owner,
             self.repository_name,
             workflow_dispatch_ref,
             [f.filename for f in benchmark_files],
+            repetitions,
         )
         if ret_value != 0:
             return ret_value
 
         # Initiate the dict of workflow names and ids with
-        # all the ids set to -1, the ids will be set by the call
+        # empty lists of ids, the ids will be set by the call
         # to the function `self.retrieve_workflows_ids`
         self.workflows_names_and_ids = {
-            f.yaml_name_section_value: -1 for f in benchmark_files
+            f.yaml_name_section_value: [] for f in benchmark_files
         }
 
         self.retrieve_workflows_ids(
@@ -222,63 +725,82 @@ class GitHubClient(base.BaseClient):
             self.repository_name,
             now_as_str,
             self.workflows_names_and_ids,
+            repetitions,
         )
 
-        workflows_ids_for_env = ",".join(
-            map(str, self.workflows_names_and_ids.values()),
-        )
-        self.logger.info("Workflows IDs: %s", workflows_ids_for_env)
+        write_workflows_ids_to_github_env(self.logger, self.workflows_names_and_ids)
 
-        utils.write_workflow_ids_to_github_env(
-            constants.GITHUB_WORKFLOW_IDS_ENV_PREFIX,
-            workflows_ids_for_env,
+        return 0
+
+    def get_workflows_expected_durations(self) -> dict[str, datetime.timedelta]:
+        """
+        Returns the median duration of the latest successful runs of each workflow.
+        """
+        resp_wr = self.get(
+            self.get_dispatch_workflow_runs_url(),
+            params=get_expected_durations_params(),
+        )
+        workflow_runs = typing.cast(
+            github_types.GitHubWorkflowRunsList,
+            resp_wr.json(),
         )
 
-        return 0
+        return get_workflows_expected_durations_from_runs(
+            workflow_runs["workflow_runs"],
+        )
 
-    def wait_for_workflows_to_end(self) -> None:
+    def wait_for_workflows_to_end(self) -> dict[str, datetime.datetime]:
         self.logger.info("Starting workflows polling...")
 
-        if self.workflows_names_and_ids is None:
+        if self.workflows_names_and_ids is None or self.dispatch_date_str is None:
             raise RuntimeError(
-                "self.workflows_names_and_ids should not be None",
+                "self.workflows_names_and_ids and self.dispatch_date_str should not be None",
             )
 
-        workflows_names_and_ids = self.workflows_names_and_ids.copy()
-        while workflows_names_and_ids:
-            keys_to_del = []
-            for workflow_name, run_id in workflows_names_and_ids.items():
-                resp_wr = self.get(
-                    f"/repos/{self.repository_owner}/{self.repository_name}/actions/runs/{run_id}",
-                )
+        scheduler = polling.PollingScheduler(self.get_workflows_expected_durations())
+        workflows_ids_and_names = get_workflows_ids_and_names(
+            self.workflows_names_and_ids,
+        )
+        workflows_finished_at: dict[str, datetime.datetime] = {}
 
-                if resp_wr.json()["conclusion"] is not None:
-                    self.logger.info("Workflow '%s' finished", workflow_name)
-                    keys_to_del.append(workflow_name)
+        while True:
+            # Retrieve all the runs we dispatched at once, instead of polling
+            # each run one by one.
+            runs_url, runs_params = self.get_dispatched_workflow_runs_listing()
+            workflow_runs: abc.Iterator[github_types.GitHubWorkflowRun] = self.paginate(
+                runs_url,
+                "workflow_runs",
+                params=runs_params,
+            )
 
-            for key in keys_to_del:
-                del workflows_names_and_ids[key]
+            running_workflows, completed_runs = update_polled_workflows(
+                workflow_runs,
+                workflows_ids_and_names,
+                workflows_finished_at,
+            )
+            log_completed_runs(self.logger, completed_runs, workflows_finished_at)
 
-            if not workflows_names_and_ids:
-                self.logger.info("Workflows polling finished")
-                return
+            delay = self.get_next_poll_delay(
+                scheduler,
+                list(running_workflows.values()),
+            )
+            if delay is None:
+                return workflows_finished_at
 
-            time.sleep(60)
+            time.sleep(delay)
 
     ##############################
     ############ CSV RELATED STUFF
     ##############################
 
-    def _get_workflow_csv_data(
+    def _get_workflow_data(
         self,
         workflow_id: str,
         repository_owner: str,
         repository_name: str,
-    ) -> list[types.CsvDataLine]:
-        csv_data: list[types.CsvDataLine] = []
-
+    ) -> types.WorkflowRunData:
         resp_wr = self.get(
-            f"/repos/{repository_owner}/{repository_name}/actions/runs/{workflow_id}",
+            f"{get_workflow_runs_url(repository_owner, repository_name)}/{workflow_id}",
         )
 
         workflow_run = typing.cast(
@@ -286,53 +808,312 @@ class GitHubClient(base.BaseClient):
             resp_wr.json(),
         )
         # Find the jobs data for the workflow_run
-        workflow_run["jobs_url"]
-        resp_jobs = self.get(workflow_run["jobs_url"])
-
-        job_list = typing.cast(github_types.GitHubJobRunList, resp_jobs.json())
-        for job in job_list["jobs"]:
-            # Retrieve all the infos we will put in the CSV from the job name
-            job_infos = get_infos_from_github_job_name(job["name"])
-            time_per_step = get_time_spent_per_job_step(job["steps"])
-
-            for step_name, time_spent in time_per_step.items():
-                additional_infos = job_infos.additional_infos
-                if step_name in constants.GITHUB_JOB_STEPS:
-                    if additional_infos:
-                        additional_infos += " / "
-
-                    additional_infos += "GitHub runner setup step"
-
-                csv_data.append(
-                    types.CsvDataLine(
-                        ci_provider="GitHub",
-                        runner_os=job_infos.runner_os,
-                        runner_type=job_infos.runner_type,
-                        runner_cores=job_infos.runner_cores,
-                        tested_repository=job_infos.tested_repository,
-                        step_name=step_name,
-                        time_spent_in_secs=int(time_spent.total_seconds()),
-                        additional_infos=additional_infos,
-                    ),
-                )
+        jobs: list[github_types.GitHubJobRun] = list(
+            self.paginate(workflow_run["jobs_url"], "jobs"),
+        )
 
-        return csv_data
+        return get_workflow_data_from_run_and_jobs(
+            workflow_run,
+            jobs,
+            self.steps_grouping,
+        )
 
-    def generate_csv_data_from_workflows_ids(
+    def generate_workflows_data_from_workflows_ids(
         self,
         workflows_ids: list[str],
         repository_owner: str,
         repository_name: str,
-    ) -> list[types.CsvDataLine]:
-        csv_data: list[types.CsvDataLine] = []
-
+    ) -> abc.Iterator[types.WorkflowRunData]:
         for workflow_id in workflows_ids:
-            csv_data.extend(
-                self._get_workflow_csv_data(
-                    workflow_id,
+            yield self._get_workflow_data(
+                workflow_id,
+                repository_owner,
+                repository_name,
+            )
+
+    ##############################
+    ############ RUNNER RESOURCES
+    ##############################
+
+    def get_runner_resources_summaries(
+        self,
+        workflow_id: str,
+        repository_owner: str,
+        repository_name: str,
+    ) -> list[resource_sampler.StepResourcesSummary]:
+        """
+        Returns the summary of the runner resources samples of each step of
+        the jobs of the workflow run that ran the sampler.
+        """
+        artifacts: list[github_types.GitHubArtifact] = [
+            artifact
+            for artifact in self.paginate(
+                f"/repos/{repository_owner}/{repository_name}/actions/runs/{workflow_id}/artifacts",
+                "artifacts",
+            )
+            if artifact["name"].startswith(constants.RESOURCE_SAMPLER_ARTIFACTS_PREFIX)
+            and not artifact["expired"]
+        ]
+        if not artifacts:
+            return []
+
+        jobs: dict[str, github_types.GitHubJobRun] = {
+            job["name"]: job
+            for job in self.paginate(
+                f"/repos/{repository_owner}/{repository_name}/actions/runs/{workflow_id}/jobs",
+                "jobs",
+            )
+        }
+
+        summaries: list[resource_sampler.StepResourcesSummary] = []
+        for artifact in artifacts:
+            # Redirects to the storage of the artifacts
+            resp_artifact = self.get(
+                artifact["archive_download_url"],
+                follow_redirects=True,
+            )
+            with zipfile.ZipFile(io.BytesIO(resp_artifact.content)) as archive:
+                for member in archive.namelist():
+                    header, samples = resource_sampler.load_samples(
+                        archive.read(member),
+                    )
+                    job = jobs.get(header.label)
+                    if job is None:
+                        self.logger.warning(
+                            "No job named `%s` for the runner resources of %s",
+                            header.label,
+                            artifact["name"],
+                            workflow_id=workflow_id,
+                        )
+                        continue
+
+                    summaries.extend(
+                        resource_sampler.get_steps_resources_summaries(
+                            header,
+                            samples,
+                            get_job_steps_intervals(job, self.steps_grouping),
+                        ),
+                    )
+
+        return summaries
+
+
+class AsyncGitHubClient(GitHubClientMixin, base.AsyncBaseClient):
+    def __init__(
+        self,
+        token: str,
+        max_concurrency: int = constants.DEFAULT_MAX_CONCURRENCY,
+        response_cache: cache.ResponseCache | None = None,
+        request_priority: rate_limit.RequestPriorityT = "low",
+        steps_grouping: steps.StepsGrouping | None = None,
+    ) -> None:
+        super().__init__(
+            base_url=BASE_URL,
+            headers=get_headers(token),
+            max_concurrency=max_concurrency,
+            response_cache=response_cache,
+            request_priority=request_priority,
+            steps_grouping=steps_grouping,
+        )
+        self.init_dispatch_state()
+
+    ##############################
+    ############ WORKFLOW DISPATCH
+    ##############################
+
+    async def _get_dispatched_workflow_runs(
+        self,
+    ) -> list[github_types.GitHubWorkflowRun]:
+        runs_url, runs_params = self.get_dispatched_workflow_runs_listing()
+        return [
+            workflow_run
+            async for workflow_run in self.paginate(
+                runs_url,
+                "workflow_runs",
+                params=runs_params,
+            )
+        ]
+
+    async def retrieve_workflows_ids(
+        self,
+        workflows_names_and_ids: dict[str, list[int]],
+        repetitions: int = 1,
+    ) -> None:
+        while any(len(ids) < repetitions for ids in workflows_names_and_ids.values()):
+            log_found_workflows_ids(
+                self.logger,
+                add_dispatched_workflows_ids(
+                    await self._get_dispatched_workflow_runs(),
+                    workflows_names_and_ids,
+                    repetitions,
+                ),
+            )
+
+            await asyncio.sleep(2)
+
+    async def _send_dispatch_event(
+        self,
+        repository_owner: str,
+        repository_name: str,
+        workflow_dispatch_ref: str,
+        benchmark_filename: str,
+    ) -> None:
+        await self.post(
+            get_workflow_dispatches_url(
+                repository_owner,
+                repository_name,
+                benchmark_filename,
+            ),
+            json={
+                "ref": workflow_dispatch_ref,
+            },
+        )
+
+        self.logger.info(
+            "Dispatch event successfuly sent for %s",
+            benchmark_filename,
+        )
+
+    async def send_dispatch_events(
+        self,
+        repository_owner: str,
+        repository_name: str,
+        workflow_dispatch_ref: str,
+        repetitions: int = 1,
+    ) -> int:
+        self.repository_owner = repository_owner
+        self.repository_name = repository_name
+
+        self.logger.info("Sending dispatch events for GitHub workflows")
+        benchmark_files = list(
+            utils.get_github_benchmark_filenames_and_yaml_name_section(),
+        )
+
+        self.logger.info("Benchmark files found: %s", benchmark_files)
+
+        # Need to retrieve `datetime.now` before the dispatch requests so we can properly
+        # filter the workflow_runs
+        self.dispatch_date_str = get_dispatch_date_str(
+            datetime.datetime.now(tz=constants.UTC),
+        )
+
+        # Send all the dispatch events at once, so every benchmark starts
+        # at the same time
+        await asyncio.gather(
+            *(
+                self._send_dispatch_event(
                     repository_owner,
                     repository_name,
-                ),
+                    workflow_dispatch_ref,
+                    f.filename,
+                )
+                for f in benchmark_files * repetitions
+            ),
+        )
+
+        self.workflows_names_and_ids = {
+            f.yaml_name_section_value: [] for f in benchmark_files
+        }
+        await self.retrieve_workflows_ids(self.workflows_names_and_ids, repetitions)
+
+        write_workflows_ids_to_github_env(self.logger, self.workflows_names_and_ids)
+
+        return 0
+
+    async def get_workflows_expected_durations(
+        self,
+    ) -> dict[str, datetime.timedelta]:
+        """
+        Returns the median duration of the latest successful runs of each workflow.
+        """
+        resp_wr = await self.get(
+            self.get_dispatch_workflow_runs_url(),
+            params=get_expected_durations_params(),
+        )
+        workflow_runs = typing.cast(
+            github_types.GitHubWorkflowRunsList,
+            resp_wr.json(),
+        )
+
+        return get_workflows_expected_durations_from_runs(
+            workflow_runs["workflow_runs"],
+        )
+
+    async def wait_for_workflows_to_end(self) -> dict[str, datetime.datetime]:
+        self.logger.info("Starting workflows polling...")
+
+        if self.workflows_names_and_ids is None or self.dispatch_date_str is None:
+            raise RuntimeError(
+                "self.workflows_names_and_ids and self.dispatch_date_str should not be None",
+            )
+
+        scheduler = polling.PollingScheduler(
+            await self.get_workflows_expected_durations(),
+        )
+        workflows_ids_and_names = get_workflows_ids_and_names(
+            self.workflows_names_and_ids,
+        )
+        workflows_finished_at: dict[str, datetime.datetime] = {}
+
+        while True:
+            running_workflows, completed_runs = update_polled_workflows(
+                await self._get_dispatched_workflow_runs(),
+                workflows_ids_and_names,
+                workflows_finished_at,
             )
+            log_completed_runs(self.logger, completed_runs, workflows_finished_at)
+
+            delay = self.get_next_poll_delay(
+                scheduler,
+                list(running_workflows.values()),
+            )
+            if delay is None:
+                return workflows_finished_at
+
+            await asyncio.sleep(delay)
+
+    ##############################
+    ############ CSV RELATED STUFF
+    ##############################
+
+    async def _get_workflow_data(
+        self,
+        workflow_id: str,
+        repository_owner: str,
+        repository_name: str,
+    ) -> types.WorkflowRunData:
+        resp_wr = await self.get(
+            f"{get_workflow_runs_url(repository_owner, repository_name)}/{workflow_id}",
+        )
 
-        return csv_data
+        workflow_run = typing.cast(
+            github_types.GitHubWorkflowRun,
+            resp_wr.json(),
+        )
+        jobs: list[github_types.GitHubJobRun] = [
+            job async for job in self.paginate(workflow_run["jobs_url"], "jobs")
+        ]
+
+        return get_workflow_data_from_run_and_jobs(
+            workflow_run,
+            jobs,
+            self.steps_grouping,
+        )
+
+    async def generate_workflows_data_from_workflows_ids(
+        self,
+        workflows_ids: list[str],
+        repository_owner: str,
+        repository_name: str,
+    ) -> abc.AsyncIterator[types.WorkflowRunData]:
+        # `iter_in_order` yields the results in the order of the coroutines,
+        # so the data is in the same order as with the synchronous client.
+        async for workflow_data in self.iter_in_order(
+            self._get_workflow_data(
+                workflow_id,
+                repository_owner,
+                repository_name,
+            )
+            for workflow_id in workflows_ids
+        ):
+            yield workflow_data
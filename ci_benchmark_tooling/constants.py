@@ -1,3 +1,4 @@
+import datetime
 import zoneinfo
 
 
@@ -9,4 +10,82 @@ CIRCLECI_WORKFLOW_IDS_ENV_PREFIX = "CIRCLECI"
 GITHUB_JOB_STEPS = ("Set up job", "Complete job")
 CIRCLECI_JOB_STEPS = ("Spin up environment", "Preparing environment variables")
 
+GITHUB_JOB_STEPS_ADDITIONAL_INFOS = "GitHub runner setup step"
+CIRCLECI_JOB_STEPS_ADDITIONAL_INFOS = "CircleCI machine setup step"
+
 CSV_BENCHMARKED_APPLICATION_STEP_NAME = "Benchmarked application build"
+# Time a job waited, from the creation of its workflow run, before a runner
+# started it. It is not billed and is not part of the build itself.
+CSV_QUEUE_TIME_STEP_NAME = "Queue time"
+
+# Steps of the trend report, the time spent by the jobs of each runner
+# configuration aggregated over all their runs of the reporting window
+CSV_TREND_MEDIAN_STEP_NAME = "Job duration (median)"
+CSV_TREND_P95_STEP_NAME = "Job duration (p95)"
+
+# Reporting windows of the trend report, as named by CircleCI Insights, and
+# their number of days
+TREND_REPORTING_WINDOWS_DAYS = {
+    "last-7-days": 7,
+    "last-30-days": 30,
+    "last-60-days": 60,
+    "last-90-days": 90,
+}
+DEFAULT_TREND_REPORTING_WINDOW = "last-90-days"
+
+# Prefix of the names of the steps of the benchmark jobs running the runner
+# resources sampler, and of the artifacts of its samples, which are not part
+# of the benchmark itself
+RESOURCE_SAMPLER_STEPS_PREFIX = "Runner resources: "
+RESOURCE_SAMPLER_ARTIFACTS_PREFIX = "runner-resources"
+RESOURCE_SAMPLER_INTERVAL_SECONDS = 1.0
+
+# Maximum number of requests in flight at the same time per asynchronous client
+DEFAULT_MAX_CONCURRENCY = 10
+
+# Number of items requested per page for the listings that allow it
+PAGINATION_PER_PAGE = 100
+# Maximum number of pages fetched ahead of the one being read, when the api
+# tells the number of the last page
+PAGINATION_MAX_PREFETCHED_PAGES = 4
+
+# Limits of the connection pool shared by the clients, the HTTP/2 requests
+# to an api are multiplexed over a single connection as long as the api
+# accepts enough concurrent streams
+HTTP_MAX_CONNECTIONS = 20
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 10
+HTTP_KEEPALIVE_EXPIRY_SECONDS = 60.0
+
+# Upper bounds of the buckets of the requests latencies histograms
+INSTRUMENTATION_LATENCY_BUCKETS_SECONDS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Number of parsed YAML documents, and indexes built from them, kept in memory
+YAML_CACHE_MAX_ENTRIES = 64
+
+# Length of the date ranges the GitHub workflow runs listings are split in,
+# since a filtered listing returns at most 1000 runs
+GITHUB_RUNS_LISTING_WINDOW = datetime.timedelta(days=7)
+
+# Burst of requests allowed by the rate limiters before pacing them
+RATE_LIMIT_BURST = 10
+# Part of the rate limit budget that only the dispatch and polling requests can use
+RATE_LIMIT_RESERVED_RATIO = 0.1
+# Wait after a rate limited response that doesn't tell how long to wait
+RATE_LIMIT_DEFAULT_RETRY_AFTER_SECONDS = 60.0
+
+# Number of latest runs of each configuration whose median is the baseline
+# the new runs are compared to
+REGRESSION_BASELINE_RUNS = 10
+# Configurations with fewer runs in the baseline are not checked
+REGRESSION_MIN_BASELINE_RUNS = 3
+# Relative difference with the baseline above which a run is a regression
+REGRESSION_THRESHOLD = 0.1
+# Differences smaller than this are ignored, whatever their relative value
+REGRESSION_MIN_DIFFERENCE_SECONDS = 5.0
+
+POLLING_MIN_DELAY_SECONDS = 10.0
+POLLING_MAX_DELAY_SECONDS = 300.0
+# The workflows without history or overdue may end any time, never notice their
+# end later than the former fixed 60 seconds polling did
+POLLING_MAX_BACKOFF_DELAY_SECONDS = 60.0
+POLLING_JITTER_RATIO = 0.1
@@ -1,24 +1,78 @@
 #!/usr/bin/env python3
+from __future__ import annotations
+
 import argparse
+import asyncio
 import csv
 import logging
 import os
 import pathlib
+import typing
 
 import daiquiri
+import numpy as np
 
+from ci_benchmark_tooling import benchmark_statistics
+from ci_benchmark_tooling import cache
+from ci_benchmark_tooling import constants
+from ci_benchmark_tooling import instrumentation
+from ci_benchmark_tooling import latency
+from ci_benchmark_tooling import manifest
+from ci_benchmark_tooling import pricing
+from ci_benchmark_tooling import rate_limit
+from ci_benchmark_tooling import regressions
+from ci_benchmark_tooling import report_writer
+from ci_benchmark_tooling import resource_sampler
+from ci_benchmark_tooling import steps
+from ci_benchmark_tooling import store
+from ci_benchmark_tooling import transport
 from ci_benchmark_tooling import types
 from ci_benchmark_tooling import utils
+from ci_benchmark_tooling import workflow_graph
+from ci_benchmark_tooling.clients import github as gh_client
+
+
+if typing.TYPE_CHECKING:
+    from ci_benchmark_tooling.clients import base as base_clients
 
 
 daiquiri.setup(level=logging.INFO)
 LOG = daiquiri.getLogger(__name__)
 
 OUTPUT_CSV_FILE = pathlib.Path(os.path.dirname(__file__)) / "benchmark_data.csv"
+OUTPUT_STATISTICS_CSV_FILE = (
+    pathlib.Path(os.path.dirname(__file__)) / "benchmark_statistics.csv"
+)
+OUTPUT_COMPARISONS_CSV_FILE = (
+    pathlib.Path(os.path.dirname(__file__)) / "benchmark_comparisons.csv"
+)
+OUTPUT_COSTS_CSV_FILE = pathlib.Path(os.path.dirname(__file__)) / "benchmark_costs.csv"
+OUTPUT_LATENCIES_CSV_FILE = (
+    pathlib.Path(os.path.dirname(__file__)) / "benchmark_latencies.csv"
+)
+OUTPUT_WORKFLOWS_CSV_FILE = (
+    pathlib.Path(os.path.dirname(__file__)) / "benchmark_workflows.csv"
+)
+OUTPUT_REGRESSIONS_CSV_FILE = (
+    pathlib.Path(os.path.dirname(__file__)) / "benchmark_regressions.csv"
+)
+OUTPUT_RUNNER_RESOURCES_CSV_FILE = (
+    pathlib.Path(os.path.dirname(__file__)) / "benchmark_runner_resources.csv"
+)
+OUTPUT_TREND_CSV_FILE = pathlib.Path(os.path.dirname(__file__)) / "benchmark_trend.csv"
+INGESTED_WORKFLOWS_MANIFEST_FILE = (
+    pathlib.Path(os.path.dirname(__file__)) / "benchmark_data_manifest.json"
+)
+
 
+def format_seconds(seconds: float | None) -> str:
+    return "" if seconds is None else f"{seconds:.1f}"
 
-def init_csv_file() -> None:
-    with open(OUTPUT_CSV_FILE, "w") as f:
+
+def write_statistics_csv(
+    statistics: list[benchmark_statistics.ConfigurationStatistics],
+) -> None:
+    with open(OUTPUT_STATISTICS_CSV_FILE, "w") as f:
         csv_writer = csv.writer(f, delimiter=";")
         csv_writer.writerow(
             [
@@ -28,18 +82,382 @@ def init_csv_file() -> None:
                 "Runner cores",
                 "Repository tested",
                 "Step",
-                "Time spent (sec)",
                 "Additional infos",
+                "Samples",
+                "Outliers rejected",
+                "Mean (sec)",
+                "Standard deviation (sec)",
+                f"Mean {benchmark_statistics.CONFIDENCE_LEVEL:.0%} CI low (sec)",
+                f"Mean {benchmark_statistics.CONFIDENCE_LEVEL:.0%} CI high (sec)",
+            ],
+        )
+        csv_writer.writerows(
+            [
+                *s.configuration,
+                s.samples,
+                s.outliers,
+                f"{s.mean:.1f}",
+                f"{s.stddev:.1f}",
+                format_seconds(s.ci_low),
+                format_seconds(s.ci_high),
+            ]
+            for s in statistics
+        )
+
+
+def write_comparisons_csv(
+    comparisons: list[benchmark_statistics.Comparison],
+) -> None:
+    with open(OUTPUT_COMPARISONS_CSV_FILE, "w") as f:
+        csv_writer = csv.writer(f, delimiter=";")
+        csv_writer.writerow(
+            [
+                "Repository tested",
+                "Step",
+                "Runner A",
+                "Runner B",
+                "Mean difference A - B (sec)",
+                f"Difference {benchmark_statistics.CONFIDENCE_LEVEL:.0%} CI low (sec)",
+                f"Difference {benchmark_statistics.CONFIDENCE_LEVEL:.0%} CI high (sec)",
+                "Verdict",
+            ],
+        )
+        csv_writer.writerows(
+            [
+                c.first.tested_repository,
+                c.first.step_name,
+                str(c.first),
+                str(c.second),
+                f"{c.mean_difference:.1f}",
+                format_seconds(c.ci_low),
+                format_seconds(c.ci_high),
+                c.verdict,
+            ]
+            for c in comparisons
+        )
+
+
+def write_costs_csv(builds_costs: list[pricing.BuildCost]) -> None:
+    with open(OUTPUT_COSTS_CSV_FILE, "w") as f:
+        csv_writer = csv.writer(f, delimiter=";")
+        csv_writer.writerow(
+            [
+                "CI Provider",
+                "Runner OS",
+                "Runner type",
+                "Runner cores",
+                "Repository tested",
+                "Additional infos",
+                "Runner name",
+                "Cost per minute (usd)",
+                "Builds",
+                "Mean build time (sec)",
+                "Billed minutes per build",
+                "GitHub included minutes used per build",
+                "Cost per build (usd)",
+                "Cost per 1000 builds (usd)",
+            ],
+        )
+        csv_writer.writerows(
+            [
+                *c.configuration,
+                c.price.runner_name,
+                c.price.cost_per_minute,
+                c.builds,
+                f"{c.mean_time_spent_in_secs:.1f}",
+                f"{c.billed_minutes_per_build:.2f}",
+                ""
+                if c.included_minutes_per_build is None
+                else f"{c.included_minutes_per_build:.2f}",
+                f"{c.cost_per_build:.4f}",
+                f"{c.cost_per_1000_builds:.2f}",
+            ]
+            for c in builds_costs
+        )
+
+
+def write_latencies_csv(latencies: list[latency.RunnerLatency]) -> None:
+    with open(OUTPUT_LATENCIES_CSV_FILE, "w") as f:
+        csv_writer = csv.writer(f, delimiter=";")
+        csv_writer.writerow(
+            [
+                "CI Provider",
+                "Runner type",
+                "Step",
+                "Samples",
+                "p50 (sec)",
+                "p95 (sec)",
+            ],
+        )
+        csv_writer.writerows(
+            [
+                lat.ci_provider,
+                lat.runner_type,
+                lat.step_name,
+                lat.samples,
+                f"{lat.p50:.1f}",
+                f"{lat.p95:.1f}",
+            ]
+            for lat in latencies
+        )
+
+
+def write_workflows_csv(
+    analyses: list[workflow_graph.WorkflowGraphAnalysis],
+) -> None:
+    with open(OUTPUT_WORKFLOWS_CSV_FILE, "w") as f:
+        csv_writer = csv.writer(f, delimiter=";")
+        csv_writer.writerow(
+            [
+                "CI Provider",
+                "Workflow",
+                "Workflow id",
+                "Jobs",
+                "Wall-clock time (sec)",
+                "Critical path time (sec)",
+                "Critical path",
+                "Jobs time (sec)",
+                "Parallelism",
+            ],
+        )
+        csv_writer.writerows(
+            [
+                a.ci_provider,
+                a.workflow_name,
+                a.workflow_id,
+                a.jobs,
+                f"{a.wall_clock_secs:.1f}",
+                f"{a.critical_path_secs:.1f}",
+                " -> ".join(a.critical_path),
+                f"{a.jobs_secs:.1f}",
+                f"{a.parallelism:.2f}",
+            ]
+            for a in analyses
+        )
+
+
+def write_regressions_csv(checks: list[regressions.RegressionCheck]) -> None:
+    with open(OUTPUT_REGRESSIONS_CSV_FILE, "w") as f:
+        csv_writer = csv.writer(f, delimiter=";")
+        csv_writer.writerow(
+            [
+                "Repository tested",
+                "Step",
+                "Runner",
+                "Baseline runs",
+                "Baseline median (sec)",
+                "Runs",
+                "Median (sec)",
+                "Change",
+                "Modified z-score",
+                "Verdict",
+            ],
+        )
+        csv_writer.writerows(
+            [
+                c.configuration.tested_repository,
+                c.configuration.step_name,
+                str(c.configuration),
+                c.baseline_runs,
+                f"{c.baseline_median:.1f}",
+                c.runs,
+                f"{c.median:.1f}",
+                f"{c.change:+.1%}",
+                f"{c.z_score:.1f}",
+                c.verdict,
+            ]
+            for c in checks
+        )
+
+
+def write_runner_resources_csv(
+    summaries: list[tuple[str, resource_sampler.StepResourcesSummary]],
+) -> None:
+    with open(OUTPUT_RUNNER_RESOURCES_CSV_FILE, "w") as f:
+        csv_writer = csv.writer(f, delimiter=";")
+        csv_writer.writerow(
+            [
+                "Workflow id",
+                "Job",
+                "Step",
+                "Samples",
+                "CPU mean (%)",
+                "CPU max (%)",
+                "Memory max (%)",
+                "Load per core mean",
+                "Disk read mean (MB/sec)",
+                "Disk write mean (MB/sec)",
             ],
         )
+        csv_writer.writerows(
+            [
+                workflow_id,
+                s.job_name,
+                s.step_name,
+                s.samples,
+                f"{s.cpu_mean_percent:.1f}",
+                f"{s.cpu_max_percent:.1f}",
+                f"{s.memory_max_percent:.1f}",
+                f"{s.load_per_core_mean:.2f}",
+                f"{s.disk_read_mean_bytes_per_sec / 1e6:.1f}",
+                f"{s.disk_write_mean_bytes_per_sec / 1e6:.1f}",
+            ]
+            for workflow_id, s in summaries
+        )
+
+
+def write_runner_resources(
+    report: report_writer.ReportWriter,
+    response_cache: cache.ResponseCache | None,
+    steps_grouping: steps.StepsGrouping | None,
+) -> None:
+    """
+    Writes the summary of the runner resources sampled during each step of
+    the GitHub jobs of `report`, the only ones running the sampler.
+    """
+    repo_owner, repo_name = utils.get_required_env_variable(
+        "GITHUB_REPOSITORY",
+    ).split("/")
+
+    summaries: list[tuple[str, resource_sampler.StepResourcesSummary]] = []
+    with gh_client.GitHubClient(
+        utils.get_required_env_variable("GH_TOKEN"),
+        response_cache=response_cache,
+        steps_grouping=steps_grouping,
+    ) as client:
+        for workflow_data in report.read_workflows_data():
+            if workflow_data.ci_provider != "GitHub":
+                continue
+
+            summaries.extend(
+                (workflow_data.workflow_id, summary)
+                for summary in client.get_runner_resources_summaries(
+                    workflow_data.workflow_id,
+                    repo_owner,
+                    repo_name,
+                )
+            )
+
+    write_runner_resources_csv(summaries)
+    LOG.info("Runner resources of %d steps written", len(summaries))
+
+
+def get_trend_csv_data(
+    trends: list[types.JobDurationTrend],
+    reporting_window: str,
+) -> list[types.CsvDataLine]:
+    """
+    Returns the median and the 95th percentile of the duration of each trend
+    as lines of the benchmark report.
+    """
+    return [
+        types.CsvDataLine(
+            ci_provider=trend.ci_provider,
+            runner_os=trend.runner_os,
+            runner_type=trend.runner_type,
+            runner_cores=trend.runner_cores,
+            tested_repository=trend.tested_repository,
+            step_name=step_name,
+            time_spent_in_secs=round(time_spent_in_secs),
+            additional_infos=f"{trend.runs} runs over the {reporting_window}",
+        )
+        for trend in trends
+        for step_name, time_spent_in_secs in (
+            (constants.CSV_TREND_MEDIAN_STEP_NAME, trend.median_secs),
+            (constants.CSV_TREND_P95_STEP_NAME, trend.p95_secs),
+        )
+    ]
 
 
-def write_csv_data(csv_data: list[types.CsvDataLine]) -> None:
-    with open(OUTPUT_CSV_FILE, "a") as f:
+def write_trend_csv(csv_data: list[types.CsvDataLine]) -> None:
+    with open(OUTPUT_TREND_CSV_FILE, "w") as f:
         csv_writer = csv.writer(f, delimiter=";")
+        csv_writer.writerow(report_writer.CSV_HEADER)
         csv_writer.writerows(csv_data)
 
 
+def add_report_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the arguments of the data retrieval and analyses shared by every
+    command creating a report.
+    """
+    parser.add_argument(
+        "--no-cache",
+        dest="use_cache",
+        action="store_false",
+        help=f"Do not read nor write the on-disk cache of finished runs and jobs ({cache.get_default_cache_directory()}).",
+    )
+    parser.add_argument(
+        "--statistics",
+        action="store_true",
+        help=f"""\
+Also compute, for each runner configuration and step, the mean, standard deviation and bootstrap
+confidence interval of the time spent over all the runs, after rejecting the outliers,
+into {OUTPUT_STATISTICS_CSV_FILE.name}, and whether each runner is significantly faster than
+the others into {OUTPUT_COMPARISONS_CSV_FILE.name}.
+""",
+    )
+    parser.add_argument(
+        "--detailed-steps",
+        action="store_true",
+        help=f"""\
+Keep every step of the benchmarked application build, with a millisecond precision, instead of
+collapsing them into a single '{constants.CSV_BENCHMARKED_APPLICATION_STEP_NAME}' step. The steps are grouped with the
+regexes of the `{steps.STEPS_GROUPS_ENV_VARIABLE}` variable of each benchmark workflow.
+""",
+    )
+    parser.add_argument(
+        "--prices",
+        type=pathlib.Path,
+        default=pricing.RUNNER_PRICES_CSV_FILE,
+        metavar="FILE",
+        help=f"""\
+Per-minute prices of the runners used to compute the cost per build and per 1000 builds of
+each runner configuration into {OUTPUT_COSTS_CSV_FILE.name}.
+Defaults to {pricing.RUNNER_PRICES_CSV_FILE.name} at the root of this repository.
+""",
+    )
+    parser.add_argument(
+        "--store",
+        type=pathlib.Path,
+        default=None,
+        metavar="DIRECTORY",
+        help="Also append the report data, along with the date, commit and id of each workflow run, to the historical benchmark store in DIRECTORY.",
+    )
+    parser.add_argument(
+        "--check-regressions",
+        action="store_true",
+        help=f"""\
+Compare the time spent by the new runs of each runner configuration and step to the median of
+their latest runs in the `--store`, into {OUTPUT_REGRESSIONS_CSV_FILE.name}, and exit with
+an error if any regressed.
+""",
+    )
+    parser.add_argument(
+        "--baseline-runs",
+        type=int,
+        default=constants.REGRESSION_BASELINE_RUNS,
+        help="Number of latest runs of each configuration in the store used as the baseline of `--check-regressions`.",
+    )
+    parser.add_argument(
+        "--regression-threshold",
+        type=float,
+        default=constants.REGRESSION_THRESHOLD,
+        metavar="RATIO",
+        help="Relative difference with the baseline above which a significant change is a regression or an improvement.",
+    )
+    parser.add_argument(
+        "--runner-resources",
+        action="store_true",
+        help=f"""\
+Also summarise the CPU, memory, disk I/O and load sampled on the runners during each step of
+the benchmark jobs running `sample-runner-resources`, from the artifacts of their workflow
+runs, into {OUTPUT_RUNNER_RESOURCES_CSV_FILE.name}.
+""",
+    )
+    instrumentation.add_arguments(parser)
+
+
 def get_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Create benchmark report",
@@ -65,59 +483,412 @@ If you specify every workflows ids from the optional arguments, then you can pic
             default=None,
         )
 
+    parser.add_argument(
+        "--mode",
+        choices=["runs", "trend"],
+        default="runs",
+        help=f"""\
+'runs' will create the report from the details of every job of the benchmark workflows runs.
+'trend' will create {OUTPUT_TREND_CSV_FILE.name} from the durations of the jobs of each runner
+configuration over the `--trend-window`, as aggregated by each ci provider, which only takes a
+few requests whatever the number of runs. GitHub doesn't aggregate the durations of the jobs,
+only CircleCI is in this report. The workflows ids are not used in this mode.
+""",
+    )
+    parser.add_argument(
+        "--trend-window",
+        choices=list(constants.TREND_REPORTING_WINDOWS_DAYS),
+        default=constants.DEFAULT_TREND_REPORTING_WINDOW,
+        help="Reporting window of the 'trend' mode.",
+    )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Fetch the workflows and jobs data of every ci provider concurrently.",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=constants.DEFAULT_MAX_CONCURRENCY,
+        help="Maximum number of requests in flight at the same time per ci provider, only used with `--async`.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=f"""\
+Only fetch the benchmark workflows runs that are not in the report yet, and append them to it
+instead of recreating it. The runs already ingested are tracked in {INGESTED_WORKFLOWS_MANIFEST_FILE.name}.
+Can only be used with the 'api' source.
+""",
+    )
+    parser.add_argument(
+        "--repetitions",
+        type=int,
+        default=1,
+        help="Number of latest runs of each benchmark workflow to use with the 'api' source.",
+    )
+    add_report_arguments(parser)
+
     return parser
 
 
+def get_workflows_ids_from_args_or_env(
+    args: argparse.Namespace,
+    ci_to_benchmark: types.CiToBenchmark,
+) -> list[str] | None:
+    """
+    Returns the workflows ids specified in the arguments or in the environment,
+    or `None` if they need to be retrieved from the api.
+    """
+    ids_from_parser: str | None = getattr(
+        args,
+        ci_to_benchmark["workflow_ids_env_variable_prefix"].lower(),
+    )
+    if ids_from_parser is not None:
+        return ids_from_parser.split(",")
+
+    if args.source == "env":
+        workflows_ids_str: str = utils.get_required_env_variable(
+            utils.get_benchmark_workflow_run_ids_env_variable_name(
+                ci_to_benchmark["workflow_ids_env_variable_prefix"],
+            ),
+        )
+        return workflows_ids_str.split(",")
+
+    if args.source == "api":
+        return None
+
+    raise RuntimeError("How did we get here???")
+
+
+def get_report_parameters(
+    command: str,
+    repo_owner: str,
+    repo_name: str,
+    workflows_ids_per_ci: list[tuple[types.CiToBenchmark, list[str]]],
+    **flags: typing.Any,
+) -> dict[str, typing.Any]:
+    """
+    Returns the parameters a report is written with, an interrupted report
+    is only resumed by an invocation with the same ones.
+    """
+    return {
+        "command": command,
+        "repository": f"{repo_owner}/{repo_name}",
+        "workflows_ids": {
+            ci_to_benchmark["workflow_ids_env_variable_prefix"]: workflows_ids
+            for ci_to_benchmark, workflows_ids in workflows_ids_per_ci
+        },
+        **flags,
+    }
+
+
+async def write_workflows_data_async(
+    report: report_writer.ReportWriter,
+    workflows_ids_per_ci: list[tuple[types.CiToBenchmark, list[str]]],
+    repo_owner: str,
+    repo_name: str,
+    max_concurrency: int,
+    response_cache: cache.ResponseCache | None,
+    steps_grouping: steps.StepsGrouping | None,
+) -> None:
+    async def write_ci_workflows_data(
+        ci_to_benchmark: types.CiToBenchmark,
+        workflows_ids: list[str],
+    ) -> None:
+        async with ci_to_benchmark["async_client"](
+            utils.get_required_env_variable(ci_to_benchmark["token_env_variable"]),
+            max_concurrency=max_concurrency,
+            response_cache=response_cache,
+            steps_grouping=steps_grouping,
+        ) as client:
+            async for workflow_data in client.generate_workflows_data_from_workflows_ids(
+                workflows_ids,
+                repo_owner,
+                repo_name,
+            ):
+                report.write(workflow_data)
+
+    await asyncio.gather(
+        *(
+            write_ci_workflows_data(ci_to_benchmark, workflows_ids)
+            for ci_to_benchmark, workflows_ids in workflows_ids_per_ci
+        ),
+    )
+
+
+def write_report_analyses(
+    args: argparse.Namespace,
+    report: report_writer.ReportWriter,
+) -> int:
+    """
+    Writes the analyses of the workflows runs of `report`, and appends them to
+    the store. Returns 1 if they regressed, 0 otherwise.
+    """
+    # Read once for all the analyses of the rows
+    table = report.read_table()
+    write_latencies_csv(latency.get_runners_latencies(table))
+
+    workflows_analyses = workflow_graph.get_workflows_graph_analyses(
+        report.read_workflows_data(),
+    )
+    write_workflows_csv(workflows_analyses)
+    for ci_provider, parallelism in workflow_graph.get_providers_parallelism(
+        workflows_analyses,
+    ).items():
+        LOG.info("%s ran %.2f jobs in parallel on average", ci_provider, parallelism)
+
+    if args.prices.exists():
+        write_costs_csv(
+            pricing.get_builds_costs(
+                report.read_workflows_data(),
+                pricing.RunnerPricesIndex.from_csv_file(args.prices),
+            ),
+        )
+    else:
+        LOG.warning("Prices file %s not found, skipping the costs", args.prices)
+
+    if args.statistics:
+        # Fixed seed so the same data always gives the same report
+        rng = np.random.default_rng(0)
+        samples_per_configuration = benchmark_statistics.get_configurations_samples(
+            table,
+        )
+        write_statistics_csv(
+            benchmark_statistics.get_statistics(samples_per_configuration, rng),
+        )
+
+        comparisons = benchmark_statistics.get_comparisons(
+            samples_per_configuration,
+            rng,
+        )
+        write_comparisons_csv(comparisons)
+        for comparison in comparisons:
+            if comparison.significant:
+                LOG.info(
+                    "%s: %s (%.1f sec difference)",
+                    comparison.first.tested_repository,
+                    comparison.verdict,
+                    abs(comparison.mean_difference),
+                )
+
+    if args.runner_resources:
+        write_runner_resources(
+            report,
+            cache.ResponseCache() if args.use_cache else None,
+            steps.StepsGrouping(utils.get_benchmark_steps_groups())
+            if args.detailed_steps
+            else None,
+        )
+
+    ret = 0
+    if args.store is not None:
+        benchmark_store = store.BenchmarkStore(args.store)
+        if args.check_regressions:
+            checks = regressions.get_regressions_checks(
+                regressions.get_runs_times_per_configuration(
+                    report.read_workflows_data(),
+                ),
+                regressions.get_baselines(
+                    benchmark_store,
+                    report.workflows_ids,
+                    args.baseline_runs,
+                ),
+                args.regression_threshold,
+            )
+            write_regressions_csv(checks)
+            for check in checks:
+                if check.verdict != "unchanged":
+                    LOG.info(
+                        "%s - %s: %s (%+.1f%%, %.1f sec vs %.1f sec)",
+                        check.configuration,
+                        check.configuration.step_name,
+                        check.verdict,
+                        check.change * 100,
+                        check.median,
+                        check.baseline_median,
+                    )
+            if any(c.verdict == "regression" for c in checks):
+                LOG.error("Regressions found, see %s", OUTPUT_REGRESSIONS_CSV_FILE)
+                ret = 1
+
+        nb_records = benchmark_store.append(
+            store.get_benchmark_records(report.read_workflows_data()),
+        )
+        LOG.info("%d records appended to the benchmark store", nb_records)
+
+    return ret
+
+
+def create_trend_report(
+    repo_owner: str,
+    repo_name: str,
+    reporting_window: str,
+    response_cache: cache.ResponseCache | None,
+) -> None:
+    csv_data: list[types.CsvDataLine] = []
+    for ci_to_benchmark in utils.CIS_TO_BENCHMARK:
+        with ci_to_benchmark["client"](
+            utils.get_required_env_variable(ci_to_benchmark["token_env_variable"]),
+            response_cache=response_cache,
+        ) as client:
+            trends = client.get_jobs_durations_trends(
+                repo_owner,
+                repo_name,
+                reporting_window,
+            )
+
+        if trends is None:
+            LOG.warning(
+                "%s doesn't aggregate the durations of the jobs, it is not in the trend report",
+                ci_to_benchmark["workflow_ids_env_variable_prefix"],
+            )
+            continue
+
+        LOG.info(
+            "%d runner configurations trends for %s",
+            len(trends),
+            ci_to_benchmark["workflow_ids_env_variable_prefix"],
+            reporting_window=reporting_window,
+        )
+        csv_data.extend(get_trend_csv_data(trends, reporting_window))
+
+    write_trend_csv(csv_data)
+
+
 def main(argv: list[str] | None = None) -> int:
     parser = get_parser()
 
     args = parser.parse_args(argv)
+    if args.incremental and args.source != "api":
+        parser.error("--incremental can only be used with the 'api' source")
+    if args.check_regressions and args.store is None:
+        parser.error("--check-regressions requires a --store")
+    if args.mode == "trend" and (args.incremental or args.store is not None):
+        parser.error("--incremental and --store can't be used with the 'trend' mode")
 
     github_repository = utils.get_required_env_variable("GITHUB_REPOSITORY")
     repo_owner, repo_name = github_repository.split("/")
 
-    csv_data: list[types.CsvDataLine] = []
+    response_cache = cache.ResponseCache() if args.use_cache else None
+    if args.mode == "trend":
+        create_trend_report(repo_owner, repo_name, args.trend_window, response_cache)
+        rate_limit.log_budgets()
+        transport.log_connection_timings()
+        if args.instrumentation is not None:
+            instrumentation.write_export(
+                args.instrumentation,
+                args.instrumentation_format,
+            )
+        return 0
+
+    steps_grouping = (
+        steps.StepsGrouping(utils.get_benchmark_steps_groups())
+        if args.detailed_steps
+        else None
+    )
+
+    ingested_manifest: manifest.IngestedWorkflowsManifest | None = None
+    if args.incremental:
+        if OUTPUT_CSV_FILE.exists():
+            ingested_manifest = manifest.IngestedWorkflowsManifest.load(
+                INGESTED_WORKFLOWS_MANIFEST_FILE,
+            )
+        else:
+            ingested_manifest = manifest.IngestedWorkflowsManifest()
+
+    clients: list[base_clients.BaseClient] = []
+    workflows_ids_per_ci: list[tuple[types.CiToBenchmark, list[str]]] = []
+    workflows_runs_per_ci: dict[str, list[types.BenchmarkWorkflowRun]] = {}
 
     for ci_to_benchmark in utils.CIS_TO_BENCHMARK:
+        ci_prefix = ci_to_benchmark["workflow_ids_env_variable_prefix"]
         token = utils.get_required_env_variable(ci_to_benchmark["token_env_variable"])
-        client = ci_to_benchmark["client"](token)
-
-        ids_from_parser = getattr(
-            args,
-            ci_to_benchmark["workflow_ids_env_variable_prefix"].lower(),
-        )
-        if ids_from_parser is not None:
-            workflows_ids = ids_from_parser.split(",")
-        elif args.source == "env":
-            workflows_ids_str: str = utils.get_required_env_variable(
-                utils.get_benchmark_workflow_run_ids_env_variable_name(
-                    ci_to_benchmark["workflow_ids_env_variable_prefix"],
-                ),
+        client = ci_to_benchmark["client"](
+            token,
+            response_cache=response_cache,
+            steps_grouping=steps_grouping,
+        )
+
+        workflows_ids = get_workflows_ids_from_args_or_env(args, ci_to_benchmark)
+        if workflows_ids is None and ingested_manifest is not None:
+            workflows_runs = client.get_benchmark_workflows_runs(
+                repo_owner,
+                repo_name,
+                ingested_manifest.get_high_water_mark(ci_prefix),
+            )
+            workflows_runs_per_ci[ci_prefix] = workflows_runs
+            workflows_ids = ingested_manifest.get_workflows_ids_to_ingest(
+                ci_prefix,
+                workflows_runs,
             )
-            workflows_ids = workflows_ids_str.split(",")
-        elif args.source == "api":
+        elif workflows_ids is None:
             workflows_ids = client.get_latest_benchmark_workflows_ids(
                 repo_owner,
                 repo_name,
+                args.repetitions,
             )
-        else:
-            raise RuntimeError("How did we get here???")
 
-        LOG.info(
-            "Workflows ids for %s = %s",
-            ci_to_benchmark["workflow_ids_env_variable_prefix"],
-            workflows_ids,
-        )
+        LOG.info("Workflows ids for %s = %s", ci_prefix, workflows_ids)
 
-        csv_data.extend(
-            client.generate_csv_data_from_workflows_ids(
-                workflows_ids,
-                repo_owner,
-                repo_name,
-            ),
-        )
+        clients.append(client)
+        workflows_ids_per_ci.append((ci_to_benchmark, workflows_ids))
+
+    with report_writer.ReportWriter(
+        OUTPUT_CSV_FILE,
+        append=ingested_manifest is not None,
+        parameters=get_report_parameters(
+            "create-benchmark-report",
+            repo_owner,
+            repo_name,
+            workflows_ids_per_ci,
+            source=args.source,
+            incremental=ingested_manifest is not None,
+            detailed_steps=steps_grouping is not None,
+        ),
+    ) as report:
+        # Skip the workflows runs already written before an interruption
+        workflows_ids_per_ci = [
+            (ci_to_benchmark, [i for i in ids if i not in report.workflows_ids])
+            for ci_to_benchmark, ids in workflows_ids_per_ci
+        ]
+
+        if args.use_async:
+            asyncio.run(
+                write_workflows_data_async(
+                    report,
+                    workflows_ids_per_ci,
+                    repo_owner,
+                    repo_name,
+                    args.max_concurrency,
+                    response_cache,
+                    steps_grouping,
+                ),
+            )
+        else:
+            for client, (_ci_to_benchmark, workflows_ids) in zip(
+                clients,
+                workflows_ids_per_ci,
+                strict=True,
+            ):
+                for workflow_data in client.generate_workflows_data_from_workflows_ids(
+                    workflows_ids,
+                    repo_owner,
+                    repo_name,
+                ):
+                    report.write(workflow_data)
+
+        ret = write_report_analyses(args, report)
+        report.commit()
 
-    init_csv_file()
-    write_csv_data(csv_data)
+    if ingested_manifest is not None:
+        for ci_prefix, workflows_runs in workflows_runs_per_ci.items():
+            ingested_manifest.update(ci_prefix, workflows_runs)
+        ingested_manifest.save(INGESTED_WORKFLOWS_MANIFEST_FILE)
 
-    return 0
+    rate_limit.log_budgets()
+    transport.log_connection_timings()
+    if args.instrumentation is not None:
+        instrumentation.write_export(args.instrumentation, args.instrumentation_format)
+    return ret
@@ -1,42 +1,107 @@
 #!/usr/bin/env python3
 
+import argparse
+import asyncio
+import contextlib
 import logging
 import os
 import sys
 
 import daiquiri
 
+from ci_benchmark_tooling import instrumentation
+from ci_benchmark_tooling import rate_limit
+from ci_benchmark_tooling import transport
 from ci_benchmark_tooling import utils
 
 
 daiquiri.setup(level=logging.INFO)
 
 
-def main(_argv: list[str] | None = None) -> int:
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Dispatch the benchmark workflows and wait for them to end",
+    )
+    parser.add_argument(
+        "--repetitions",
+        type=int,
+        default=1,
+        help="Number of times each benchmark workflow is dispatched, to be able to compute statistics over the runs.",
+    )
+    instrumentation.add_arguments(parser)
+
+    return parser
+
+
+async def dispatch_and_wait_for_workflows_async(
+    owner: str,
+    repository: str,
+    workflow_dispatch_ref: str,
+    repetitions: int,
+) -> int:
+    """
+    Dispatch the benchmark workflows of every ci provider at the same time,
+    then wait for all of them to end, from a single event loop.
+    """
+    async with contextlib.AsyncExitStack() as stack:
+        clients = [
+            await stack.enter_async_context(
+                ci_to_benchmark["async_client"](
+                    utils.get_required_env_variable(
+                        ci_to_benchmark["token_env_variable"],
+                    ),
+                    # The dispatch and polling requests go before the report ones
+                    # sharing the same rate limits.
+                    request_priority="high",
+                ),
+            )
+            for ci_to_benchmark in utils.CIS_TO_BENCHMARK
+        ]
+
+        ret_values: list[int] = await asyncio.gather(
+            *(
+                client.send_dispatch_events(
+                    owner,
+                    repository,
+                    workflow_dispatch_ref,
+                    repetitions,
+                )
+                for client in clients
+            ),
+        )
+        for ret_value in ret_values:
+            if ret_value != 0:
+                return ret_value
+
+        await asyncio.gather(
+            *(client.wait_for_workflows_to_end() for client in clients),
+        )
+
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = get_parser().parse_args(argv)
+
     github_repository = utils.get_required_env_variable("GITHUB_REPOSITORY")
     owner, repository = github_repository.split("/")
 
     workflow_dispatch_ref = os.getenv("WORKFLOW_DISPATCH_REF", "main")
 
-    clients = []
-    for ci_to_benchmark in utils.CIS_TO_BENCHMARK:
-        token = utils.get_required_env_variable(ci_to_benchmark["token_env_variable"])
-        client = ci_to_benchmark["client"](token)
-
-        ret_value = client.send_dispatch_events(
+    ret_value = asyncio.run(
+        dispatch_and_wait_for_workflows_async(
             owner,
             repository,
             workflow_dispatch_ref,
-        )
-        if ret_value != 0:
-            return ret_value
-
-        clients.append(client)
+            args.repetitions,
+        ),
+    )
 
-    for client in clients:
-        client.wait_for_workflows_to_end()
-
-    return 0
+    rate_limit.log_budgets()
+    transport.log_connection_timings()
+    if args.instrumentation is not None:
+        instrumentation.write_export(args.instrumentation, args.instrumentation_format)
+    return ret_value
 
 
 if __name__ == "__main__":
@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import collections
+import functools
+import gzip
+import json
+import os
+import pathlib
+import threading
+import time
+import typing
+
+import daiquiri
+import httpx
+
+from ci_benchmark_tooling import transport
+
+
+if typing.TYPE_CHECKING:
+    from collections import abc
+
+
+LOG = daiquiri.getLogger(__name__)
+
+# Record the responses of the apis to the fixtures file of this variable
+RECORD_FIXTURES_ENV_VARIABLE = "CI_BENCHMARK_TOOLING_RECORD_FIXTURES"
+# Serve the responses of the fixtures file of this variable instead of
+# requesting the apis
+REPLAY_FIXTURES_ENV_VARIABLE = "CI_BENCHMARK_TOOLING_REPLAY_FIXTURES"
+# Seconds each replayed response is delayed by
+REPLAY_LATENCY_ENV_VARIABLE = "CI_BENCHMARK_TOOLING_REPLAY_LATENCY"
+
+# Only the headers the clients rely on are recorded, the others, like the
+# rate limit ones, would make the replay depend on when it was recorded
+RECORDED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Link")
+
+
+class Interaction(typing.TypedDict):
+    method: str
+    url: str
+    status_code: int
+    headers: dict[str, str]
+    # Base64 encoded body of the response
+    content: str
+
+
+class MissingFixtureError(Exception):
+    pass
+
+
+def get_request_key(method: str, url: httpx.URL) -> str:
+    # Sort the params so the same request always ends up with the same key
+    sorted_url = url.copy_with(params=sorted(url.params.multi_items()))
+    return f"{method} {sorted_url}"
+
+
+def get_interaction(
+    request: httpx.Request,
+    status_code: int,
+    headers: httpx.Headers,
+    content: bytes,
+) -> Interaction:
+    return {
+        "method": request.method,
+        "url": str(request.url),
+        "status_code": status_code,
+        "headers": {h: headers[h] for h in RECORDED_HEADERS if h in headers},
+        "content": base64.b64encode(content).decode(),
+    }
+
+
+def write_interactions(
+    path: pathlib.Path,
+    interactions: abc.Iterable[Interaction],
+    append: bool = False,
+) -> None:
+    """
+    Writes `interactions` as gzip compressed JSON lines. Each write appends a
+    new gzip member, so a fixtures file stays readable even if the recording
+    is interrupted.
+    """
+    with gzip.open(path, "at" if append else "wt") as f:
+        for interaction in interactions:
+            f.write(json.dumps(interaction) + "\n")
+
+
+def read_interactions(path: pathlib.Path) -> abc.Iterator[Interaction]:
+    with gzip.open(path, "rt") as f:
+        for line in f:
+            yield typing.cast(Interaction, json.loads(line))
+
+
+class FixturesRecorder:
+    """
+    Appends the interactions of every recording transport of the process to
+    the same fixtures file.
+    """
+
+    def __init__(self, path: pathlib.Path) -> None:
+        self.path = path
+        self.lock = threading.Lock()
+
+    def record(
+        self,
+        request: httpx.Request,
+        response: httpx.Response,
+    ) -> httpx.Response:
+        """
+        Records `response`, which must have been read, and returns a copy of
+        it with a decoded body, that can be read again by the client.
+        """
+        interaction = get_interaction(
+            request,
+            response.status_code,
+            response.headers,
+            response.content,
+        )
+        with self.lock:
+            write_interactions(self.path, [interaction], append=True)
+
+        headers = [
+            (name, value)
+            for name, value in response.headers.multi_items()
+            if name.lower()
+            not in ("content-encoding", "content-length", "transfer-encoding")
+        ]
+        return httpx.Response(
+            response.status_code,
+            headers=headers,
+            content=response.content,
+            extensions=response.extensions,
+            request=request,
+        )
+
+
+class RecordingTransport(httpx.BaseTransport):
+    def __init__(
+        self,
+        wrapped_transport: httpx.BaseTransport,
+        recorder: FixturesRecorder,
+    ) -> None:
+        self.wrapped_transport = wrapped_transport
+        self.recorder = recorder
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        response = self.wrapped_transport.handle_request(request)
+        try:
+            response.read()
+        finally:
+            response.close()
+        return self.recorder.record(request, response)
+
+    def close(self) -> None:
+        self.wrapped_transport.close()
+
+
+class AsyncRecordingTransport(httpx.AsyncBaseTransport):
+    def __init__(
+        self,
+        wrapped_transport: httpx.AsyncBaseTransport,
+        recorder: FixturesRecorder,
+    ) -> None:
+        self.wrapped_transport = wrapped_transport
+        self.recorder = recorder
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self.wrapped_transport.handle_async_request(request)
+        try:
+            await response.aread()
+        finally:
+            await response.aclose()
+        return self.recorder.record(request, response)
+
+    async def aclose(self) -> None:
+        await self.wrapped_transport.aclose()
+
+
+class ReplayTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """
+    Serves the responses of a fixtures file, delayed by `latency_secs`.
+
+    The responses recorded for the same request are served in the order they
+    were recorded, the last one being served again once all were, so that a
+    replay is deterministic. Requests without any recorded response raise
+    `MissingFixtureError`.
+    """
+
+    def __init__(
+        self,
+        interactions: abc.Iterable[Interaction],
+        latency_secs: float = 0.0,
+    ) -> None:
+        self.latency_secs = latency_secs
+        self.lock = threading.Lock()
+        self.interactions: dict[str, list[Interaction]] = collections.defaultdict(
+            list,
+        )
+        for interaction in interactions:
+            key = get_request_key(interaction["method"], httpx.URL(interaction["url"]))
+            self.interactions[key].append(interaction)
+        self.served: collections.Counter[str] = collections.Counter()
+
+    def get_response(self, request: httpx.Request) -> httpx.Response:
+        key = get_request_key(request.method, request.url)
+        with self.lock:
+            interactions = self.interactions.get(key)
+            if not interactions:
+                raise MissingFixtureError(f"No fixture for `{key}`")
+
+            interaction = interactions[min(self.served[key], len(interactions) - 1)]
+            self.served[key] += 1
+
+        return httpx.Response(
+            interaction["status_code"],
+            headers=interaction["headers"],
+            content=base64.b64decode(interaction["content"]),
+            request=request,
+        )
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if self.latency_secs > 0:
+            time.sleep(self.latency_secs)
+        return self.get_response(request)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.latency_secs > 0:
+            await asyncio.sleep(self.latency_secs)
+        return self.get_response(request)
+
+
+@functools.cache
+def get_recorder(path: pathlib.Path) -> FixturesRecorder:
+    LOG.info("Recording the responses of the apis to %s", path)
+    return FixturesRecorder(path)
+
+
+@functools.cache
+def get_replay_transport(path: pathlib.Path, latency_secs: float) -> ReplayTransport:
+    LOG.info(
+        "Replaying the responses of the apis from %s",
+        path,
+        latency_secs=latency_secs,
+    )
+    return ReplayTransport(read_interactions(path), latency_secs)
+
+
+def get_replay_transport_from_env() -> ReplayTransport | None:
+    replay_path = os.getenv(REPLAY_FIXTURES_ENV_VARIABLE)
+    if not replay_path:
+        return None
+
+    return get_replay_transport(
+        pathlib.Path(replay_path),
+        float(os.getenv(REPLAY_LATENCY_ENV_VARIABLE) or 0.0),
+    )
+
+
+def get_transport() -> httpx.BaseTransport:
+    """
+    Returns the transport of a new synchronous client: the shared one, unless
+    the responses are recorded or replayed according to the environment.
+    """
+    replay_transport = get_replay_transport_from_env()
+    if replay_transport is not None:
+        return replay_transport
+
+    record_path = os.getenv(RECORD_FIXTURES_ENV_VARIABLE)
+    if record_path:
+        return RecordingTransport(
+            transport.get_transport(),
+            get_recorder(pathlib.Path(record_path)),
+        )
+
+    return transport.get_transport()
+
+
+def get_async_transport() -> httpx.AsyncBaseTransport:
+    """
+    Asynchronous counterpart of `get_transport`.
+    """
+    replay_transport = get_replay_transport_from_env()
+    if replay_transport is not None:
+        return replay_transport
+
+    record_path = os.getenv(RECORD_FIXTURES_ENV_VARIABLE)
+    if record_path:
+        return AsyncRecordingTransport(
+            transport.get_async_transport(),
+            get_recorder(pathlib.Path(record_path)),
+        )
+
+    return transport.get_async_transport()
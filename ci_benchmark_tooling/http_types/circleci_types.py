@@ -41,7 +41,30 @@ class WorkflowsJob(typing.TypedDict):
 
 class WorkflowsJobs(typing.TypedDict):
     items: list[WorkflowsJob]
-    next_page_token: str
+    next_page_token: str | None
+
+
+PipelineStateT = typing.Literal[
+    "created",
+    "errored",
+    "setup-pending",
+    "setup",
+    "pending",
+]
+
+
+class Pipeline(typing.TypedDict):
+    id: UUIDString
+    project_slug: str
+    number: int
+    state: PipelineStateT
+    created_at: base.ISODateTimeType
+    updated_at: base.ISODateTimeType
+
+
+class Pipelines(typing.TypedDict):
+    items: list[Pipeline]
+    next_page_token: str | None
 
 
 WorkflowStatusT = typing.Literal[
@@ -69,7 +92,56 @@ class Workflow(typing.TypedDict):
     started_by: UUIDString
     pipeline_number: str  # string of integer, eg: "25"
     created_at: base.ISODateTimeType
-    stopped_at: base.ISODateTimeType
+    stopped_at: base.ISODateTimeType | None
+
+
+class Workflows(typing.TypedDict):
+    items: list[Workflow]
+    next_page_token: str | None
+
+
+# https://circleci.com/docs/api/v2/index.html#operation/getProjectWorkflowMetrics
+class InsightsDurationMetrics(typing.TypedDict):
+    # All the durations are in seconds
+    min: int
+    mean: int
+    median: int
+    p95: int
+    max: int
+    standard_deviation: float
+
+
+class InsightsWorkflowMetrics(typing.TypedDict):
+    total_runs: int
+    successful_runs: int
+    failed_runs: int
+    success_rate: float
+    duration_metrics: InsightsDurationMetrics
+
+
+class InsightsWorkflow(typing.TypedDict):
+    name: str
+    metrics: InsightsWorkflowMetrics
+    window_start: base.ISODateTimeType
+    window_end: base.ISODateTimeType
+
+
+class InsightsWorkflows(typing.TypedDict):
+    items: list[InsightsWorkflow]
+    next_page_token: str | None
+
+
+# https://circleci.com/docs/api/v2/index.html#operation/getProjectJobMetrics
+class InsightsJob(typing.TypedDict):
+    name: str
+    metrics: InsightsWorkflowMetrics
+    window_start: base.ISODateTimeType
+    window_end: base.ISODateTimeType
+
+
+class InsightsJobs(typing.TypedDict):
+    items: list[InsightsJob]
+    next_page_token: str | None
 
 
 # ###### All the dict belows are from API V1.1:
@@ -127,6 +199,15 @@ JobDetailsStatusT = typing.Literal[
     "success",
 ]
 
+JobDetailsLifecycleT = typing.Literal[
+    "queued",
+    "scheduled",
+    "not_run",
+    "not_running",
+    "running",
+    "finished",
+]
+
 JobDetailsOutcomeT = typing.Literal[
     "canceled",
     "infrastructure_fail",
@@ -149,11 +230,16 @@ class JobDetails(typing.TypedDict):
     # There is a lot more infos in this dict, but we only type
     # what is interesting to us.
     build_time_millis: int
-    circle_yml: dict[str, typing.Any]
+    # Not kept once the details are trimmed by the client, which only keeps
+    # the `machine_image` of the job from it
+    circle_yml: typing.NotRequired[dict[str, typing.Any]]
+    machine_image: typing.NotRequired[str]
+    lifecycle: JobDetailsLifecycleT
     outcome: JobDetailsOutcomeT
     picard: JobPicard
     status: JobDetailsStatusT
     start_time: base.ISODateTimeType
     stop_time: base.ISODateTimeType
     steps: list[JobDetailsStep]
+    vcs_revision: str
     workflows: JobDetailsWorkflows
@@ -41,6 +41,15 @@ GitHubWorkflowTriggerEventType = typing.Literal[
     "schedule",
 ]
 
+GitHubRunStatusType = typing.Literal[
+    "queued",
+    "in_progress",
+    "completed",
+    "waiting",
+    "requested",
+    "pending",
+]
+
 GitHubWorkflowRunConclusionType = typing.Literal[
     "success",
     "failure",
@@ -55,6 +64,7 @@ class GitHubWorkflowRun(typing.TypedDict):
     workflow_id: int
     name: str
     event: GitHubWorkflowTriggerEventType
+    status: GitHubRunStatusType
     conclusion: GitHubWorkflowRunConclusionType
     triggering_actor: GitHubAccount
     jobs_url: str
@@ -62,6 +72,8 @@ class GitHubWorkflowRun(typing.TypedDict):
     repository: GitHubRepository
     run_attempt: int
     run_started_at: base.ISODateTimeType
+    created_at: base.ISODateTimeType
+    updated_at: base.ISODateTimeType
 
 
 GitHubJobRunConclusionType = typing.Literal[
@@ -85,7 +97,9 @@ class GitHubJobRun(typing.TypedDict):
     id: int
     run_id: int
     name: str
+    status: GitHubRunStatusType
     conclusion: GitHubJobRunConclusionType
+    created_at: base.ISODateTimeType
     started_at: base.ISODateTimeType
     completed_at: base.ISODateTimeType
     steps: list[GitHubJobRunStep]
@@ -102,3 +116,12 @@ class GitHubJobRunList(typing.TypedDict):
 class GitHubWorkflowRunsList(typing.TypedDict):
     total_count: int
     workflow_runs: list[GitHubWorkflowRun]
+
+
+# https://docs.github.com/en/rest/actions/artifacts#list-workflow-run-artifacts
+class GitHubArtifact(typing.TypedDict):
+    id: int
+    name: str
+    size_in_bytes: int
+    expired: bool
+    archive_download_url: str
@@ -0,0 +1,328 @@
+from __future__ import annotations
+
+import bisect
+import collections
+import json
+import os
+import pathlib
+import re
+import threading
+import time
+import typing
+
+import daiquiri
+
+from ci_benchmark_tooling import constants
+from ci_benchmark_tooling import store
+
+
+if typing.TYPE_CHECKING:
+    import argparse
+    import types
+
+    import httpx
+
+
+LOG = daiquiri.getLogger(__name__)
+
+ExportFormatT = typing.Literal["json", "otel"]
+
+# Applied in order to the path of the requests, to group the requests to
+# the same endpoint whatever its parameters
+ENDPOINT_TEMPLATE_SUBSTITUTIONS = (
+    (re.compile(r"^(/repos)/[^/]+/[^/]+"), r"\1/{owner}/{repo}"),
+    (re.compile(r"(/project/(?:gh|github))/[^/]+/[^/]+"), r"\1/{owner}/{repo}"),
+    (re.compile(r"(/insights/gh)/[^/]+/[^/]+"), r"\1/{owner}/{repo}"),
+    (re.compile(r"(/workflows)/[^/]+(?=/)"), r"\1/{workflow}"),
+    (
+        re.compile(
+            r"/(?:\d+|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})(?=/|$)",
+        ),
+        "/{id}",
+    ),
+)
+
+
+def get_endpoint_template(path: str) -> str:
+    """
+    Returns `path` with its parameters replaced by placeholders, e.g.
+    `/repos/{owner}/{repo}/actions/runs/{id}`.
+    """
+    for pattern, replacement in ENDPOINT_TEMPLATE_SUBSTITUTIONS:
+        path = pattern.sub(replacement, path)
+    return path
+
+
+class RequestRecord(typing.NamedTuple):
+    api: str
+    method: str
+    endpoint: str
+    # `None` when no response was received
+    status_code: int | None
+    # Number of attempts after the first one
+    retries: int
+    response_bytes: int
+    # From the first attempt to the last response, including the waits
+    # between the retries and for the rate limiter
+    latency_secs: float
+    started_at_ns: int
+    ended_at_ns: int
+
+
+RequestHookT = typing.Callable[[RequestRecord], None]
+
+
+class RequestMeasure:
+    """
+    Measures a request, along with its retries, and records it when exiting.
+    """
+
+    def __init__(self, request: httpx.Request) -> None:
+        self.request = request
+        self.attempts = 0
+        self.status_code: int | None = None
+        self.response_bytes = 0
+        self.started_at_ns = time.time_ns()
+        self.started_at = time.perf_counter()
+
+    def __enter__(self) -> RequestMeasure:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: types.TracebackType | None,
+    ) -> None:
+        record_request(
+            RequestRecord(
+                api=self.request.url.host,
+                method=self.request.method,
+                endpoint=get_endpoint_template(self.request.url.path),
+                status_code=self.status_code,
+                retries=max(self.attempts - 1, 0),
+                response_bytes=self.response_bytes,
+                latency_secs=time.perf_counter() - self.started_at,
+                started_at_ns=self.started_at_ns,
+                ended_at_ns=time.time_ns(),
+            ),
+        )
+
+    def add_attempt(self) -> None:
+        self.attempts += 1
+
+    def set_response(self, response: httpx.Response) -> None:
+        self.status_code = response.status_code
+        self.response_bytes = len(response.content)
+
+
+class EndpointHistogram:
+    """
+    Latencies, statuses and sizes of the requests to an endpoint, the
+    latencies being counted in the `INSTRUMENTATION_LATENCY_BUCKETS_SECONDS`
+    buckets.
+    """
+
+    def __init__(self, api: str, method: str, endpoint: str) -> None:
+        self.api = api
+        self.method = method
+        self.endpoint = endpoint
+        # The last bucket counts the latencies above the last bound
+        self.buckets = [0] * (
+            len(constants.INSTRUMENTATION_LATENCY_BUCKETS_SECONDS) + 1
+        )
+        self.latencies: list[float] = []
+        self.statuses: collections.Counter[str] = collections.Counter()
+        self.retries = 0
+        self.response_bytes = 0
+
+    def add(self, record: RequestRecord) -> None:
+        self.buckets[
+            bisect.bisect_left(
+                constants.INSTRUMENTATION_LATENCY_BUCKETS_SECONDS,
+                record.latency_secs,
+            )
+        ] += 1
+        bisect.insort(self.latencies, record.latency_secs)
+        self.statuses[
+            "error" if record.status_code is None else str(record.status_code)
+        ] += 1
+        self.retries += record.retries
+        self.response_bytes += record.response_bytes
+
+    def get_summary(self) -> dict[str, typing.Any]:
+        return {
+            "api": self.api,
+            "method": self.method,
+            "endpoint": self.endpoint,
+            "requests": len(self.latencies),
+            "statuses": dict(self.statuses),
+            "retries": self.retries,
+            "response_bytes": self.response_bytes,
+            "latency_secs": {
+                "sum": round(sum(self.latencies), 3),
+                "min": round(self.latencies[0], 3),
+                "p50": round(store.get_percentile(self.latencies, 50), 3),
+                "p95": round(store.get_percentile(self.latencies, 95), 3),
+                "max": round(self.latencies[-1], 3),
+                "buckets": [
+                    {"le": bound, "count": count}
+                    for bound, count in zip(
+                        (*constants.INSTRUMENTATION_LATENCY_BUCKETS_SECONDS, None),
+                        self.buckets,
+                        strict=True,
+                    )
+                ],
+            },
+        }
+
+
+class Instrumentation:
+    """
+    Receives the record of every request made by the clients (see
+    `record_request`), passes it to the hooks added with `add_hook` and
+    aggregates it in the histogram of its endpoint.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.hooks: list[RequestHookT] = []
+        self.records: list[RequestRecord] = []
+        self.histograms: dict[tuple[str, str, str], EndpointHistogram] = {}
+
+    def add_hook(self, hook: RequestHookT) -> None:
+        with self.lock:
+            self.hooks.append(hook)
+
+    def record(self, record: RequestRecord) -> None:
+        with self.lock:
+            self.records.append(record)
+            key = (record.api, record.method, record.endpoint)
+            if key not in self.histograms:
+                self.histograms[key] = EndpointHistogram(*key)
+            self.histograms[key].add(record)
+            hooks = list(self.hooks)
+
+        for hook in hooks:
+            hook(record)
+
+    def get_summary(self) -> dict[str, typing.Any]:
+        with self.lock:
+            histograms = sorted(
+                self.histograms.values(),
+                key=lambda h: sum(h.latencies),
+                reverse=True,
+            )
+            return {
+                "requests": len(self.records),
+                "endpoints": [h.get_summary() for h in histograms],
+            }
+
+    def get_otel_spans(self) -> dict[str, typing.Any]:
+        """
+        Returns a span per request in the OTLP/JSON format, all in the same
+        trace, to be loaded in any OpenTelemetry compatible tool.
+        """
+        trace_id = os.urandom(16).hex()
+        with self.lock:
+            records = list(self.records)
+
+        spans = []
+        for record in records:
+            attributes: dict[str, str | int] = {
+                "http.request.method": record.method,
+                "server.address": record.api,
+                "url.template": record.endpoint,
+                "http.request.resend_count": record.retries,
+                "http.response.body.size": record.response_bytes,
+            }
+            if record.status_code is not None:
+                attributes["http.response.status_code"] = record.status_code
+
+            is_error = record.status_code is None or record.status_code >= 400
+            spans.append(
+                {
+                    "traceId": trace_id,
+                    "spanId": os.urandom(8).hex(),
+                    "name": f"{record.method} {record.endpoint}",
+                    # SPAN_KIND_CLIENT
+                    "kind": 3,
+                    "startTimeUnixNano": str(record.started_at_ns),
+                    "endTimeUnixNano": str(record.ended_at_ns),
+                    "attributes": [
+                        {"key": key, "value": get_otel_value(value)}
+                        for key, value in attributes.items()
+                    ],
+                    # STATUS_CODE_ERROR or STATUS_CODE_UNSET
+                    "status": {"code": 2 if is_error else 0},
+                },
+            )
+
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            {
+                                "key": "service.name",
+                                "value": get_otel_value("ci_benchmark_tooling"),
+                            },
+                        ],
+                    },
+                    "scopeSpans": [
+                        {"scope": {"name": __name__}, "spans": spans},
+                    ],
+                },
+            ],
+        }
+
+
+def get_otel_value(value: str | int) -> dict[str, str]:
+    if isinstance(value, int):
+        # 64 bits integers are strings in OTLP/JSON
+        return {"intValue": str(value)}
+    return {"stringValue": value}
+
+
+INSTRUMENTATION = Instrumentation()
+
+
+def record_request(record: RequestRecord) -> None:
+    INSTRUMENTATION.record(record)
+
+
+def add_hook(hook: RequestHookT) -> None:
+    INSTRUMENTATION.add_hook(hook)
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--instrumentation",
+        type=pathlib.Path,
+        default=None,
+        metavar="FILE",
+        help="Write the latency, status, retries and size of the requests made to each api endpoint to FILE.",
+    )
+    parser.add_argument(
+        "--instrumentation-format",
+        choices=typing.get_args(ExportFormatT),
+        default="json",
+        help="Format of the `--instrumentation` file: a summary of the histograms of each endpoint, or a span per request in the OpenTelemetry OTLP/JSON format.",
+    )
+
+
+def write_export(path: pathlib.Path, export_format: ExportFormatT) -> None:
+    if export_format == "otel":
+        data = INSTRUMENTATION.get_otel_spans()
+    else:
+        data = INSTRUMENTATION.get_summary()
+
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+
+    LOG.info(
+        "Requests instrumentation written to %s",
+        path,
+        export_format=export_format,
+        requests=len(INSTRUMENTATION.records),
+    )
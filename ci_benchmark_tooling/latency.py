@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import typing
+
+import numpy as np
+
+from ci_benchmark_tooling import benchmark_table
+from ci_benchmark_tooling import constants
+from ci_benchmark_tooling import store
+
+
+if typing.TYPE_CHECKING:
+    from collections import abc
+
+    from ci_benchmark_tooling import types
+
+
+# The steps measuring how long a job waits before running the benchmarked
+# application build: the queue time, then the provisioning of the runner.
+LATENCY_STEPS = (
+    constants.CSV_QUEUE_TIME_STEP_NAME,
+    constants.GITHUB_JOB_STEPS[0],
+    constants.CIRCLECI_JOB_STEPS[0],
+)
+
+
+class RunnerLatency(typing.NamedTuple):
+    ci_provider: str
+    runner_type: str
+    step_name: str
+    samples: int
+    p50: float
+    p95: float
+
+
+def get_runners_latencies(
+    csv_data: abc.Iterable[types.CsvDataLine],
+) -> list[RunnerLatency]:
+    """
+    Returns the median and p95 of the time spent in each of `LATENCY_STEPS`,
+    per runner type.
+    """
+    times_per_runner = (
+        benchmark_table.BenchmarkTable.from_csv_data(csv_data)
+        .filter({"step_name": LATENCY_STEPS})
+        .group_by(("ci_provider", "runner_type", "step_name"))
+    )
+
+    latencies = []
+    for (ci_provider, runner_type, step_name), times in times_per_runner.items():
+        sorted_times = np.sort(times).tolist()
+        latencies.append(
+            RunnerLatency(
+                ci_provider=str(ci_provider),
+                runner_type=str(runner_type),
+                step_name=str(step_name),
+                samples=len(sorted_times),
+                p50=store.get_percentile(sorted_times, 50),
+                p95=store.get_percentile(sorted_times, 95),
+            ),
+        )
+
+    return sorted(latencies)
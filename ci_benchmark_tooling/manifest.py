@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import datetime
+import json
+import typing
+
+
+if typing.TYPE_CHECKING:
+    import pathlib
+
+    from ci_benchmark_tooling import types
+
+
+class CiManifest(typing.TypedDict):
+    # Every workflow run created before this date has already been ingested,
+    # or will never be ingested.
+    high_water_mark: str | None
+    # Workflows ids already ingested, with their creation date, that were
+    # created after the `high_water_mark`.
+    workflows_ids: dict[str, str]
+
+
+class IngestedWorkflowsManifest:
+    """
+    Keep track, for each ci provider, of the workflows runs already written
+    to the report so the incremental mode only fetches the new ones.
+    """
+
+    def __init__(self, cis: dict[str, CiManifest] | None = None) -> None:
+        self.cis = cis or {}
+
+    @classmethod
+    def load(cls, path: pathlib.Path) -> IngestedWorkflowsManifest:
+        if not path.exists():
+            return cls()
+
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def save(self, path: pathlib.Path) -> None:
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.cis, f, indent=2, sort_keys=True)
+
+        tmp_path.replace(path)
+
+    def _get_ci(self, ci_prefix: str) -> CiManifest:
+        return self.cis.setdefault(
+            ci_prefix,
+            {"high_water_mark": None, "workflows_ids": {}},
+        )
+
+    def get_high_water_mark(self, ci_prefix: str) -> datetime.datetime | None:
+        high_water_mark = self._get_ci(ci_prefix)["high_water_mark"]
+        if high_water_mark is None:
+            return None
+
+        return datetime.datetime.fromisoformat(high_water_mark)
+
+    def get_workflows_ids_to_ingest(
+        self,
+        ci_prefix: str,
+        workflows_runs: list[types.BenchmarkWorkflowRun],
+    ) -> list[str]:
+        ingested_ids = self._get_ci(ci_prefix)["workflows_ids"]
+        return [
+            run.workflow_id
+            for run in workflows_runs
+            if run.finished and run.workflow_id not in ingested_ids
+        ]
+
+    def update(
+        self,
+        ci_prefix: str,
+        workflows_runs: list[types.BenchmarkWorkflowRun],
+    ) -> None:
+        """
+        Mark the finished `workflows_runs` as ingested and move the high water mark
+        up to the oldest run that is not finished yet, so it gets picked up once it is.
+        """
+        ci_manifest = self._get_ci(ci_prefix)
+
+        for run in workflows_runs:
+            if run.finished:
+                ci_manifest["workflows_ids"][
+                    run.workflow_id
+                ] = run.created_at.isoformat()
+
+        unfinished_dates = [r.created_at for r in workflows_runs if not r.finished]
+        if unfinished_dates:
+            high_water_mark = min(unfinished_dates)
+        else:
+            known_dates = [r.created_at for r in workflows_runs]
+            if ci_manifest["high_water_mark"] is not None:
+                known_dates.append(
+                    datetime.datetime.fromisoformat(ci_manifest["high_water_mark"]),
+                )
+            if not known_dates:
+                return
+
+            high_water_mark = max(known_dates)
+
+        ci_manifest["high_water_mark"] = high_water_mark.isoformat()
+        # The runs created before the high water mark will never be returned
+        # by the api anymore, no need to keep them around.
+        ci_manifest["workflows_ids"] = {
+            workflow_id: created_at
+            for workflow_id, created_at in ci_manifest["workflows_ids"].items()
+            if datetime.datetime.fromisoformat(created_at) >= high_water_mark
+        }
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import datetime
+import random
+import statistics
+import typing
+
+from ci_benchmark_tooling import constants
+
+
+class PolledWorkflow(typing.NamedTuple):
+    name: str
+    # `None` while the workflow is still queued
+    started_at: datetime.datetime | None
+
+
+def get_median_durations(
+    durations_per_name: dict[str, list[datetime.timedelta]],
+) -> dict[str, datetime.timedelta]:
+    return {
+        name: datetime.timedelta(
+            seconds=statistics.median(d.total_seconds() for d in durations),
+        )
+        for name, durations in durations_per_name.items()
+        if durations
+    }
+
+
+class PollingScheduler:
+    """
+    Decide how long to wait before the next polling round.
+
+    While a running workflow is expected to end later, based on its start date
+    and on the duration of its previous runs, we wait until its expected end
+    (capped to `max_delay`). Once every workflow is overdue, or when there is no
+    history to rely on, we poll with an exponential backoff starting from
+    `min_delay`, up to `max_backoff_delay`. Every delay gets a random jitter so
+    that the clients don't all poll at the same time.
+    """
+
+    def __init__(
+        self,
+        expected_durations: dict[str, datetime.timedelta],
+        min_delay: float = constants.POLLING_MIN_DELAY_SECONDS,
+        max_delay: float = constants.POLLING_MAX_DELAY_SECONDS,
+        jitter: float = constants.POLLING_JITTER_RATIO,
+        max_backoff_delay: float = constants.POLLING_MAX_BACKOFF_DELAY_SECONDS,
+    ) -> None:
+        self.expected_durations = expected_durations
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.max_backoff_delay = max_backoff_delay
+        self.jitter = jitter
+        self.backoff_attempt = 0
+        self.random = random.Random()
+
+    def get_expected_remaining_time(
+        self,
+        workflow: PolledWorkflow,
+        now: datetime.datetime,
+    ) -> datetime.timedelta | None:
+        expected_duration = self.expected_durations.get(workflow.name)
+        if workflow.started_at is None or expected_duration is None:
+            return None
+
+        return expected_duration - (now - workflow.started_at)
+
+    def get_next_delay(
+        self,
+        running_workflows: list[PolledWorkflow],
+        now: datetime.datetime,
+    ) -> float:
+        remaining_times = [
+            remaining.total_seconds()
+            for w in running_workflows
+            if (remaining := self.get_expected_remaining_time(w, now)) is not None
+        ]
+        next_expected_end = min(remaining_times, default=None)
+
+        if next_expected_end is not None and next_expected_end > self.min_delay:
+            self.backoff_attempt = 0
+            delay = next_expected_end
+        else:
+            # Leave room for the jitter, so it never goes past `max_backoff_delay`
+            max_backoff_delay = self.max_backoff_delay / (1 + self.jitter)
+            delay = self.min_delay * 2**self.backoff_attempt
+            if delay < max_backoff_delay:
+                self.backoff_attempt += 1
+            delay = min(delay, max_backoff_delay)
+
+        delay = min(delay, self.max_delay)
+        delay *= self.random.uniform(1 - self.jitter, 1 + self.jitter)
+        return max(delay, 0.0)
@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import collections
+import csv
+import math
+import pathlib
+import statistics
+import typing
+
+import daiquiri
+
+from ci_benchmark_tooling import constants
+
+
+if typing.TYPE_CHECKING:
+    from collections import abc
+
+    from ci_benchmark_tooling import types
+
+
+LOG = daiquiri.getLogger(__name__)
+
+RUNNER_PRICES_CSV_FILE = pathlib.Path(__file__).parent.parent / "runner_prices.csv"
+
+# The per-minute rates of `runner_prices.csv` already have these multipliers
+# applied, they are only used to count the minutes consumed from the minutes
+# included in the GitHub plans.
+GITHUB_MINUTES_MULTIPLIERS = {
+    "Linux": 1,
+    "Windows": 2,
+    "macOS": 10,
+}
+
+SELF_HOSTED_RUNNER_TYPE_PREFIX = "Self-Hosted"
+
+
+class RunnerPrice(typing.NamedTuple):
+    ci_provider: str
+    runner_os: str
+    runner_name: str
+    runner_cores: int
+    cost_per_minute: float
+
+
+class BuildConfiguration(typing.NamedTuple):
+    ci_provider: str
+    runner_os: str
+    runner_type: str
+    runner_cores: int
+    tested_repository: str
+    additional_infos: str
+
+
+class BuildCost(typing.NamedTuple):
+    configuration: BuildConfiguration
+    price: RunnerPrice
+    builds: int
+    mean_time_spent_in_secs: float
+    billed_minutes_per_build: float
+    # Minutes consumed from the minutes included in the GitHub plans,
+    # `None` for the runners that do not consume any.
+    included_minutes_per_build: float | None
+    cost_per_build: float
+
+    @property
+    def cost_per_1000_builds(self) -> float:
+        return self.cost_per_build * 1000
+
+
+class RunnerPricesIndex:
+    def __init__(self, prices: abc.Iterable[RunnerPrice]) -> None:
+        self.prices: dict[
+            tuple[str, str, int],
+            list[RunnerPrice],
+        ] = collections.defaultdict(list)
+        for price in prices:
+            self.prices[
+                (price.ci_provider, price.runner_os, price.runner_cores)
+            ].append(price)
+
+    @classmethod
+    def from_csv_file(cls, path: pathlib.Path) -> RunnerPricesIndex:
+        with open(path) as f:
+            csv_reader = csv.reader(f, delimiter=";")
+            # Skip the header
+            next(csv_reader)
+            return cls(
+                RunnerPrice(
+                    ci_provider=ci_provider,
+                    runner_os=runner_os,
+                    runner_name=runner_name,
+                    runner_cores=int(runner_cores),
+                    cost_per_minute=float(cost_per_minute),
+                )
+                for ci_provider, runner_os, runner_name, runner_cores, cost_per_minute in csv_reader
+            )
+
+    def get_prices(self, configuration: BuildConfiguration) -> list[RunnerPrice]:
+        """
+        Returns the prices matching the runner of `configuration`.
+
+        The report does not know the exact machine type, so several prices
+        are returned when more than one machine type of the ci provider has the
+        same number of cores, or when a self-hosted runner has several pricing
+        options.
+        """
+        runner_os_family = get_runner_os_family(configuration.runner_os)
+        if runner_os_family is None:
+            return []
+
+        prices = self.prices.get(
+            (configuration.ci_provider, runner_os_family, configuration.runner_cores),
+            [],
+        )
+        if configuration.runner_type.startswith(SELF_HOSTED_RUNNER_TYPE_PREFIX):
+            return [
+                p for p in prices if p.runner_name.startswith(configuration.runner_type)
+            ]
+
+        return [
+            p
+            for p in prices
+            if not p.runner_name.startswith(SELF_HOSTED_RUNNER_TYPE_PREFIX)
+        ]
+
+
+def get_runner_os_family(runner_os: str) -> str | None:
+    """
+    Returns the operating system, as named in `runner_prices.csv`, of a
+    GitHub runner image (eg. `ubuntu-22.04`) or CircleCI machine image
+    (eg. `windows-server-2019-vs2019:2022.08.1`, `xcode:14.2.0`).
+    """
+    runner_os = runner_os.lower()
+    if runner_os.startswith("ubuntu"):
+        return "Linux"
+    if runner_os.startswith("windows"):
+        return "Windows"
+    if runner_os.startswith(("macos", "xcode")):
+        return "macOS"
+    return None
+
+
+def get_job_additional_infos(line: types.CsvDataLine) -> str:
+    """
+    Returns the additional infos of the job `line` comes from, without the
+    mention of the setup steps added by the clients.
+    """
+    for setup_step_infos in (
+        constants.GITHUB_JOB_STEPS_ADDITIONAL_INFOS,
+        constants.CIRCLECI_JOB_STEPS_ADDITIONAL_INFOS,
+    ):
+        if line.additional_infos.endswith(setup_step_infos):
+            return line.additional_infos.removesuffix(setup_step_infos).removesuffix(
+                " / ",
+            )
+    return line.additional_infos
+
+
+def get_builds_times(
+    workflows_data: abc.Iterable[types.WorkflowRunData],
+) -> dict[BuildConfiguration, list[float]]:
+    """
+    Returns the time spent in seconds by each build, that is all the steps of
+    a runner configuration in a workflow run, per configuration.
+    """
+    builds_times: dict[BuildConfiguration, list[float]] = collections.defaultdict(
+        list,
+    )
+    for workflow_data in workflows_data:
+        workflow_builds_times: dict[
+            BuildConfiguration,
+            float,
+        ] = collections.defaultdict(float)
+        for line in workflow_data.csv_data:
+            if line.step_name == constants.CSV_QUEUE_TIME_STEP_NAME:
+                # The jobs are not billed while waiting for a runner
+                continue
+
+            configuration = BuildConfiguration(
+                ci_provider=line.ci_provider,
+                runner_os=line.runner_os,
+                runner_type=line.runner_type,
+                runner_cores=line.runner_cores,
+                tested_repository=line.tested_repository,
+                additional_infos=get_job_additional_infos(line),
+            )
+            workflow_builds_times[configuration] += line.time_spent_in_secs
+
+        for configuration, time_spent in workflow_builds_times.items():
+            builds_times[configuration].append(time_spent)
+
+    return builds_times
+
+
+def is_github_hosted(ci_provider: str, runner_type: str) -> bool:
+    """
+    Returns whether the runner is billed by GitHub, unlike the self-hosted
+    ones whose machines are billed by their cloud provider.
+    """
+    return ci_provider == "GitHub" and not runner_type.startswith(
+        SELF_HOSTED_RUNNER_TYPE_PREFIX,
+    )
+
+
+def get_billed_minutes(
+    ci_provider: str,
+    runner_type: str,
+    time_spent_in_secs: float,
+) -> float:
+    if is_github_hosted(ci_provider, runner_type):
+        # GitHub rounds the minutes and partial minutes each job uses up
+        # to the nearest whole minute
+        return math.ceil(time_spent_in_secs / 60)
+    return time_spent_in_secs / 60
+
+
+def get_builds_costs(
+    workflows_data: abc.Iterable[types.WorkflowRunData],
+    prices_index: RunnerPricesIndex,
+) -> list[BuildCost]:
+    builds_costs = []
+    for configuration, builds_times in get_builds_times(workflows_data).items():
+        billed_minutes_per_build = statistics.mean(
+            get_billed_minutes(
+                configuration.ci_provider,
+                configuration.runner_type,
+                t,
+            )
+            for t in builds_times
+        )
+
+        included_minutes_per_build = None
+        if is_github_hosted(configuration.ci_provider, configuration.runner_type):
+            runner_os_family = get_runner_os_family(configuration.runner_os)
+            if runner_os_family is not None:
+                included_minutes_per_build = (
+                    billed_minutes_per_build
+                    * GITHUB_MINUTES_MULTIPLIERS[runner_os_family]
+                )
+
+        prices = prices_index.get_prices(configuration)
+        if not prices:
+            LOG.warning("No price found for the runner of %s", configuration)
+
+        for price in prices:
+            builds_costs.append(
+                BuildCost(
+                    configuration=configuration,
+                    price=price,
+                    builds=len(builds_times),
+                    mean_time_spent_in_secs=statistics.mean(builds_times),
+                    billed_minutes_per_build=billed_minutes_per_build,
+                    included_minutes_per_build=included_minutes_per_build,
+                    cost_per_build=billed_minutes_per_build * price.cost_per_minute,
+                ),
+            )
+
+    return builds_costs
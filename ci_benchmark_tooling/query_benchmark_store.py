@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+import argparse
+import csv
+import logging
+import pathlib
+import sys
+
+import daiquiri
+
+from ci_benchmark_tooling import store
+
+
+daiquiri.setup(level=logging.INFO)
+
+
+def parse_filter(filter_str: str) -> tuple[str, str]:
+    column, sep, value = filter_str.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(
+            f"Invalid filter `{filter_str}`, expected COLUMN=VALUE",
+        )
+
+    return column, value
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Aggregate the time spent per step stored in a historical benchmark store",
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    parser.add_argument(
+        "store",
+        type=pathlib.Path,
+        help="Directory of the benchmark store, as given to `create-benchmark-report --store`.",
+    )
+    parser.add_argument(
+        "--group-by",
+        type=lambda v: v.split(","),
+        default=list(store.DEFAULT_GROUP_BY),
+        help=f"Comma-separated list of the columns to group by (default: {','.join(store.DEFAULT_GROUP_BY)}).",
+    )
+    parser.add_argument(
+        "--filter",
+        type=parse_filter,
+        action="append",
+        default=[],
+        dest="filters",
+        metavar="COLUMN=VALUE",
+        help="Only aggregate the rows where COLUMN equals VALUE, can be specified multiple times.",
+    )
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = get_parser()
+
+    args = parser.parse_args(argv)
+
+    for column in [*args.group_by, *(c for c, _v in args.filters)]:
+        if column not in store.STRING_COLUMNS + store.INTEGER_COLUMNS:
+            parser.error(f"Unknown column `{column}`")
+
+    results = store.BenchmarkStore(args.store).aggregate(
+        args.group_by,
+        dict(args.filters),
+    )
+
+    csv_writer = csv.writer(sys.stdout, delimiter=";")
+    csv_writer.writerow(
+        [*args.group_by, "Samples", "Mean (sec)", "Median (sec)", "P95 (sec)"],
+    )
+    csv_writer.writerows(
+        [*r.group, r.samples, f"{r.mean:.1f}", f"{r.median:.1f}", f"{r.p95:.1f}"]
+        for r in results
+    )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
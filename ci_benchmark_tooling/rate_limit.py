@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+import threading
+import time
+import typing
+
+import daiquiri
+
+from ci_benchmark_tooling import constants
+
+
+if typing.TYPE_CHECKING:
+    import httpx
+
+
+LOG = daiquiri.getLogger(__name__)
+
+# "high" is for the dispatch and polling requests, which must not be delayed
+# by the bulk "low" requests of the reports.
+RequestPriorityT = typing.Literal["high", "low"]
+
+
+class RateLimitBudget(typing.NamedTuple):
+    api: str
+    limit: int | None
+    remaining: int | None
+    reset_at: datetime.datetime | None
+    requests: int
+    throttled_responses: int
+    waited_seconds: float
+
+
+def get_retry_after_seconds(response: httpx.Response) -> float | None:
+    retry_after = response.headers.get("Retry-After")
+    if retry_after is None:
+        return None
+
+    try:
+        return max(float(retry_after), 0.0)
+    except ValueError:
+        return None
+
+
+class RateLimiter:
+    """
+    Token bucket pacing the requests made to an api, shared by every client
+    of this api (see `get_rate_limiter`).
+
+    The bucket is refilled so that the remaining budget of the api, read from
+    the `X-RateLimit-*` headers of its responses, lasts until it is reset.
+    The "low" priority requests leave `RATE_LIMIT_RESERVED_RATIO` of the budget
+    to the "high" priority ones, which are only held back once the budget is
+    exhausted or when the api asked us to wait with a 429 or `Retry-After`.
+    """
+
+    def __init__(self, api: str) -> None:
+        self.api = api
+        self.lock = threading.Lock()
+
+        self.limit: int | None = None
+        self.remaining: int | None = None
+        # POSIX timestamps
+        self.reset_at: float | None = None
+        self.blocked_until = 0.0
+
+        self.tokens = float(constants.RATE_LIMIT_BURST)
+        self.last_refill_at = time.time()
+
+        self.requests = 0
+        self.throttled_responses = 0
+        self.waited_seconds = 0.0
+
+    def get_budget(self) -> RateLimitBudget:
+        return RateLimitBudget(
+            api=self.api,
+            limit=self.limit,
+            remaining=self.remaining,
+            reset_at=None
+            if self.reset_at is None
+            else datetime.datetime.fromtimestamp(self.reset_at, tz=constants.UTC),
+            requests=self.requests,
+            throttled_responses=self.throttled_responses,
+            waited_seconds=self.waited_seconds,
+        )
+
+    def _get_delay(self, priority: RequestPriorityT, now: float) -> float:
+        """
+        Returns how long to wait before sending a request of `priority`,
+        or consumes a token and returns 0 if it can be sent right away.
+        """
+        if now < self.blocked_until:
+            return self.blocked_until - now
+
+        if self.reset_at is not None and now >= self.reset_at:
+            # The budget has been reset since the last response
+            self.remaining = self.limit
+            self.reset_at = None
+
+        if self.remaining is not None and self.reset_at is not None:
+            if self.remaining <= 0:
+                return self.reset_at - now
+
+            if priority == "low":
+                reserved = int((self.limit or 0) * constants.RATE_LIMIT_RESERVED_RATIO)
+                available = self.remaining - reserved
+                if available <= 0:
+                    return self.reset_at - now
+
+                rate = available / (self.reset_at - now)
+                self.tokens = min(
+                    self.tokens + (now - self.last_refill_at) * rate,
+                    constants.RATE_LIMIT_BURST,
+                )
+                self.last_refill_at = now
+                if self.tokens < 1:
+                    return (1 - self.tokens) / rate
+
+                self.tokens -= 1
+
+        if self.remaining is not None:
+            # Count the request right away, so the concurrent ones don't
+            # have to wait for its response to see the budget decrease.
+            self.remaining -= 1
+
+        self.requests += 1
+        return 0.0
+
+    def acquire(self, priority: RequestPriorityT) -> None:
+        while True:
+            with self.lock:
+                delay = self._get_delay(priority, time.time())
+                if delay <= 0:
+                    return
+                self.waited_seconds += delay
+
+            self._log_wait(priority, delay)
+            time.sleep(delay)
+
+    async def acquire_async(self, priority: RequestPriorityT) -> None:
+        while True:
+            with self.lock:
+                delay = self._get_delay(priority, time.time())
+                if delay <= 0:
+                    return
+                self.waited_seconds += delay
+
+            self._log_wait(priority, delay)
+            await asyncio.sleep(delay)
+
+    def _log_wait(self, priority: RequestPriorityT, delay: float) -> None:
+        # Only log the long waits, the short ones are just the pacing
+        if delay >= 1:
+            LOG.info(
+                "Waiting %.1f seconds for the %s rate limit",
+                delay,
+                self.api,
+                priority=priority,
+                remaining=self.remaining,
+            )
+
+    def update(self, response: httpx.Response) -> None:
+        """
+        Updates the budget from the headers of `response`.
+        """
+        now = time.time()
+        with self.lock:
+            if response.status_code == 304 and self.remaining is not None:
+                # GitHub doesn't count the conditional requests answered with
+                # `304 Not Modified` in the rate limit
+                self.remaining += 1
+
+            try:
+                limit = int(response.headers["X-RateLimit-Limit"])
+                remaining = int(response.headers["X-RateLimit-Remaining"])
+                reset_at = float(response.headers["X-RateLimit-Reset"])
+            except (KeyError, ValueError):
+                pass
+            else:
+                self.limit = limit
+                # The responses of concurrent requests can arrive out of order,
+                # keep the lowest remaining budget of the current window.
+                if self.reset_at == reset_at and self.remaining is not None:
+                    self.remaining = min(self.remaining, remaining)
+                else:
+                    self.remaining = remaining
+                self.reset_at = reset_at
+
+            retry_after = get_retry_after_seconds(response)
+            is_throttled = response.status_code == 429 or (
+                response.status_code == 403 and self.remaining == 0
+            )
+            if is_throttled:
+                self.throttled_responses += 1
+                if retry_after is None and self.remaining == 0 and self.reset_at:
+                    retry_after = self.reset_at - now
+                elif retry_after is None:
+                    retry_after = constants.RATE_LIMIT_DEFAULT_RETRY_AFTER_SECONDS
+
+            if retry_after is not None:
+                self.blocked_until = max(self.blocked_until, now + retry_after)
+
+
+RATE_LIMITERS: dict[str, RateLimiter] = {}
+RATE_LIMITERS_LOCK = threading.Lock()
+
+
+def get_rate_limiter(api: str) -> RateLimiter:
+    """
+    Returns the rate limiter of `api`, the host of the requests, shared by
+    every client in the process.
+    """
+    with RATE_LIMITERS_LOCK:
+        if api not in RATE_LIMITERS:
+            RATE_LIMITERS[api] = RateLimiter(api)
+        return RATE_LIMITERS[api]
+
+
+def get_budgets() -> list[RateLimitBudget]:
+    with RATE_LIMITERS_LOCK:
+        return [rate_limiter.get_budget() for rate_limiter in RATE_LIMITERS.values()]
+
+
+def log_budgets() -> None:
+    for budget in get_budgets():
+        LOG.info(
+            "Rate limit budget of %s: %s/%s requests remaining",
+            budget.api,
+            "?" if budget.remaining is None else budget.remaining,
+            "?" if budget.limit is None else budget.limit,
+            reset_at=None if budget.reset_at is None else budget.reset_at.isoformat(),
+            requests=budget.requests,
+            throttled_responses=budget.throttled_responses,
+            waited_seconds=round(budget.waited_seconds, 1),
+        )
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import collections
+import math
+import statistics
+import typing
+
+from ci_benchmark_tooling import benchmark_statistics
+from ci_benchmark_tooling import constants
+from ci_benchmark_tooling import steps
+
+
+if typing.TYPE_CHECKING:
+    from collections import abc
+
+    from ci_benchmark_tooling import store
+    from ci_benchmark_tooling import types
+
+
+VerdictT = typing.Literal["regression", "improvement", "unchanged"]
+
+
+class RegressionCheck(typing.NamedTuple):
+    configuration: benchmark_statistics.Configuration
+    baseline_runs: int
+    baseline_median: float
+    runs: int
+    median: float
+    # Relative difference of `median` with `baseline_median`
+    change: float
+    # Modified z-score of `median` in the baseline
+    z_score: float
+    verdict: VerdictT
+
+
+def get_runs_times_per_configuration(
+    workflows_data: abc.Iterable[types.WorkflowRunData],
+) -> dict[benchmark_statistics.Configuration, list[float]]:
+    """
+    Returns the time spent by each workflow run in each configuration of the
+    steps of the benchmarked application build.
+    """
+    runs_times: dict[
+        tuple[benchmark_statistics.Configuration, str],
+        float,
+    ] = collections.defaultdict(float)
+    for workflow_data in workflows_data:
+        for line in workflow_data.csv_data:
+            # The queue time and the setup of the runners vary with the load
+            # of the ci providers, not with the build
+            if not steps.is_build_step(line.step_name):
+                continue
+
+            runs_times[
+                (
+                    benchmark_statistics.Configuration.from_csv_data_line(line),
+                    workflow_data.workflow_id,
+                )
+            ] += line.time_spent_in_secs
+
+    times_per_configuration: dict[
+        benchmark_statistics.Configuration,
+        list[float],
+    ] = collections.defaultdict(list)
+    for (configuration, _workflow_id), time_spent in runs_times.items():
+        times_per_configuration[configuration].append(time_spent)
+
+    return times_per_configuration
+
+
+def get_baselines(
+    benchmark_store: store.BenchmarkStore,
+    excluded_workflows_ids: abc.Container[str],
+    baseline_runs: int = constants.REGRESSION_BASELINE_RUNS,
+) -> dict[benchmark_statistics.Configuration, list[float]]:
+    """
+    Returns the times of the `baseline_runs` latest runs of each configuration
+    in `benchmark_store`, without the runs of `excluded_workflows_ids`.
+    """
+    baselines = {}
+    for group, runs_times in benchmark_store.get_runs_times(
+        benchmark_statistics.Configuration._fields,
+    ).items():
+        times = [
+            float(run_time.time_spent_in_secs)
+            for run_time in runs_times
+            if run_time.workflow_id not in excluded_workflows_ids
+        ]
+        if times:
+            configuration = benchmark_statistics.Configuration._make(group)
+            baselines[configuration] = times[-baseline_runs:]
+
+    return baselines
+
+
+def get_verdict(
+    baseline: list[float],
+    median: float,
+    threshold: float,
+) -> tuple[float, float, VerdictT]:
+    baseline_median = statistics.median(baseline)
+    difference = median - baseline_median
+    change = difference / baseline_median if baseline_median else 0.0
+
+    mad = statistics.median(abs(t - baseline_median) for t in baseline)
+    if mad:
+        z_score = 0.6745 * difference / mad
+    else:
+        # The baseline runs all took the same time, any difference stands out
+        z_score = 0.0 if difference == 0 else math.copysign(math.inf, difference)
+
+    is_significant = (
+        abs(z_score) > benchmark_statistics.OUTLIER_MODIFIED_Z_SCORE
+        and abs(change) > threshold
+        and abs(difference) >= constants.REGRESSION_MIN_DIFFERENCE_SECONDS
+    )
+    if not is_significant:
+        return change, z_score, "unchanged"
+    if difference > 0:
+        return change, z_score, "regression"
+    return change, z_score, "improvement"
+
+
+def get_regressions_checks(
+    runs_times_per_configuration: dict[benchmark_statistics.Configuration, list[float]],
+    baselines: dict[benchmark_statistics.Configuration, list[float]],
+    threshold: float = constants.REGRESSION_THRESHOLD,
+) -> list[RegressionCheck]:
+    """
+    Compare the median time of the new runs of each configuration to the
+    median of its baseline.
+
+    A configuration regressed, or improved, when its new median is both more
+    than `threshold` away from the baseline median and an outlier of the
+    baseline, according to its modified z-score.
+    """
+    checks = []
+    for configuration, runs_times in runs_times_per_configuration.items():
+        if not steps.is_build_step(configuration.step_name):
+            continue
+
+        baseline = baselines.get(configuration, [])
+        if len(baseline) < constants.REGRESSION_MIN_BASELINE_RUNS:
+            continue
+
+        median = statistics.median(runs_times)
+        change, z_score, verdict = get_verdict(baseline, median, threshold)
+        checks.append(
+            RegressionCheck(
+                configuration=configuration,
+                baseline_runs=len(baseline),
+                baseline_median=statistics.median(baseline),
+                runs=len(runs_times),
+                median=median,
+                change=change,
+                z_score=z_score,
+                verdict=verdict,
+            ),
+        )
+
+    return sorted(checks)
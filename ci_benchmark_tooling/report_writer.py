@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import csv
+import datetime
+import json
+import os
+import shutil
+import typing
+
+import daiquiri
+
+from ci_benchmark_tooling import benchmark_table
+from ci_benchmark_tooling import types
+
+
+if typing.TYPE_CHECKING:
+    from collections import abc
+    import pathlib
+
+
+LOG = daiquiri.getLogger(__name__)
+
+CSV_HEADER = (
+    "CI Provider",
+    "Runner OS",
+    "Runner type",
+    "Runner cores",
+    "Repository tested",
+    "Step",
+    "Time spent (sec)",
+    "Additional infos",
+)
+
+
+class CheckpointEntry(typing.TypedDict):
+    # Size of the temporary CSV file once the rows of the workflow run
+    # were written
+    csv_size: int
+    # `None` for the first entry, written before any workflow run
+    workflow_data: dict[str, typing.Any] | None
+    # Only in the first entry, the parameters of the report being written
+    parameters: typing.NotRequired[typing.Any]
+
+
+def dump_workflow_data(workflow_data: types.WorkflowRunData) -> dict[str, typing.Any]:
+    return {
+        "workflow_id": workflow_data.workflow_id,
+        "created_at": workflow_data.created_at.isoformat(),
+        "commit_sha": workflow_data.commit_sha,
+        "csv_data": [list(line) for line in workflow_data.csv_data],
+        "ci_provider": workflow_data.ci_provider,
+        "workflow_name": workflow_data.workflow_name,
+        "jobs": [
+            [
+                job.name,
+                None if job.started_at is None else job.started_at.isoformat(),
+                None if job.stopped_at is None else job.stopped_at.isoformat(),
+                list(job.dependencies),
+            ]
+            for job in workflow_data.jobs
+        ],
+    }
+
+
+def load_date(date: str | None) -> datetime.datetime | None:
+    return None if date is None else datetime.datetime.fromisoformat(date)
+
+
+def load_workflow_data(data: dict[str, typing.Any]) -> types.WorkflowRunData:
+    return types.WorkflowRunData(
+        workflow_id=data["workflow_id"],
+        created_at=datetime.datetime.fromisoformat(data["created_at"]),
+        commit_sha=data["commit_sha"],
+        csv_data=[types.CsvDataLine(*line) for line in data["csv_data"]],
+        ci_provider=data["ci_provider"],
+        workflow_name=data["workflow_name"],
+        jobs=[
+            types.WorkflowJob(
+                name=name,
+                started_at=load_date(started_at),
+                stopped_at=load_date(stopped_at),
+                dependencies=tuple(dependencies),
+            )
+            for name, started_at, stopped_at, dependencies in data["jobs"]
+        ],
+    )
+
+
+class ReportWriter:
+    """
+    Stream the rows of the report to a temporary CSV file, as the workflows
+    data is retrieved, and only replace the report with it once complete.
+
+    Each workflow run written is journaled in a checkpoint file, along with
+    the size of the temporary CSV file after its rows. An interrupted report
+    resumes from it: the rows written after the last checkpoint entry are
+    dropped, and the workflows runs already journaled are not fetched again.
+    The journal also allows reading the workflows data back for the report
+    analyses, without keeping it in memory.
+
+    The `parameters` of the report, e.g. the workflows ids it is written from,
+    are journaled too. A checkpoint left by a report with other parameters is
+    discarded instead of being resumed.
+    """
+
+    def __init__(
+        self,
+        path: pathlib.Path,
+        append: bool = False,
+        parameters: typing.Any = None,
+    ) -> None:
+        self.path = path
+        self.append = append
+        # As read back from the checkpoint, e.g. with lists instead of tuples
+        self.parameters = json.loads(json.dumps(parameters))
+        self.tmp_path = path.with_name(f"{path.name}.tmp")
+        self.checkpoint_path = path.with_name(f"{path.name}.checkpoint")
+        self.workflows_ids: set[str] = set()
+        self._csv_file: typing.TextIO | None = None
+        self._checkpoint_file: typing.TextIO | None = None
+
+    def __enter__(self) -> ReportWriter:
+        self.open()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _read_checkpoint(self) -> abc.Iterator[CheckpointEntry]:
+        with open(self.checkpoint_path) as f:
+            for line in f:
+                try:
+                    yield typing.cast(CheckpointEntry, json.loads(line))
+                except json.JSONDecodeError:
+                    # The last entry may have been partially written
+                    return
+
+    def open(self) -> None:
+        csv_size = None
+        if self.checkpoint_path.exists() and self.tmp_path.exists():
+            for entry in self._read_checkpoint():
+                if csv_size is None and entry.get("parameters") != self.parameters:
+                    LOG.warning(
+                        "Discarding the checkpoint %s of a report with other parameters",
+                        self.checkpoint_path,
+                    )
+                    break
+
+                csv_size = entry["csv_size"]
+                if entry["workflow_data"] is not None:
+                    self.workflows_ids.add(entry["workflow_data"]["workflow_id"])
+
+        if csv_size is not None:
+            LOG.info(
+                "Resuming the report from %s, %d workflows runs already written",
+                self.checkpoint_path,
+                len(self.workflows_ids),
+            )
+            with open(self.tmp_path, "r+") as f:
+                f.truncate(csv_size)
+            self._csv_file = open(self.tmp_path, "a", newline="")
+            self._checkpoint_file = open(self.checkpoint_path, "a")
+            return
+
+        if self.append and self.path.exists():
+            shutil.copyfile(self.path, self.tmp_path)
+            self._csv_file = open(self.tmp_path, "a", newline="")
+        else:
+            self._csv_file = open(self.tmp_path, "w", newline="")
+            csv.writer(self._csv_file, delimiter=";").writerow(CSV_HEADER)
+
+        self._checkpoint_file = open(self.checkpoint_path, "w")
+        self._write_checkpoint_entry(None)
+
+    def _sync(self, f: typing.TextIO) -> None:
+        f.flush()
+        os.fsync(f.fileno())
+
+    def _write_checkpoint_entry(
+        self,
+        workflow_data: types.WorkflowRunData | None,
+    ) -> None:
+        if self._csv_file is None or self._checkpoint_file is None:
+            raise RuntimeError("The report writer is not opened")
+
+        self._sync(self._csv_file)
+        entry: CheckpointEntry = {
+            "csv_size": self._csv_file.tell(),
+            "workflow_data": None
+            if workflow_data is None
+            else dump_workflow_data(workflow_data),
+        }
+        if workflow_data is None:
+            entry["parameters"] = self.parameters
+        self._checkpoint_file.write(json.dumps(entry) + "\n")
+        self._sync(self._checkpoint_file)
+
+    def write(self, workflow_data: types.WorkflowRunData) -> None:
+        if self._csv_file is None:
+            raise RuntimeError("The report writer is not opened")
+
+        csv.writer(self._csv_file, delimiter=";").writerows(workflow_data.csv_data)
+        self._write_checkpoint_entry(workflow_data)
+        self.workflows_ids.add(workflow_data.workflow_id)
+
+    def read_workflows_data(self) -> abc.Iterator[types.WorkflowRunData]:
+        """
+        Lazily yields the data of every workflow run written to the report.
+        """
+        for entry in self._read_checkpoint():
+            if entry["workflow_data"] is not None:
+                yield load_workflow_data(entry["workflow_data"])
+
+    def read_csv_data(self) -> abc.Iterator[types.CsvDataLine]:
+        for workflow_data in self.read_workflows_data():
+            yield from workflow_data.csv_data
+
+    def read_table(self) -> benchmark_table.BenchmarkTable:
+        """
+        Returns the rows of every workflow run written to the report, as a
+        compact columnar table.
+        """
+        return benchmark_table.BenchmarkTable.from_csv_data(self.read_csv_data())
+
+    def close(self) -> None:
+        for f in (self._csv_file, self._checkpoint_file):
+            if f is not None:
+                f.close()
+        self._csv_file = self._checkpoint_file = None
+
+    def commit(self) -> None:
+        """
+        Atomically replace the report with the temporary CSV file, and drop
+        the checkpoint.
+        """
+        self.close()
+        self.tmp_path.replace(self.path)
+        self.checkpoint_path.unlink()
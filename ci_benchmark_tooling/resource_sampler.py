@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Samples the CPU, memory, disk I/O and load of the runner of a benchmark job
+at a fixed interval, into a compact binary time series uploaded as an
+artifact of the job, and summarises it per step of the job in the report.
+
+The sampler is started in the background by the benchmark jobs from a bare
+checkout of this repository, it must only depend on the standard library.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import pathlib
+import signal
+import statistics
+import struct
+import sys
+import threading
+import time
+import typing
+
+from ci_benchmark_tooling import constants
+
+
+if typing.TYPE_CHECKING:
+    from collections import abc
+    import types
+
+
+MAGIC = b"CIRS"
+VERSION = 1
+# Magic, version, cores, interval in seconds and length of the label
+HEADER = struct.Struct("<4sHHdH")
+# POSIX timestamp, CPU (%), memory (%), 1 minute load average, disk read
+# and write (bytes/sec), NaN when not available on the runner
+SAMPLE = struct.Struct("<dfffff")
+
+PROC_STAT_FILE = pathlib.Path("/proc/stat")
+PROC_MEMINFO_FILE = pathlib.Path("/proc/meminfo")
+PROC_DISKSTATS_FILE = pathlib.Path("/proc/diskstats")
+SYS_BLOCK_FOLDER = pathlib.Path("/sys/block")
+# Size of the sectors of /proc/diskstats, whatever the disk
+DISKSTATS_SECTOR_SIZE = 512
+
+
+class SamplesHeader(typing.NamedTuple):
+    cores: int
+    interval_secs: float
+    # Name of the job the samples are from
+    label: str
+
+
+class ResourceSample(typing.NamedTuple):
+    timestamp: float
+    cpu_percent: float
+    memory_percent: float
+    load_1m: float
+    disk_read_bytes_per_sec: float
+    disk_write_bytes_per_sec: float
+
+
+class Counters(typing.NamedTuple):
+    """
+    Cumulative counters of the runner, the samples being the difference
+    between two of them. `None` when not available on the runner.
+    """
+
+    timestamp: float
+    cpu_busy_ticks: int | None
+    cpu_total_ticks: int | None
+    disk_read_bytes: int | None
+    disk_write_bytes: int | None
+
+
+class StepResourcesSummary(typing.NamedTuple):
+    job_name: str
+    step_name: str
+    samples: int
+    cpu_mean_percent: float
+    cpu_max_percent: float
+    memory_max_percent: float
+    # Above 1 when more processes were ready to run than there were cores
+    load_per_core_mean: float
+    disk_read_mean_bytes_per_sec: float
+    disk_write_mean_bytes_per_sec: float
+
+
+def read_cpu_ticks() -> tuple[int, int] | None:
+    """
+    Returns the time spent by all the cores busy and in total since boot.
+    """
+    try:
+        with open(PROC_STAT_FILE) as f:
+            # cpu user nice system idle iowait irq softirq steal ...
+            ticks = [int(t) for t in f.readline().split()[1:]]
+    except (OSError, ValueError):
+        return None
+
+    idle = ticks[3] + (ticks[4] if len(ticks) > 4 else 0)
+    return sum(ticks) - idle, sum(ticks)
+
+
+def read_memory_percent() -> float:
+    try:
+        with open(PROC_MEMINFO_FILE) as f:
+            meminfo = {
+                name: int(value.split()[0])
+                for name, _, value in (line.partition(":") for line in f)
+            }
+        return (1 - meminfo["MemAvailable"] / meminfo["MemTotal"]) * 100
+    except (OSError, ValueError, KeyError, ZeroDivisionError):
+        return float("nan")
+
+
+def get_disks_names() -> set[str] | None:
+    """
+    Returns the names of the whole disks, so that their partitions aren't
+    counted twice, or `None` if they can't be told apart.
+    """
+    try:
+        return {
+            d.name
+            for d in SYS_BLOCK_FOLDER.iterdir()
+            if not d.name.startswith(("loop", "ram"))
+        }
+    except OSError:
+        return None
+
+
+def read_disk_bytes(disks_names: set[str] | None) -> tuple[int, int] | None:
+    """
+    Returns the bytes read from and written to the disks since boot.
+    """
+    read_sectors = written_sectors = 0
+    try:
+        with open(PROC_DISKSTATS_FILE) as f:
+            for line in f:
+                # major minor name reads merged sectors_read ms writes merged sectors_written ...
+                fields = line.split()
+                if disks_names is not None and fields[2] not in disks_names:
+                    continue
+                read_sectors += int(fields[5])
+                written_sectors += int(fields[9])
+    except (OSError, ValueError, IndexError):
+        return None
+
+    return (
+        read_sectors * DISKSTATS_SECTOR_SIZE,
+        written_sectors * DISKSTATS_SECTOR_SIZE,
+    )
+
+
+def read_load_1m() -> float:
+    # Not available on Windows
+    getloadavg = getattr(os, "getloadavg", None)
+    if getloadavg is None:
+        return float("nan")
+    try:
+        return float(getloadavg()[0])
+    except OSError:
+        return float("nan")
+
+
+def read_counters(disks_names: set[str] | None) -> Counters:
+    cpu_ticks = read_cpu_ticks()
+    disk_bytes = read_disk_bytes(disks_names)
+    return Counters(
+        timestamp=time.time(),
+        cpu_busy_ticks=None if cpu_ticks is None else cpu_ticks[0],
+        cpu_total_ticks=None if cpu_ticks is None else cpu_ticks[1],
+        disk_read_bytes=None if disk_bytes is None else disk_bytes[0],
+        disk_write_bytes=None if disk_bytes is None else disk_bytes[1],
+    )
+
+
+def get_rate(previous: int | None, current: int | None, elapsed: float) -> float:
+    if previous is None or current is None or elapsed <= 0:
+        return float("nan")
+    return (current - previous) / elapsed
+
+
+def get_sample(
+    previous: Counters,
+    current: Counters,
+    memory_percent: float,
+    load_1m: float,
+) -> ResourceSample:
+    cpu_percent = float("nan")
+    if (
+        previous.cpu_busy_ticks is not None
+        and current.cpu_busy_ticks is not None
+        and previous.cpu_total_ticks is not None
+        and current.cpu_total_ticks is not None
+        and current.cpu_total_ticks > previous.cpu_total_ticks
+    ):
+        cpu_percent = (
+            (current.cpu_busy_ticks - previous.cpu_busy_ticks)
+            / (current.cpu_total_ticks - previous.cpu_total_ticks)
+            * 100
+        )
+
+    elapsed = current.timestamp - previous.timestamp
+    return ResourceSample(
+        timestamp=current.timestamp,
+        cpu_percent=cpu_percent,
+        memory_percent=memory_percent,
+        load_1m=load_1m,
+        disk_read_bytes_per_sec=get_rate(
+            previous.disk_read_bytes,
+            current.disk_read_bytes,
+            elapsed,
+        ),
+        disk_write_bytes_per_sec=get_rate(
+            previous.disk_write_bytes,
+            current.disk_write_bytes,
+            elapsed,
+        ),
+    )
+
+
+def dump_header(header: SamplesHeader) -> bytes:
+    label = header.label.encode()
+    return (
+        HEADER.pack(MAGIC, VERSION, header.cores, header.interval_secs, len(label))
+        + label
+    )
+
+
+def load_samples(data: bytes) -> tuple[SamplesHeader, list[ResourceSample]]:
+    magic, version, cores, interval_secs, label_length = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a runner resources samples file")
+
+    offset = HEADER.size + label_length
+    header = SamplesHeader(
+        cores,
+        interval_secs,
+        data[HEADER.size : offset].decode(),
+    )
+    # A sample may have been partially written if the sampler was killed
+    samples_length = (len(data) - offset) // SAMPLE.size * SAMPLE.size
+    return header, [
+        ResourceSample(*values)
+        for values in SAMPLE.iter_unpack(data[offset : offset + samples_length])
+    ]
+
+
+def sample_resources(
+    output: typing.BinaryIO,
+    header: SamplesHeader,
+    stop: threading.Event,
+) -> int:
+    """
+    Writes a sample to `output` every `interval_secs` of `header` until
+    `stop` is set, and returns the number of samples written. Each sample is
+    flushed right away, the sampler being killed along with the job.
+    """
+    output.write(dump_header(header))
+    output.flush()
+
+    disks_names = get_disks_names()
+    previous = read_counters(disks_names)
+    nb_samples = 0
+    while not stop.wait(header.interval_secs):
+        current = read_counters(disks_names)
+        output.write(
+            SAMPLE.pack(
+                *get_sample(previous, current, read_memory_percent(), read_load_1m()),
+            ),
+        )
+        output.flush()
+        previous = current
+        nb_samples += 1
+
+    return nb_samples
+
+
+def get_mean(values: abc.Iterable[float]) -> float:
+    # The values not available on the runner are NaN
+    known_values = [v for v in values if v == v]
+    return statistics.fmean(known_values) if known_values else float("nan")
+
+
+def get_max(values: abc.Iterable[float]) -> float:
+    known_values = [v for v in values if v == v]
+    return max(known_values) if known_values else float("nan")
+
+
+def get_steps_resources_summaries(
+    header: SamplesHeader,
+    samples: list[ResourceSample],
+    steps_intervals: abc.Iterable[tuple[str, float, float]],
+) -> list[StepResourcesSummary]:
+    """
+    Returns the summary of the `samples` taken during each step, given
+    along with its start and end as POSIX timestamps. The steps with the
+    same name, e.g. the steps of the same group, are summarised together.
+    """
+    samples_per_step: dict[str, list[ResourceSample]] = {}
+    for step_name, started_at, completed_at in steps_intervals:
+        samples_per_step.setdefault(step_name, []).extend(
+            s for s in samples if started_at <= s.timestamp <= completed_at
+        )
+
+    return [
+        StepResourcesSummary(
+            job_name=header.label,
+            step_name=step_name,
+            samples=len(step_samples),
+            cpu_mean_percent=get_mean(s.cpu_percent for s in step_samples),
+            cpu_max_percent=get_max(s.cpu_percent for s in step_samples),
+            memory_max_percent=get_max(s.memory_percent for s in step_samples),
+            load_per_core_mean=get_mean(s.load_1m for s in step_samples)
+            / max(header.cores, 1),
+            disk_read_mean_bytes_per_sec=get_mean(
+                s.disk_read_bytes_per_sec for s in step_samples
+            ),
+            disk_write_mean_bytes_per_sec=get_mean(
+                s.disk_write_bytes_per_sec for s in step_samples
+            ),
+        )
+        for step_name, step_samples in samples_per_step.items()
+        if step_samples
+    ]
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Sample the resources of the runner until terminated",
+    )
+    parser.add_argument(
+        "--output",
+        type=pathlib.Path,
+        required=True,
+        metavar="FILE",
+        help="Binary file the samples are written to.",
+    )
+    parser.add_argument(
+        "--label",
+        required=True,
+        help="Name of the job being sampled, used to match the samples with its steps.",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=constants.RESOURCE_SAMPLER_INTERVAL_SECONDS,
+        help="Seconds between two samples.",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = get_parser().parse_args(argv)
+
+    stop = threading.Event()
+
+    def handle_signal(_signum: int, _frame: types.FrameType | None) -> None:
+        stop.set()
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+
+    with open(args.output, "wb") as f:
+        sample_resources(
+            f,
+            SamplesHeader(os.cpu_count() or 0, args.interval, args.label),
+            stop,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
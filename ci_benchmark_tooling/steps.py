@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import re
+import typing
+
+from ci_benchmark_tooling import constants
+from ci_benchmark_tooling import yaml_cache
+
+
+if typing.TYPE_CHECKING:
+    import datetime
+
+
+# Name of the top-level `env` variable of a benchmark workflow holding the
+# groups of steps of its detailed report
+STEPS_GROUPS_ENV_VARIABLE = "BENCHMARK_STEPS_GROUPS"
+
+
+# The steps that don't run the benchmarked application build: the setup of
+# the runner by the ci provider, and the time waited before it
+NON_BUILD_STEPS = (
+    *constants.GITHUB_JOB_STEPS,
+    *constants.CIRCLECI_JOB_STEPS,
+    constants.CSV_QUEUE_TIME_STEP_NAME,
+)
+
+
+def is_build_step(step_name: str) -> bool:
+    """
+    Returns whether the rows of `step_name` measure the benchmarked
+    application build, and can thus be compared between runners.
+    """
+    return step_name not in NON_BUILD_STEPS
+
+
+def is_benchmark_step(step_name: str) -> bool:
+    # Ignore the `Clone` of the repo we are benchmarking, and the steps of
+    # the runner resources sampler, since they are not relevant to the
+    # benchmark itself
+    return not step_name.startswith(
+        ("Clone ", constants.RESOURCE_SAMPLER_STEPS_PREFIX),
+    )
+
+
+class StepGroup(typing.NamedTuple):
+    name: str
+    pattern: re.Pattern[str]
+
+
+class StepsGrouping(typing.NamedTuple):
+    """
+    Keep every step of the jobs with a millisecond precision, instead of
+    collapsing all the steps of the benchmarked application build in
+    `CSV_BENCHMARKED_APPLICATION_STEP_NAME` with a second precision.
+
+    The steps whose name matches the pattern of one of the groups of their
+    tested repository are put together under the name of the first one
+    matching, the other steps keep their own name.
+    """
+
+    groups_per_repository: dict[str, list[StepGroup]]
+
+
+def get_steps_groups_from_yaml_string(yml_string: str) -> list[StepGroup]:
+    """
+    Returns the groups of steps from their YAML definition, a mapping of each
+    group name to the regex matching the name of its steps.
+    """
+    groups = yaml_cache.load(yml_string) or {}
+    return [
+        StepGroup(str(name), re.compile(str(pattern)))
+        for name, pattern in groups.items()
+    ]
+
+
+def get_step_name(
+    step_name: str,
+    tested_repository: str,
+    setup_steps: tuple[str, ...],
+    steps_grouping: StepsGrouping | None,
+) -> str:
+    if step_name in setup_steps:
+        return step_name
+
+    if steps_grouping is None:
+        return constants.CSV_BENCHMARKED_APPLICATION_STEP_NAME
+
+    for group in steps_grouping.groups_per_repository.get(tested_repository, []):
+        if group.pattern.search(step_name):
+            return group.name
+
+    return step_name
+
+
+def get_time_spent_in_secs(
+    time_spent: datetime.timedelta,
+    steps_grouping: StepsGrouping | None,
+) -> int | float:
+    if steps_grouping is None:
+        return int(time_spent.total_seconds())
+
+    return round(time_spent.total_seconds(), 3)
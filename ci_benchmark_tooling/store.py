@@ -0,0 +1,353 @@
+from __future__ import annotations
+
+import array
+import collections
+import json
+import typing
+
+import numpy as np
+
+from ci_benchmark_tooling import types
+
+
+if typing.TYPE_CHECKING:
+    from collections import abc
+    import pathlib
+
+    import numpy.typing as npt
+
+
+T = typing.TypeVar("T", bound=np.generic)
+
+
+STRING_COLUMNS = (
+    "ci_provider",
+    "runner_os",
+    "runner_type",
+    "tested_repository",
+    "step_name",
+    "additional_infos",
+    "commit_sha",
+    "workflow_id",
+)
+INTEGER_COLUMNS = (
+    "runner_cores",
+    "time_spent_in_secs",
+    "run_timestamp",
+)
+# The times of different steps, including the queue time, are never summed
+DEFAULT_GROUP_BY = (
+    "ci_provider",
+    "runner_os",
+    "runner_type",
+    "runner_cores",
+    "step_name",
+)
+
+# Strings are dictionary-encoded as unsigned 32 bits codes
+STRING_CODE_TYPECODE = "I"
+INTEGER_TYPECODE = "q"
+
+
+class StoreMetadata(typing.TypedDict):
+    rows: int
+    dictionaries: dict[str, list[str]]
+
+
+class AggregatedTimes(typing.NamedTuple):
+    group: tuple[str | int, ...]
+    samples: int
+    mean: float
+    median: float
+    p95: float
+
+
+class RunTime(typing.NamedTuple):
+    run_timestamp: int
+    workflow_id: str
+    time_spent_in_secs: int
+
+
+def get_percentile(sorted_values: abc.Sequence[float], percentile: float) -> float:
+    """
+    Returns the `percentile` (between 0 and 100) of `sorted_values`,
+    linearly interpolated between the closest ranks.
+    """
+    position = (len(sorted_values) - 1) * percentile / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (
+        position - lower
+    )
+
+
+def get_groups(
+    keys_columns: abc.Sequence[npt.NDArray[typing.Any]],
+    values: npt.NDArray[T],
+) -> list[tuple[tuple[int, ...], npt.NDArray[T]]]:
+    """
+    Returns the `values` of each distinct key of `keys_columns`, the integer
+    columns the rows are grouped by, in the order each key first appears.
+    """
+    if not len(values):
+        return []
+
+    keys = np.stack([column.astype(np.int64) for column in keys_columns], axis=1)
+    unique_keys, first_indexes, inverse = np.unique(
+        keys,
+        axis=0,
+        return_index=True,
+        return_inverse=True,
+    )
+    inverse = inverse.ravel()
+    # The values of each group, in their order in the rows
+    groups_values = np.split(
+        values[np.argsort(inverse, kind="stable")],
+        np.cumsum(np.bincount(inverse, minlength=len(unique_keys)))[:-1],
+    )
+
+    return [
+        (tuple(int(value) for value in unique_keys[group]), groups_values[group])
+        for group in np.argsort(first_indexes, kind="stable")
+    ]
+
+
+class BenchmarkStore:
+    """
+    Append-only columnar store of `types.BenchmarkRecord`.
+
+    Each column lives in its own file: integers as int64 arrays, strings
+    dictionary-encoded as arrays of codes. The dictionaries and the number of
+    committed rows are kept in `metadata.json`, written last, so a crash in
+    the middle of an append never exposes partial rows.
+    """
+
+    def __init__(self, directory: pathlib.Path) -> None:
+        self.directory = directory
+        self._metadata: StoreMetadata | None = None
+
+    @property
+    def metadata(self) -> StoreMetadata:
+        if self._metadata is None:
+            metadata_file = self.directory / "metadata.json"
+            if metadata_file.exists():
+                with open(metadata_file) as f:
+                    self._metadata = typing.cast(StoreMetadata, json.load(f))
+            else:
+                self._metadata = {
+                    "rows": 0,
+                    "dictionaries": {column: [] for column in STRING_COLUMNS},
+                }
+
+        return self._metadata
+
+    def _save_metadata(self) -> None:
+        tmp_path = self.directory / "metadata.json.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.metadata, f)
+
+        tmp_path.replace(self.directory / "metadata.json")
+
+    def __len__(self) -> int:
+        return self.metadata["rows"]
+
+    @staticmethod
+    def _get_typecode(column: str) -> str:
+        if column in STRING_COLUMNS:
+            return STRING_CODE_TYPECODE
+        if column in INTEGER_COLUMNS:
+            return INTEGER_TYPECODE
+
+        raise ValueError(f"Unknown column `{column}`")
+
+    def _get_column_path(self, column: str) -> pathlib.Path:
+        return self.directory / f"{column}.bin"
+
+    def read_column(self, column: str) -> array.array[int]:
+        """
+        Returns the raw values of `column`, which are codes of
+        `self.metadata["dictionaries"][column]` for string columns.
+        """
+        values = array.array(self._get_typecode(column))
+        path = self._get_column_path(column)
+        if path.exists():
+            with open(path, "rb") as f:
+                values.fromfile(f, len(self))
+
+        return values
+
+    def read_column_array(self, column: str) -> npt.NDArray[typing.Any]:
+        """
+        Returns the raw values of `column` as a NumPy array, without copying them.
+        """
+        values = self.read_column(column)
+        return np.frombuffer(values, dtype=values.typecode)
+
+    def get_workflows_ids(self) -> set[str]:
+        # Values only get into the dictionaries when rows are appended,
+        # so the dictionary is the set of stored workflows ids.
+        return set(self.metadata["dictionaries"]["workflow_id"])
+
+    def append(self, records: abc.Iterable[types.BenchmarkRecord]) -> int:
+        """
+        Append the `records` of the workflows that are not in the store yet.
+        Returns the number of records appended.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        stored_workflows_ids = self.get_workflows_ids()
+        new_records = [r for r in records if r.workflow_id not in stored_workflows_ids]
+        if not new_records:
+            return 0
+
+        dictionaries = self.metadata["dictionaries"]
+        for column in STRING_COLUMNS + INTEGER_COLUMNS:
+            if column in STRING_COLUMNS:
+                dictionary = dictionaries[column]
+                codes = {value: code for code, value in enumerate(dictionary)}
+                values = array.array(STRING_CODE_TYPECODE)
+                for r in new_records:
+                    value = getattr(r, column)
+                    if value not in codes:
+                        codes[value] = len(dictionary)
+                        dictionary.append(value)
+                    values.append(codes[value])
+            else:
+                values = array.array(
+                    INTEGER_TYPECODE,
+                    (getattr(r, column) for r in new_records),
+                )
+
+            path = self._get_column_path(column)
+            with open(path, "ab") as f:
+                # Drop any leftover of a previous append that was not committed
+                f.truncate(len(self) * values.itemsize)
+                values.tofile(f)
+
+        self.metadata["rows"] += len(new_records)
+        self._save_metadata()
+        return len(new_records)
+
+    def _decode(self, column: str, value: int) -> str | int:
+        if column in STRING_COLUMNS:
+            return self.metadata["dictionaries"][column][value]
+        return value
+
+    def aggregate(
+        self,
+        group_by: abc.Sequence[str] = DEFAULT_GROUP_BY,
+        filters: abc.Mapping[str, str | int] | None = None,
+    ) -> list[AggregatedTimes]:
+        """
+        Returns the number of samples, mean, median and p95 of `time_spent_in_secs` for each
+        group of `group_by` columns, of the rows matching every `filters`.
+        """
+        mask = np.ones(len(self), dtype=np.bool_)
+        for column, filter_value in (filters or {}).items():
+            if column in STRING_COLUMNS:
+                dictionary = self.metadata["dictionaries"][column]
+                if filter_value not in dictionary:
+                    return []
+                filter_value = dictionary.index(str(filter_value))
+            else:
+                filter_value = int(filter_value)
+
+            mask &= self.read_column_array(column) == filter_value
+
+        results = []
+        for key, group_times in get_groups(
+            [self.read_column_array(column)[mask] for column in group_by],
+            self.read_column_array("time_spent_in_secs")[mask],
+        ):
+            sorted_times = np.sort(group_times).tolist()
+            results.append(
+                AggregatedTimes(
+                    group=tuple(
+                        self._decode(column, value)
+                        for column, value in zip(group_by, key, strict=True)
+                    ),
+                    samples=len(sorted_times),
+                    mean=float(np.mean(group_times)),
+                    median=get_percentile(sorted_times, 50),
+                    p95=get_percentile(sorted_times, 95),
+                ),
+            )
+
+        return sorted(results)
+
+    def get_runs_times(
+        self,
+        group_by: abc.Sequence[str],
+    ) -> dict[tuple[str | int, ...], list[RunTime]]:
+        """
+        Returns the time spent in each group of `group_by` columns by each
+        workflow run, from the oldest run to the latest.
+        """
+        if not len(self):
+            return {}
+
+        keys = np.stack(
+            [
+                self.read_column_array(column).astype(np.int64)
+                for column in (*group_by, "run_timestamp", "workflow_id")
+            ],
+            axis=1,
+        )
+        runs_keys, first_indexes, inverse = np.unique(
+            keys,
+            axis=0,
+            return_index=True,
+            return_inverse=True,
+        )
+        runs_times = np.bincount(
+            inverse.ravel(),
+            weights=self.read_column_array("time_spent_in_secs"),
+            minlength=len(runs_keys),
+        ).astype(np.int64)
+        # From the oldest run to the latest, then in the order of the rows
+        runs_order = np.lexsort((first_indexes, runs_keys[:, len(group_by)]))
+
+        times_per_group: dict[
+            tuple[str | int, ...],
+            list[RunTime],
+        ] = collections.defaultdict(list)
+        for run_key, time_spent in zip(
+            runs_keys[runs_order].tolist(),
+            runs_times[runs_order].tolist(),
+            strict=True,
+        ):
+            *key, run_timestamp, workflow_id = run_key
+            group = tuple(
+                self._decode(column, value)
+                for column, value in zip(group_by, key, strict=True)
+            )
+            times_per_group[group].append(
+                RunTime(
+                    run_timestamp,
+                    str(self._decode("workflow_id", workflow_id)),
+                    time_spent,
+                ),
+            )
+
+        return times_per_group
+
+
+def get_benchmark_records(
+    workflows_data: abc.Iterable[types.WorkflowRunData],
+) -> abc.Iterator[types.BenchmarkRecord]:
+    for workflow_data in workflows_data:
+        for line in workflow_data.csv_data:
+            yield types.BenchmarkRecord(
+                ci_provider=line.ci_provider,
+                runner_os=line.runner_os,
+                runner_type=line.runner_type,
+                runner_cores=line.runner_cores,
+                tested_repository=line.tested_repository,
+                step_name=line.step_name,
+                # The store keeps whole seconds, even for the detailed steps
+                time_spent_in_secs=int(line.time_spent_in_secs),
+                additional_infos=line.additional_infos,
+                run_timestamp=int(workflow_data.created_at.timestamp()),
+                commit_sha=workflow_data.commit_sha,
+                workflow_id=workflow_data.workflow_id,
+            )
@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import threading
+import time
+import typing
+
+import daiquiri
+import httpx
+
+from ci_benchmark_tooling import constants
+from ci_benchmark_tooling import store
+
+
+LOG = daiquiri.getLogger(__name__)
+
+
+def get_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=constants.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=constants.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=constants.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+    )
+
+
+class ConnectionTiming(typing.NamedTuple):
+    api: str
+    http_version: str
+    # `None` when the request reused a connection of the pool
+    connect_secs: float | None
+    tls_secs: float | None
+    # From sending the request headers to receiving the response headers,
+    # the time the api took to answer plus a round trip
+    ttfb_secs: float | None
+    # Until the whole response body was received
+    total_secs: float
+
+
+class RequestTracer:
+    """
+    Callback of the httpcore `trace` extension of a single request, keeping
+    the time at which each step of the request started and completed.
+    """
+
+    def __init__(self) -> None:
+        self.created_at = time.perf_counter()
+        self.events: dict[str, float] = {}
+
+    def __call__(self, name: str, _info: dict[str, typing.Any]) -> None:
+        # The name is prefixed with the httpcore module sending the event,
+        # e.g. "connection.connect_tcp.started" or "http2.send_request_headers.started"
+        _module, _, event = name.partition(".")
+        self.events[event] = time.perf_counter()
+
+    def get_duration(self, step: str) -> float | None:
+        started_at = self.events.get(f"{step}.started")
+        completed_at = self.events.get(f"{step}.complete")
+        if started_at is None or completed_at is None:
+            return None
+        return completed_at - started_at
+
+    def get_timing(self, response: httpx.Response) -> ConnectionTiming:
+        ttfb_secs = None
+        headers_sent_at = self.events.get("send_request_headers.started")
+        headers_received_at = self.events.get("receive_response_headers.complete")
+        if headers_sent_at is not None and headers_received_at is not None:
+            ttfb_secs = headers_received_at - headers_sent_at
+
+        return ConnectionTiming(
+            api=response.request.url.host,
+            http_version=response.http_version,
+            connect_secs=self.get_duration("connect_tcp"),
+            tls_secs=self.get_duration("start_tls"),
+            ttfb_secs=ttfb_secs,
+            total_secs=time.perf_counter() - self.created_at,
+        )
+
+
+class AsyncRequestTracer(RequestTracer):
+    # The asynchronous transports only accept coroutine callbacks
+    async def __call__(  # type: ignore[override]
+        self,
+        name: str,
+        info: dict[str, typing.Any],
+    ) -> None:
+        super().__call__(name, info)
+
+
+class ConnectionTimingsSummary(typing.NamedTuple):
+    api: str
+    requests: int
+    new_connections: int
+    connect_p50_secs: float | None
+    tls_p50_secs: float | None
+    ttfb_p50_secs: float | None
+    ttfb_p95_secs: float | None
+    total_p50_secs: float | None
+    total_p95_secs: float | None
+
+
+CONNECTION_TIMINGS: dict[str, list[ConnectionTiming]] = collections.defaultdict(list)
+CONNECTION_TIMINGS_LOCK = threading.Lock()
+
+
+def record_connection_timing(timing: ConnectionTiming) -> None:
+    LOG.debug(
+        "Connection timing of a request to %s",
+        timing.api,
+        http_version=timing.http_version,
+        connect_secs=timing.connect_secs,
+        tls_secs=timing.tls_secs,
+        ttfb_secs=timing.ttfb_secs,
+        total_secs=timing.total_secs,
+    )
+    with CONNECTION_TIMINGS_LOCK:
+        CONNECTION_TIMINGS[timing.api].append(timing)
+
+
+def get_percentile_or_none(values: list[float], percentile: float) -> float | None:
+    if not values:
+        return None
+    return round(store.get_percentile(sorted(values), percentile), 3)
+
+
+def get_connection_timings_summaries() -> list[ConnectionTimingsSummary]:
+    with CONNECTION_TIMINGS_LOCK:
+        timings_per_api = {api: list(t) for api, t in CONNECTION_TIMINGS.items()}
+
+    summaries = []
+    for api, timings in timings_per_api.items():
+        connects = [t.connect_secs for t in timings if t.connect_secs is not None]
+        tls = [t.tls_secs for t in timings if t.tls_secs is not None]
+        ttfbs = [t.ttfb_secs for t in timings if t.ttfb_secs is not None]
+        totals = [t.total_secs for t in timings]
+        summaries.append(
+            ConnectionTimingsSummary(
+                api=api,
+                requests=len(timings),
+                new_connections=len(connects),
+                connect_p50_secs=get_percentile_or_none(connects, 50),
+                tls_p50_secs=get_percentile_or_none(tls, 50),
+                ttfb_p50_secs=get_percentile_or_none(ttfbs, 50),
+                ttfb_p95_secs=get_percentile_or_none(ttfbs, 95),
+                total_p50_secs=get_percentile_or_none(totals, 50),
+                total_p95_secs=get_percentile_or_none(totals, 95),
+            ),
+        )
+    return summaries
+
+
+def log_connection_timings() -> None:
+    for summary in get_connection_timings_summaries():
+        LOG.info(
+            "Connection timings of %s: %d requests over %d new connections",
+            summary.api,
+            summary.requests,
+            summary.new_connections,
+            connect_p50_secs=summary.connect_p50_secs,
+            tls_p50_secs=summary.tls_p50_secs,
+            ttfb_p50_secs=summary.ttfb_p50_secs,
+            ttfb_p95_secs=summary.ttfb_p95_secs,
+            total_p50_secs=summary.total_p50_secs,
+            total_p95_secs=summary.total_p95_secs,
+        )
+
+
+class SharedTransport(httpx.HTTPTransport):
+    """
+    HTTP/2 transport whose connection pool is shared by every synchronous
+    client of the process (see `get_transport`), whatever the api and the
+    version of its endpoints, the connections being pooled per host.
+
+    Each client closing it releases it, the pool is only closed once the
+    last one was closed.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(http2=True, limits=get_limits())
+        self.users = 0
+
+    def close(self) -> None:
+        with SHARED_TRANSPORT_LOCK:
+            self.users -= 1
+            if self.users > 0:
+                return
+
+            global SHARED_TRANSPORT
+            if SHARED_TRANSPORT is self:
+                SHARED_TRANSPORT = None
+        super().close()
+
+    def __exit__(self, *exc_info: typing.Any) -> None:
+        self.close()
+
+
+class AsyncSharedTransport(httpx.AsyncHTTPTransport):
+    """
+    Asynchronous counterpart of `SharedTransport`, shared by the asynchronous
+    clients of an event loop, whose connections can't be used by another one.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop | None) -> None:
+        super().__init__(http2=True, limits=get_limits())
+        self.loop = loop
+        self.users = 0
+
+    async def aclose(self) -> None:
+        self.users -= 1
+        if self.users > 0:
+            return
+
+        if self.loop is not None and ASYNC_SHARED_TRANSPORTS.get(self.loop) is self:
+            del ASYNC_SHARED_TRANSPORTS[self.loop]
+        await super().aclose()
+
+    async def __aexit__(self, *exc_info: typing.Any) -> None:
+        await self.aclose()
+
+
+SHARED_TRANSPORT: SharedTransport | None = None
+SHARED_TRANSPORT_LOCK = threading.Lock()
+ASYNC_SHARED_TRANSPORTS: dict[asyncio.AbstractEventLoop, AsyncSharedTransport] = {}
+
+
+def get_transport() -> SharedTransport:
+    """
+    Returns the transport shared by the synchronous clients, which must close
+    it once done with it.
+    """
+    global SHARED_TRANSPORT
+    with SHARED_TRANSPORT_LOCK:
+        if SHARED_TRANSPORT is None:
+            SHARED_TRANSPORT = SharedTransport()
+        SHARED_TRANSPORT.users += 1
+        return SHARED_TRANSPORT
+
+
+def get_async_transport() -> AsyncSharedTransport:
+    """
+    Returns the transport shared by the asynchronous clients of the running
+    event loop, which must close it once done with it.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # No event loop to share the transport with yet
+        transport = AsyncSharedTransport(None)
+    else:
+        if loop not in ASYNC_SHARED_TRANSPORTS:
+            ASYNC_SHARED_TRANSPORTS[loop] = AsyncSharedTransport(loop)
+        transport = ASYNC_SHARED_TRANSPORTS[loop]
+
+    transport.users += 1
+    return transport
@@ -4,6 +4,9 @@ import typing
 
 
 if typing.TYPE_CHECKING:
+    import datetime
+    import re
+
     from ci_benchmark_tooling.clients import base as base_clients
 
 
@@ -16,6 +19,43 @@ class GitHubJobNameInfos(typing.NamedTuple):
 
 
 class CsvDataLine(typing.NamedTuple):
+    ci_provider: str
+    runner_os: str
+    runner_type: str
+    runner_cores: int
+    tested_repository: str
+    step_name: str
+    # Whole seconds, with a millisecond precision in the detailed steps
+    # reports (see `steps.StepsGrouping`)
+    time_spent_in_secs: int | float
+    additional_infos: str
+
+
+class WorkflowJob(typing.NamedTuple):
+    name: str
+    # `None` for the jobs that did not run
+    started_at: datetime.datetime | None
+    stopped_at: datetime.datetime | None
+    # Names of the jobs of the same workflow run this job waits for
+    dependencies: tuple[str, ...]
+
+
+class WorkflowRunData(typing.NamedTuple):
+    workflow_id: str
+    created_at: datetime.datetime
+    commit_sha: str
+    csv_data: list[CsvDataLine]
+    ci_provider: str
+    workflow_name: str
+    jobs: list[WorkflowJob]
+
+
+class BenchmarkRecord(typing.NamedTuple):
+    """
+    A `CsvDataLine` along with infos about the workflow run it comes from,
+    as kept in the historical benchmark store.
+    """
+
     ci_provider: str
     runner_os: str
     runner_type: str
@@ -24,10 +64,15 @@ class CsvDataLine(typing.NamedTuple):
     step_name: str
     time_spent_in_secs: int
     additional_infos: str
+    # Creation date of the workflow run as a POSIX timestamp
+    run_timestamp: int
+    commit_sha: str
+    workflow_id: str
 
 
 class CiToBenchmark(typing.TypedDict):
     client: type[base_clients.BaseClient]
+    async_client: type[base_clients.AsyncBaseClient]
     token_env_variable: str
     workflow_ids_env_variable_prefix: str
 
@@ -35,3 +80,36 @@ class CiToBenchmark(typing.TypedDict):
 class GitHubBenchmarkFileWithNameSection(typing.NamedTuple):
     filename: str
     yaml_name_section_value: str
+
+
+class GitHubJobNeeds(typing.NamedTuple):
+    job_id: str
+    # Matches the names of the runs of the job, one per combination of its matrix
+    name_pattern: re.Pattern[str]
+    needs: tuple[str, ...]
+
+
+class BenchmarkWorkflowRun(typing.NamedTuple):
+    workflow_id: str
+    # The date the listing of the runs is filtered on, so the high water mark
+    # of the incremental mode never skips a run: the creation of the pipeline
+    # of the workflow for CircleCI
+    created_at: datetime.datetime
+    finished: bool
+
+
+class JobDurationTrend(typing.NamedTuple):
+    """
+    Duration of the jobs of a runner configuration over all their runs of a
+    reporting window, as pre-aggregated by the ci provider.
+    """
+
+    ci_provider: str
+    runner_os: str
+    runner_type: str
+    # 0 when the ci provider doesn't tell it
+    runner_cores: int
+    tested_repository: str
+    runs: int
+    median_secs: float
+    p95_secs: float
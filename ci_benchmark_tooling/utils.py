@@ -2,14 +2,16 @@ from __future__ import annotations
 
 import os
 import pathlib
+import re
 import sys
 import typing
 
 import daiquiri
-import yaml
 
 from ci_benchmark_tooling import constants
+from ci_benchmark_tooling import steps
 from ci_benchmark_tooling import types
+from ci_benchmark_tooling import yaml_cache
 from ci_benchmark_tooling.clients import circleci as cci_client
 from ci_benchmark_tooling.clients import github as gh_client
 
@@ -25,15 +27,19 @@ DOT_GITHUB_WORKFLOWS_FOLDER = (
 )
 DOT_CIRCLECI_FOLDER = pathlib.Path(os.path.dirname(__file__)) / ".." / ".circleci"
 
+RE_GITHUB_EXPRESSION = re.compile(r"\$\{\{.*?\}\}")
+
 
 CIS_TO_BENCHMARK: list[types.CiToBenchmark] = [
     {
         "client": gh_client.GitHubClient,
+        "async_client": gh_client.AsyncGitHubClient,
         "token_env_variable": "GH_TOKEN",
         "workflow_ids_env_variable_prefix": constants.GITHUB_WORKFLOW_IDS_ENV_PREFIX,
     },
     {
         "client": cci_client.CircleCiClient,
+        "async_client": cci_client.AsyncCircleCiClient,
         "token_env_variable": "CIRCLE_TOKEN",
         "workflow_ids_env_variable_prefix": constants.CIRCLECI_WORKFLOW_IDS_ENV_PREFIX,
     },
@@ -71,10 +77,90 @@ def get_github_benchmark_filenames_and_yaml_name_section() -> (
     abc.Iterator[types.GitHubBenchmarkFileWithNameSection]
 ):
     for benchmark_file in DOT_GITHUB_WORKFLOWS_FOLDER.glob("benchmark_*.yml"):
-        with open(benchmark_file) as f:
-            yaml_data = yaml.safe_load(f.read())
-
+        yaml_data = yaml_cache.load_file(benchmark_file)
         yield types.GitHubBenchmarkFileWithNameSection(
             filename=benchmark_file.name,
             yaml_name_section_value=yaml_data["name"],
         )
+
+
+def get_benchmark_steps_groups() -> dict[str, list[steps.StepGroup]]:
+    """
+    Returns the groups of steps of the detailed report defined in each
+    benchmark workflow, per tested repository.
+    """
+    groups_per_repository = {}
+    for benchmark_file in DOT_GITHUB_WORKFLOWS_FOLDER.glob("benchmark_*.yml"):
+        yaml_data = yaml_cache.load_file(benchmark_file)
+        steps_groups = yaml_data.get("env", {}).get(steps.STEPS_GROUPS_ENV_VARIABLE)
+        if steps_groups is None:
+            continue
+
+        tested_repository = yaml_data["name"].removeprefix("Benchmark ")
+        groups_per_repository[
+            tested_repository
+        ] = steps.get_steps_groups_from_yaml_string(steps_groups)
+
+    return groups_per_repository
+
+
+def get_github_job_name_pattern(
+    job_id: str,
+    job: dict[str, typing.Any],
+) -> re.Pattern[str]:
+    """
+    Returns the regex matching the names GitHub gives to the runs of the job
+    `job_id`, where each `${{ }}` expression of its `name` can be anything.
+    """
+    if "name" not in job:
+        # Without a name, the runs of a matrix are named `<job_id> (<values>)`
+        return re.compile(rf"{re.escape(job_id)}( \(.*\))?")
+
+    return re.compile(
+        ".+?".join(
+            re.escape(part) for part in RE_GITHUB_EXPRESSION.split(str(job["name"]))
+        ),
+    )
+
+
+def get_github_jobs_needs(yaml_data: typing.Any) -> list[types.GitHubJobNeeds]:
+    jobs_needs = []
+    for job_id, job in yaml_data["jobs"].items():
+        needs = job.get("needs", [])
+        if isinstance(needs, str):
+            needs = [needs]
+
+        jobs_needs.append(
+            types.GitHubJobNeeds(
+                job_id=job_id,
+                name_pattern=get_github_job_name_pattern(job_id, job),
+                needs=tuple(needs),
+            ),
+        )
+
+    return jobs_needs
+
+
+def get_github_benchmark_jobs_needs() -> dict[str, list[types.GitHubJobNeeds]]:
+    """
+    Returns the `needs` of the jobs of each benchmark workflow, per workflow name.
+    """
+    return {
+        yaml_cache.load_file(benchmark_file)["name"]: yaml_cache.get_file_index(
+            benchmark_file,
+            get_github_jobs_needs,
+        )
+        for benchmark_file in DOT_GITHUB_WORKFLOWS_FOLDER.glob("benchmark_*.yml")
+    }
+
+
+def get_circleci_config() -> typing.Any:
+    return yaml_cache.load_file(DOT_CIRCLECI_FOLDER / "config.yml")
+
+
+def get_circleci_benchmark_workflows_names() -> list[str]:
+    return [
+        workflow_name
+        for workflow_name in get_circleci_config()["workflows"]
+        if workflow_name.startswith("Benchmark ")
+    ]
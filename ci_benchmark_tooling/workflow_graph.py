@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import collections
+import graphlib
+import typing
+
+import daiquiri
+
+
+if typing.TYPE_CHECKING:
+    from collections import abc
+
+    from ci_benchmark_tooling import types
+
+
+LOG = daiquiri.getLogger(__name__)
+
+
+class WorkflowGraphAnalysis(typing.NamedTuple):
+    ci_provider: str
+    workflow_name: str
+    workflow_id: str
+    jobs: int
+    # From the creation of the workflow run to the end of its last job,
+    # the time to green
+    wall_clock_secs: float
+    # Longest chain of dependent jobs, weighted by the time each job ran
+    critical_path: tuple[str, ...]
+    critical_path_secs: float
+    # Sum of the time each job ran
+    jobs_secs: float
+    # From the start of the first job to the end of the last one
+    running_secs: float
+
+    @property
+    def parallelism(self) -> float:
+        """
+        Mean number of jobs running at the same time while the workflow run
+        was running.
+        """
+        if self.running_secs <= 0:
+            return 0.0
+        return self.jobs_secs / self.running_secs
+
+
+def get_job_duration_secs(job: types.WorkflowJob) -> float:
+    if job.started_at is None or job.stopped_at is None:
+        return 0.0
+    return max((job.stopped_at - job.started_at).total_seconds(), 0.0)
+
+
+def get_critical_path(
+    jobs: abc.Iterable[types.WorkflowJob],
+) -> tuple[tuple[str, ...], float]:
+    """
+    Returns the longest path of the graph of `jobs` and their dependencies,
+    weighted by the time each job ran, and its duration.
+
+    Raises `graphlib.CycleError` if the jobs depend on each other.
+    """
+    jobs_per_name = {job.name: job for job in jobs}
+    graph = {
+        name: [d for d in job.dependencies if d in jobs_per_name]
+        for name, job in jobs_per_name.items()
+    }
+
+    # Duration of the longest path ending with each job, and the job before
+    # it on this path
+    path_secs: dict[str, float] = {}
+    previous_job: dict[str, str | None] = {}
+    for name in graphlib.TopologicalSorter(graph).static_order():
+        longest_dependency = max(
+            graph[name],
+            key=lambda d: path_secs[d],
+            default=None,
+        )
+        previous_job[name] = longest_dependency
+        path_secs[name] = get_job_duration_secs(jobs_per_name[name]) + (
+            0.0 if longest_dependency is None else path_secs[longest_dependency]
+        )
+
+    if not path_secs:
+        return (), 0.0
+
+    last_job: str | None = max(path_secs, key=lambda name: path_secs[name])
+    critical_path_secs = path_secs[typing.cast(str, last_job)]
+    critical_path = []
+    while last_job is not None:
+        critical_path.append(last_job)
+        last_job = previous_job[last_job]
+
+    return tuple(reversed(critical_path)), critical_path_secs
+
+
+def get_workflow_graph_analysis(
+    workflow_data: types.WorkflowRunData,
+) -> WorkflowGraphAnalysis:
+    critical_path, critical_path_secs = get_critical_path(workflow_data.jobs)
+
+    started_dates = [j.started_at for j in workflow_data.jobs if j.started_at]
+    stopped_dates = [j.stopped_at for j in workflow_data.jobs if j.stopped_at]
+
+    wall_clock_secs = running_secs = 0.0
+    if stopped_dates:
+        wall_clock_secs = (
+            max(stopped_dates) - workflow_data.created_at
+        ).total_seconds()
+    if started_dates and stopped_dates:
+        running_secs = (max(stopped_dates) - min(started_dates)).total_seconds()
+
+    return WorkflowGraphAnalysis(
+        ci_provider=workflow_data.ci_provider,
+        workflow_name=workflow_data.workflow_name,
+        workflow_id=workflow_data.workflow_id,
+        jobs=len(workflow_data.jobs),
+        wall_clock_secs=wall_clock_secs,
+        critical_path=critical_path,
+        critical_path_secs=critical_path_secs,
+        jobs_secs=sum(get_job_duration_secs(j) for j in workflow_data.jobs),
+        running_secs=running_secs,
+    )
+
+
+def get_workflows_graph_analyses(
+    workflows_data: abc.Iterable[types.WorkflowRunData],
+) -> list[WorkflowGraphAnalysis]:
+    analyses = []
+    for workflow_data in workflows_data:
+        try:
+            analyses.append(get_workflow_graph_analysis(workflow_data))
+        except graphlib.CycleError:
+            LOG.warning(
+                "The jobs of the workflow run %s depend on each other, skipping it",
+                workflow_data.workflow_id,
+                ci_provider=workflow_data.ci_provider,
+            )
+    return analyses
+
+
+def get_providers_parallelism(
+    analyses: abc.Iterable[WorkflowGraphAnalysis],
+) -> dict[str, float]:
+    """
+    Returns the parallelism each ci provider achieved over all its workflow runs.
+    """
+    jobs_secs: dict[str, float] = collections.defaultdict(float)
+    running_secs: dict[str, float] = collections.defaultdict(float)
+    for analysis in analyses:
+        jobs_secs[analysis.ci_provider] += analysis.jobs_secs
+        running_secs[analysis.ci_provider] += analysis.running_secs
+
+    return {
+        ci_provider: jobs_secs[ci_provider] / running_secs[ci_provider]
+        for ci_provider in jobs_secs
+        if running_secs[ci_provider] > 0
+    }
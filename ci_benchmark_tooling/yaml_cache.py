@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import collections
+import hashlib
+import threading
+import typing
+
+import yaml
+
+from ci_benchmark_tooling import constants
+
+
+if typing.TYPE_CHECKING:
+    import pathlib
+
+
+T = typing.TypeVar("T")
+
+# The libyaml loader is an order of magnitude faster than the pure Python one
+SafeLoader: type[yaml.SafeLoader] = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+class YamlCache:
+    """
+    Least recently used cache of parsed YAML documents, keyed by a hash of
+    their content, or by their path and modification time for files, along
+    with the indexes built from them.
+
+    The parsed documents and the indexes are shared by every caller, they
+    must not be modified.
+    """
+
+    def __init__(self, max_entries: int = constants.YAML_CACHE_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.entries: collections.OrderedDict[
+            tuple[typing.Any, ...],
+            typing.Any,
+        ] = collections.OrderedDict()
+
+    def get_or_compute(
+        self,
+        key: tuple[typing.Any, ...],
+        compute: typing.Callable[[], T],
+    ) -> T:
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                return typing.cast(T, self.entries[key])
+
+        # Computed without holding the lock, two threads may both compute
+        # the same entry, which is harmless
+        value = compute()
+        with self.lock:
+            self.entries[key] = value
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+
+YAML_CACHE = YamlCache()
+
+
+def get_string_key(yml_string: str) -> tuple[str, str]:
+    return ("string", hashlib.sha256(yml_string.encode()).hexdigest())
+
+
+def get_file_key(path: pathlib.Path) -> tuple[str, str, int, int]:
+    stat = path.stat()
+    return ("file", str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+
+
+def load(yml_string: str) -> typing.Any:
+    def parse() -> typing.Any:
+        return yaml.load(yml_string, Loader=SafeLoader)
+
+    return YAML_CACHE.get_or_compute(get_string_key(yml_string), parse)
+
+
+def get_index(yml_string: str, build_index: typing.Callable[[typing.Any], T]) -> T:
+    """
+    Returns the result of `build_index` on the parsed `yml_string`, only
+    computed once per document.
+    """
+    return YAML_CACHE.get_or_compute(
+        (*get_string_key(yml_string), build_index),
+        lambda: build_index(load(yml_string)),
+    )
+
+
+def load_file(path: pathlib.Path) -> typing.Any:
+    def read_and_load() -> typing.Any:
+        with open(path) as f:
+            return load(f.read())
+
+    return YAML_CACHE.get_or_compute(get_file_key(path), read_and_load)
+
+
+def get_file_index(
+    path: pathlib.Path,
+    build_index: typing.Callable[[typing.Any], T],
+) -> T:
+    """
+    Returns the result of `build_index` on the parsed file at `path`, only
+    computed again once the file changed.
+    """
+    return YAML_CACHE.get_or_compute(
+        (*get_file_key(path), build_index),
+        lambda: build_index(load_file(path)),
+    )
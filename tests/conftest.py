@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import typing
+
+import pytest
+
+from ci_benchmark_tooling import benchmark_tooling
+from ci_benchmark_tooling import fixtures
+from ci_benchmark_tooling import utils
+
+
+if typing.TYPE_CHECKING:
+    import pathlib
+
+    from ci_benchmark_tooling import types
+
+
+class ReplayFixtures(typing.Protocol):
+    def __call__(
+        self,
+        jobs: int,
+    ) -> list[tuple[types.CiToBenchmark, list[str]]]:
+        ...
+
+
+@pytest.fixture
+def replay_fixtures(
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> ReplayFixtures:
+    """
+    Returns a function writing the fixtures of a synthetic benchmark workflow
+    run of `jobs` jobs on each ci provider, and replaying them in the clients
+    created afterwards.
+    """
+
+    def write_fixtures(jobs: int) -> list[tuple[types.CiToBenchmark, list[str]]]:
+        fixtures_path = tmp_path / f"fixtures-{jobs}.jsonl.gz"
+        workflows_ids_per_ci = benchmark_tooling.write_synthetic_fixtures(
+            fixtures_path,
+            jobs,
+        )
+        monkeypatch.setenv(fixtures.REPLAY_FIXTURES_ENV_VARIABLE, str(fixtures_path))
+        monkeypatch.delenv(fixtures.REPLAY_LATENCY_ENV_VARIABLE, raising=False)
+        for ci_to_benchmark in utils.CIS_TO_BENCHMARK:
+            # The replayed requests never reach the apis
+            monkeypatch.setenv(ci_to_benchmark["token_env_variable"], "synthetic-token")
+        return workflows_ids_per_ci
+
+    return write_fixtures
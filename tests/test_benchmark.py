@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import typing
+
+import pytest
+
+from ci_benchmark_tooling import benchmark_tooling
+from ci_benchmark_tooling import constants
+
+
+if typing.TYPE_CHECKING:
+    import pathlib
+
+    from pytest_benchmark import fixture
+
+    from tests import conftest
+
+
+@pytest.mark.parametrize("use_async", [False, True], ids=["sync", "async"])
+@pytest.mark.parametrize("jobs", benchmark_tooling.DEFAULT_JOBS_COUNTS)
+def test_generate_report(
+    benchmark: fixture.BenchmarkFixture,
+    replay_fixtures: conftest.ReplayFixtures,
+    tmp_path: pathlib.Path,
+    jobs: int,
+    use_async: bool,
+) -> None:
+    workflows_ids_per_ci = replay_fixtures(jobs)
+    report_path = tmp_path / "report.csv"
+
+    benchmark.pedantic(  # type: ignore[no-untyped-call]
+        benchmark_tooling.generate_report,
+        args=(
+            report_path,
+            workflows_ids_per_ci,
+            use_async,
+            constants.DEFAULT_MAX_CONCURRENCY,
+        ),
+        rounds=3,
+        iterations=1,
+    )
+
+    with open(report_path) as f:
+        rows = f.read().splitlines()[1:]
+    ci_providers = {row.split(";")[0] for row in rows}
+    assert ci_providers == {"GitHub", "CircleCI"}
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import numpy as np
+
+from ci_benchmark_tooling import benchmark_statistics
+from ci_benchmark_tooling import constants
+from ci_benchmark_tooling import types
+
+
+def get_configuration(
+    runner_cores: int,
+    step_name: str = constants.CSV_BENCHMARKED_APPLICATION_STEP_NAME,
+) -> benchmark_statistics.Configuration:
+    return benchmark_statistics.Configuration(
+        "GitHub",
+        "ubuntu-22.04",
+        "GitHub-Hosted",
+        runner_cores,
+        "CPython",
+        step_name,
+        "",
+    )
+
+
+def test_outliers_mask() -> None:
+    samples = np.array([10.0, 11.0, 10.5, 9.5, 10.0, 100.0])
+    assert benchmark_statistics.get_outliers_mask(samples).tolist() == [
+        False,
+        False,
+        False,
+        False,
+        False,
+        True,
+    ]
+    # More than half of the samples are identical
+    assert not benchmark_statistics.get_outliers_mask(
+        np.array([10.0, 10.0, 10.0, 100.0]),
+    ).any()
+
+
+def test_configurations_samples() -> None:
+    lines = [
+        types.CsvDataLine(*get_configuration(cores)[:6], time, "")
+        for cores, time in ((2, 60), (4, 30), (2, 62))
+    ]
+    samples = benchmark_statistics.get_configurations_samples(lines)
+    assert list(samples) == [get_configuration(2), get_configuration(4)]
+    assert samples[get_configuration(2)].tolist() == [60, 62]
+
+
+def test_statistics() -> None:
+    rng = np.random.default_rng(0)
+    configuration = get_configuration(2)
+    [statistics] = benchmark_statistics.get_statistics(
+        {configuration: np.array([60.0, 61.0, 59.0, 60.0, 600.0])},
+        rng,
+    )
+
+    assert statistics.configuration == configuration
+    assert statistics.samples == 4
+    assert statistics.outliers == 1
+    assert statistics.mean == 60.0
+    assert statistics.ci_low is not None
+    assert statistics.ci_high is not None
+    assert statistics.ci_low <= statistics.mean <= statistics.ci_high
+
+
+def test_comparisons() -> None:
+    rng = np.random.default_rng(0)
+    samples = np.array([60.0, 61.0, 59.0, 60.0, 62.0, 58.0])
+    comparisons = benchmark_statistics.get_comparisons(
+        {
+            get_configuration(2): samples,
+            get_configuration(4): samples / 2,
+            get_configuration(8): samples / 2 + 0.1,
+            get_configuration(2, constants.CSV_QUEUE_TIME_STEP_NAME): samples,
+            get_configuration(4, constants.CSV_QUEUE_TIME_STEP_NAME): samples / 2,
+        },
+        rng,
+    )
+
+    # The queue time is not compared
+    assert [(c.first.runner_cores, c.second.runner_cores) for c in comparisons] == [
+        (2, 4),
+        (2, 8),
+        (4, 8),
+    ]
+    assert comparisons[0].significant
+    assert comparisons[0].verdict == f"{get_configuration(4)} is faster"
+    assert not comparisons[2].significant
+    assert comparisons[2].verdict == "No significant difference"
+
+
+def test_not_enough_samples() -> None:
+    rng = np.random.default_rng(0)
+    # A single run of each configuration, as with the default `--repetitions 1`
+    samples_per_configuration = {
+        get_configuration(2): np.array([60.0]),
+        get_configuration(4): np.array([30.0]),
+    }
+
+    statistics = benchmark_statistics.get_statistics(samples_per_configuration, rng)
+    assert [(s.samples, s.ci_low, s.ci_high) for s in statistics] == [
+        (1, None, None),
+        (1, None, None),
+    ]
+
+    [comparison] = benchmark_statistics.get_comparisons(
+        samples_per_configuration,
+        rng,
+    )
+    assert comparison.mean_difference == 30.0
+    assert comparison.ci_low is None
+    assert comparison.ci_high is None
+    assert not comparison.significant
+    assert comparison.verdict == "Not enough samples"
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import concurrent.futures
+import typing
+
+import httpx
+
+from ci_benchmark_tooling import cache
+
+
+if typing.TYPE_CHECKING:
+    import pathlib
+
+
+def test_response_cache_key_ignores_params_order() -> None:
+    assert cache.ResponseCache.get_key(
+        httpx.URL("https://api.github.com/jobs?per_page=100&page=2"),
+    ) == cache.ResponseCache.get_key(
+        httpx.URL("https://api.github.com/jobs?page=2&per_page=100"),
+    )
+
+
+def test_response_cache_survives_restart(tmp_path: pathlib.Path) -> None:
+    url = httpx.URL("https://api.github.com/jobs/1")
+    cache.ResponseCache(tmp_path).set(url, b'{"id": 1}')
+
+    response_cache = cache.ResponseCache(tmp_path)
+    assert response_cache.get(url) == b'{"id": 1}'
+    assert response_cache.get(httpx.URL("https://api.github.com/jobs/2")) is None
+
+
+def test_response_cache_evicts_least_recently_used(tmp_path: pathlib.Path) -> None:
+    urls = [httpx.URL(f"https://api.github.com/jobs/{i}") for i in range(3)]
+    response_cache = cache.ResponseCache(tmp_path, max_size_bytes=20)
+    response_cache.set(urls[0], b"0" * 10)
+    response_cache.set(urls[1], b"1" * 10)
+    # Reading the first entry makes the second one the least recently used
+    assert response_cache.get(urls[0]) == b"0" * 10
+    response_cache.set(urls[2], b"2" * 10)
+
+    assert response_cache.get(urls[0]) == b"0" * 10
+    assert response_cache.get(urls[1]) is None
+    assert response_cache.get(urls[2]) == b"2" * 10
+    assert len(list(tmp_path.glob("*.json"))) == 2
+
+
+def test_conditional_requests_cache_headers() -> None:
+    conditional_requests_cache = cache.ConditionalRequestsCache()
+    url = httpx.URL("https://api.github.com/runs/1")
+    assert conditional_requests_cache.get_conditional_headers(url) == {}
+
+    conditional_requests_cache.set(
+        httpx.Response(
+            200,
+            headers={
+                "Content-Type": "application/json; charset=utf-8",
+                "ETag": '"abc"',
+                "Last-Modified": "Thu, 01 Jun 2023 00:00:00 GMT",
+            },
+            content=b'{"id": 1}',
+            request=httpx.Request("GET", url),
+        ),
+    )
+
+    assert conditional_requests_cache.get_conditional_headers(url) == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Thu, 01 Jun 2023 00:00:00 GMT",
+    }
+    validated_response = conditional_requests_cache.get(url)
+    assert validated_response is not None
+    assert validated_response.content == b'{"id": 1}'
+
+
+def test_conditional_requests_cache_ignores_unvalidated_responses() -> None:
+    conditional_requests_cache = cache.ConditionalRequestsCache()
+    url = httpx.URL("https://api.github.com/runs/1")
+    conditional_requests_cache.set(
+        httpx.Response(200, content=b"{}", request=httpx.Request("GET", url)),
+    )
+    assert conditional_requests_cache.get(url) is None
+
+
+def test_conditional_requests_cache_max_entries() -> None:
+    conditional_requests_cache = cache.ConditionalRequestsCache(max_entries=2)
+    urls = [httpx.URL(f"https://api.github.com/runs/{i}") for i in range(3)]
+    for url in urls:
+        conditional_requests_cache.set(
+            httpx.Response(
+                200,
+                headers={"Content-Type": "application/json", "ETag": f'"{url.path}"'},
+                request=httpx.Request("GET", url),
+            ),
+        )
+
+    assert conditional_requests_cache.get(urls[0]) is None
+    assert conditional_requests_cache.get(urls[1]) is not None
+    assert conditional_requests_cache.get(urls[2]) is not None
+
+
+def test_response_cache_concurrent_access(tmp_path: pathlib.Path) -> None:
+    urls = [httpx.URL(f"https://api.github.com/jobs/{i}") for i in range(200)]
+    response_cache = cache.ResponseCache(tmp_path, max_size_bytes=50 * 10)
+
+    def set_and_get(url: httpx.URL) -> None:
+        response_cache.set(url, b"0" * 10)
+        response_cache.get(url)
+
+    with concurrent.futures.ThreadPoolExecutor(8) as executor:
+        list(executor.map(set_and_get, urls))
+
+    assert response_cache._total_size == 50 * 10
+    assert len(list(tmp_path.glob("*.json"))) == 50
+
+
+def test_conditional_requests_cache_concurrent_access() -> None:
+    conditional_requests_cache = cache.ConditionalRequestsCache(max_entries=50)
+    urls = [httpx.URL(f"https://api.github.com/runs/{i}") for i in range(200)]
+
+    def set_and_get(url: httpx.URL) -> None:
+        conditional_requests_cache.set(
+            httpx.Response(
+                200,
+                headers={"Content-Type": "application/json", "ETag": f'"{url.path}"'},
+                request=httpx.Request("GET", url),
+            ),
+        )
+        conditional_requests_cache.get_conditional_headers(url)
+
+    with concurrent.futures.ThreadPoolExecutor(8) as executor:
+        list(executor.map(set_and_get, urls))
+
+    assert sum(conditional_requests_cache.get(url) is not None for url in urls) == 50
+
+
+def test_conditional_requests_cache_ignores_non_json_responses() -> None:
+    conditional_requests_cache = cache.ConditionalRequestsCache()
+    url = httpx.URL("https://api.github.com/artifacts/1/zip")
+    conditional_requests_cache.set(
+        httpx.Response(
+            200,
+            headers={"Content-Type": "application/zip", "ETag": '"abc"'},
+            content=b"PK",
+            request=httpx.Request("GET", url),
+        ),
+    )
+    assert conditional_requests_cache.get(url) is None
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import datetime
+import typing
+
+from ci_benchmark_tooling import benchmark_tooling
+from ci_benchmark_tooling import constants
+from ci_benchmark_tooling import steps
+from ci_benchmark_tooling.clients import circleci
+
+
+if typing.TYPE_CHECKING:
+    from ci_benchmark_tooling.http_types import circleci_types
+
+
+def get_step(name: str, run_time_millis: int) -> circleci_types.JobDetailsStep:
+    return typing.cast(
+        "circleci_types.JobDetailsStep",
+        {"name": name, "actions": [{"run_time_millis": run_time_millis}]},
+    )
+
+
+JOB_STEPS = [
+    get_step("Spin up environment", 2500),
+    get_step(f"Clone {benchmark_tooling.SYNTHETIC_REPOSITORY}", 9000),
+    get_step("Configure CPython", 1600),
+    get_step("Build CPython", 1600),
+]
+
+
+def test_time_spent_per_job_steps() -> None:
+    # Each step is truncated to whole seconds before being summed
+    assert circleci.get_time_spent_per_job_steps(JOB_STEPS, "CPython") == {
+        "Spin up environment": datetime.timedelta(seconds=2),
+        constants.CSV_BENCHMARKED_APPLICATION_STEP_NAME: datetime.timedelta(seconds=2),
+    }
+
+
+def test_time_spent_per_job_steps_detailed() -> None:
+    assert circleci.get_time_spent_per_job_steps(
+        JOB_STEPS,
+        "CPython",
+        steps.StepsGrouping({}),
+    ) == {
+        "Spin up environment": datetime.timedelta(milliseconds=2500),
+        "Configure CPython": datetime.timedelta(milliseconds=1600),
+        "Build CPython": datetime.timedelta(milliseconds=1600),
+    }
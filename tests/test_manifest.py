@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import typing
+
+from ci_benchmark_tooling import benchmark_tooling
+from ci_benchmark_tooling import constants
+from ci_benchmark_tooling import fixtures
+from ci_benchmark_tooling import manifest
+from ci_benchmark_tooling.clients import circleci
+
+
+if typing.TYPE_CHECKING:
+    import datetime
+    import pathlib
+
+    import pytest
+
+    from ci_benchmark_tooling import types
+
+
+PIPELINES_URL = f"{circleci.BASE_URL}/project/gh/owner/repository/pipeline"
+
+
+def get_pipeline_interactions(
+    pipeline_id: str,
+    created_after_secs: int,
+    workflow_finished: bool,
+) -> list[fixtures.Interaction]:
+    return [
+        benchmark_tooling.get_json_interaction(
+            f"{circleci.BASE_URL}/pipeline/{pipeline_id}/workflow",
+            {
+                "items": [
+                    {
+                        "id": f"workflow-of-{pipeline_id}",
+                        "name": benchmark_tooling.SYNTHETIC_WORKFLOW_NAME,
+                        "pipeline_id": pipeline_id,
+                        # The workflows are created a few seconds after their pipeline
+                        "created_at": benchmark_tooling.get_date(
+                            created_after_secs + 5,
+                        ),
+                        "stopped_at": benchmark_tooling.get_date(
+                            created_after_secs + 600,
+                        )
+                        if workflow_finished
+                        else None,
+                        "status": "success" if workflow_finished else "running",
+                    },
+                ],
+                "next_page_token": None,
+            },
+        ),
+    ]
+
+
+def list_workflows_runs(
+    path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+    second_workflow_finished: bool,
+    created_since: datetime.datetime | None,
+) -> list[types.BenchmarkWorkflowRun]:
+    """
+    Returns the workflows runs of two pipelines, the second one
+    created an hour after the first.
+    """
+    fixtures.write_interactions(
+        path,
+        [
+            benchmark_tooling.get_json_interaction(
+                PIPELINES_URL,
+                {
+                    "items": [
+                        {
+                            "id": "second",
+                            "created_at": benchmark_tooling.get_date(3600),
+                        },
+                        {"id": "first", "created_at": benchmark_tooling.get_date(0)},
+                    ],
+                    "next_page_token": None,
+                },
+            ),
+            *get_pipeline_interactions("first", 0, True),
+            *get_pipeline_interactions("second", 3600, second_workflow_finished),
+        ],
+    )
+    monkeypatch.setenv(fixtures.REPLAY_FIXTURES_ENV_VARIABLE, str(path))
+    with circleci.CircleCiClient("synthetic-token") as client:
+        return client.get_benchmark_workflows_runs(
+            "owner",
+            "repository",
+            created_since,
+        )
+
+
+def test_unfinished_workflow_is_ingested_once_finished(
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    ci_prefix = constants.CIRCLECI_WORKFLOW_IDS_ENV_PREFIX
+    ingested_manifest = manifest.IngestedWorkflowsManifest()
+
+    workflows_runs = list_workflows_runs(
+        tmp_path / "running.jsonl.gz",
+        monkeypatch,
+        False,
+        ingested_manifest.get_high_water_mark(ci_prefix),
+    )
+    assert ingested_manifest.get_workflows_ids_to_ingest(ci_prefix, workflows_runs) == [
+        "workflow-of-first",
+    ]
+    ingested_manifest.update(ci_prefix, workflows_runs)
+
+    workflows_runs = list_workflows_runs(
+        tmp_path / "finished.jsonl.gz",
+        monkeypatch,
+        True,
+        ingested_manifest.get_high_water_mark(ci_prefix),
+    )
+    assert ingested_manifest.get_workflows_ids_to_ingest(ci_prefix, workflows_runs) == [
+        "workflow-of-second",
+    ]
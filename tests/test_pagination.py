@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import typing
+import uuid
+
+import httpx
+import pytest
+
+from ci_benchmark_tooling import benchmark_tooling
+from ci_benchmark_tooling import constants
+from ci_benchmark_tooling.clients import base
+from ci_benchmark_tooling.clients import circleci
+from ci_benchmark_tooling.clients import github
+
+
+if typing.TYPE_CHECKING:
+    from tests import conftest
+
+
+# More than `PAGINATION_MAX_PREFETCHED_PAGES` pages
+JOBS = constants.PAGINATION_PER_PAGE * 6 + 42
+
+GITHUB_JOBS_URL = f"{benchmark_tooling.GITHUB_API_URL}/repos/{benchmark_tooling.SYNTHETIC_REPOSITORY}/actions/runs/1/jobs"
+CIRCLECI_JOBS_URL = (
+    f"{benchmark_tooling.CIRCLECI_API_URL}/v2/workflow/{uuid.UUID(int=1)}/job"
+)
+
+
+def get_response(
+    url: str,
+    headers: dict[str, str] | None = None,
+    data: typing.Any = None,
+) -> httpx.Response:
+    return httpx.Response(
+        200,
+        headers=headers,
+        json=data,
+        request=httpx.Request("GET", url),
+    )
+
+
+def test_remaining_pages_urls() -> None:
+    url = "https://api.github.com/jobs?per_page=100"
+    response = get_response(
+        url,
+        headers={
+            "Link": f'<{url}&page=2>; rel="next", <{url}&page=4>; rel="last"',
+        },
+    )
+    assert base.get_remaining_pages_urls(response) == [
+        httpx.URL(f"{url}&page={page}") for page in (2, 3, 4)
+    ]
+
+
+def test_remaining_pages_urls_unknown() -> None:
+    url = "https://api.github.com/jobs"
+    assert base.get_remaining_pages_urls(get_response(url)) is None
+    assert (
+        base.get_remaining_pages_urls(
+            get_response(url, headers={"Link": f'<{url}?page=2>; rel="next"'}),
+        )
+        is None
+    )
+
+
+def test_next_page_url() -> None:
+    url = "https://circleci.com/api/v2/workflow/1/job"
+    assert base.get_next_page_url(
+        get_response(url, data={"items": [], "next_page_token": "abc"}),
+    ) == httpx.URL(f"{url}?page-token=abc")
+    assert (
+        base.get_next_page_url(
+            get_response(url, data={"items": [], "next_page_token": None}),
+        )
+        is None
+    )
+
+
+@pytest.mark.parametrize(
+    ("client_class", "url", "items_key"),
+    [
+        (github.GitHubClient, GITHUB_JOBS_URL, "jobs"),
+        (circleci.CircleCiClient, CIRCLECI_JOBS_URL, "items"),
+    ],
+)
+def test_paginate(
+    replay_fixtures: conftest.ReplayFixtures,
+    client_class: type[base.BaseClient],
+    url: str,
+    items_key: str,
+) -> None:
+    replay_fixtures(JOBS)
+    with client_class("synthetic-token") as client:
+        items = list(client.paginate(url, items_key))
+
+    assert len(items) == JOBS
+    assert len({item["id"] for item in items}) == JOBS
+
+
+@pytest.mark.parametrize(
+    ("client_class", "url", "items_key"),
+    [
+        (github.AsyncGitHubClient, GITHUB_JOBS_URL, "jobs"),
+        (circleci.AsyncCircleCiClient, CIRCLECI_JOBS_URL, "items"),
+    ],
+)
+def test_paginate_async(
+    replay_fixtures: conftest.ReplayFixtures,
+    client_class: type[base.AsyncBaseClient],
+    url: str,
+    items_key: str,
+) -> None:
+    replay_fixtures(JOBS)
+
+    async def get_items() -> list[typing.Any]:
+        async with client_class("synthetic-token") as client:
+            return [item async for item in client.paginate(url, items_key)]
+
+    items = asyncio.run(get_items())
+
+    assert len(items) == JOBS
+    assert len({item["id"] for item in items}) == JOBS
+
+
+def test_paginate_stops_early(replay_fixtures: conftest.ReplayFixtures) -> None:
+    replay_fixtures(JOBS)
+    with github.GitHubClient("synthetic-token") as client:
+        # The pages prefetched in the background are cancelled once the
+        # listing isn't read anymore
+        first_items = list(
+            itertools.islice(client.paginate(GITHUB_JOBS_URL, "jobs"), 3),
+        )
+
+    assert [item["id"] for item in first_items] == [10000, 10001, 10002]
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import datetime
+
+from ci_benchmark_tooling import constants
+from ci_benchmark_tooling import polling
+
+
+NOW = datetime.datetime(2023, 6, 1, tzinfo=constants.UTC)
+
+
+def test_wait_for_expected_end() -> None:
+    scheduler = polling.PollingScheduler(
+        {"Benchmark CPython": datetime.timedelta(minutes=3)},
+        jitter=0,
+    )
+    workflow = polling.PolledWorkflow(
+        "Benchmark CPython",
+        NOW - datetime.timedelta(minutes=1),
+    )
+    assert scheduler.get_next_delay([workflow], NOW) == 120
+
+
+def test_overdue_workflow_backoff_is_capped() -> None:
+    scheduler = polling.PollingScheduler(
+        {"Benchmark CPython": datetime.timedelta(minutes=3)},
+    )
+    workflow = polling.PolledWorkflow(
+        "Benchmark CPython",
+        NOW - datetime.timedelta(minutes=10),
+    )
+    delays = [scheduler.get_next_delay([workflow], NOW) for _ in range(100)]
+
+    assert delays[0] <= constants.POLLING_MIN_DELAY_SECONDS * (
+        1 + constants.POLLING_JITTER_RATIO
+    )
+    assert max(delays) <= constants.POLLING_MAX_BACKOFF_DELAY_SECONDS
+
+
+def test_backoff_without_history_is_capped() -> None:
+    scheduler = polling.PollingScheduler({})
+    workflows = [polling.PolledWorkflow("Benchmark CPython", None)]
+    delays = [scheduler.get_next_delay(workflows, NOW) for _ in range(100)]
+
+    assert max(delays) <= constants.POLLING_MAX_BACKOFF_DELAY_SECONDS
+    # The backoff still grows up to the cap
+    assert delays[-1] > constants.POLLING_MAX_BACKOFF_DELAY_SECONDS / 2
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import datetime
+
+import pytest
+
+from ci_benchmark_tooling import constants
+from ci_benchmark_tooling import pricing
+from ci_benchmark_tooling import types
+
+
+def get_workflow_data(
+    ci_provider: str,
+    runner_os: str,
+    runner_type: str,
+    times: list[tuple[str, int]],
+    additional_infos: str = "",
+) -> types.WorkflowRunData:
+    return types.WorkflowRunData(
+        workflow_id="1",
+        created_at=datetime.datetime(2023, 6, 1, tzinfo=constants.UTC),
+        commit_sha="0" * 40,
+        csv_data=[
+            types.CsvDataLine(
+                ci_provider,
+                runner_os,
+                runner_type,
+                2,
+                "CPython",
+                step_name,
+                time_spent,
+                additional_infos,
+            )
+            for step_name, time_spent in times
+        ],
+        ci_provider=ci_provider,
+        workflow_name="Benchmark CPython",
+        jobs=[],
+    )
+
+
+@pytest.mark.parametrize(
+    ("runner_os", "runner_os_family"),
+    [
+        ("ubuntu-22.04", "Linux"),
+        ("windows-server-2019-vs2019:2022.08.1", "Windows"),
+        ("macos-13", "macOS"),
+        ("xcode:14.2.0", "macOS"),
+        ("freebsd", None),
+    ],
+)
+def test_runner_os_family(runner_os: str, runner_os_family: str | None) -> None:
+    assert pricing.get_runner_os_family(runner_os) == runner_os_family
+
+
+def test_billed_minutes() -> None:
+    assert pricing.get_billed_minutes("GitHub", "GitHub-Hosted", 61) == 2
+    assert pricing.get_billed_minutes("GitHub", "Self-Hosted AWS EC2", 90) == 1.5
+    assert pricing.get_billed_minutes("CircleCI", "CircleCI-Hosted", 90) == 1.5
+
+
+def test_get_prices() -> None:
+    prices_index = pricing.RunnerPricesIndex.from_csv_file(
+        pricing.RUNNER_PRICES_CSV_FILE,
+    )
+
+    [github_hosted] = prices_index.get_prices(
+        pricing.BuildConfiguration(
+            "GitHub",
+            "ubuntu-22.04",
+            "GitHub-Hosted",
+            2,
+            "CPython",
+            "",
+        ),
+    )
+    assert github_hosted.runner_name == ""
+
+    self_hosted = prices_index.get_prices(
+        pricing.BuildConfiguration(
+            "GitHub",
+            "ubuntu-22.04",
+            "Self-Hosted AWS EC2 t2.large",
+            2,
+            "CPython",
+            "",
+        ),
+    )
+    assert len(self_hosted) == 2
+    assert all(p.runner_name.startswith("Self-Hosted") for p in self_hosted)
+
+
+def test_builds_costs() -> None:
+    prices_index = pricing.RunnerPricesIndex(
+        [pricing.RunnerPrice("GitHub", "macOS", "", 2, 0.08)],
+    )
+    [build_cost] = pricing.get_builds_costs(
+        [
+            get_workflow_data(
+                "GitHub",
+                "macos-13",
+                "GitHub-Hosted",
+                [
+                    (constants.CSV_QUEUE_TIME_STEP_NAME, 600),
+                    ("Set up job", 10),
+                    (constants.CSV_BENCHMARKED_APPLICATION_STEP_NAME, 100),
+                ],
+            ),
+        ],
+        prices_index,
+    )
+
+    # The queue time is not billed
+    assert build_cost.mean_time_spent_in_secs == 110
+    assert build_cost.billed_minutes_per_build == 2
+    assert build_cost.included_minutes_per_build == 20
+    assert build_cost.cost_per_build == pytest.approx(0.16)
+
+
+def test_builds_costs_without_price() -> None:
+    assert (
+        pricing.get_builds_costs(
+            [
+                get_workflow_data(
+                    "GitHub",
+                    "ubuntu-22.04",
+                    "GitHub-Hosted",
+                    [("Build", 60)],
+                ),
+            ],
+            pricing.RunnerPricesIndex([]),
+        )
+        == []
+    )
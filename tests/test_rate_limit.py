@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import time
+
+import httpx
+
+from ci_benchmark_tooling import constants
+from ci_benchmark_tooling import rate_limit
+
+
+def get_response(
+    status_code: int = 200,
+    headers: dict[str, str] | None = None,
+) -> httpx.Response:
+    return httpx.Response(
+        status_code,
+        headers=headers,
+        request=httpx.Request("GET", "https://api.github.com/"),
+    )
+
+
+def get_rate_limit_headers(
+    limit: int,
+    remaining: int,
+    reset_at: float,
+) -> dict[str, str]:
+    return {
+        "X-RateLimit-Limit": str(limit),
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": str(reset_at),
+    }
+
+
+def test_retry_after_seconds() -> None:
+    assert rate_limit.get_retry_after_seconds(get_response()) is None
+    assert (
+        rate_limit.get_retry_after_seconds(get_response(headers={"Retry-After": "3"}))
+        == 3.0
+    )
+    assert (
+        rate_limit.get_retry_after_seconds(
+            get_response(headers={"Retry-After": "Thu, 01 Jun 2023"}),
+        )
+        is None
+    )
+
+
+def test_unknown_budget_is_not_delayed() -> None:
+    rate_limiter = rate_limit.RateLimiter("api.github.com")
+    now = time.time()
+    for _ in range(constants.RATE_LIMIT_BURST * 2):
+        assert rate_limiter._get_delay("low", now) == 0
+
+    assert rate_limiter.get_budget().requests == constants.RATE_LIMIT_BURST * 2
+
+
+def test_update_keeps_lowest_remaining_budget() -> None:
+    rate_limiter = rate_limit.RateLimiter("api.github.com")
+    reset_at = time.time() + 3600
+    rate_limiter.update(
+        get_response(headers=get_rate_limit_headers(5000, 10, reset_at)),
+    )
+    rate_limiter.update(
+        get_response(headers=get_rate_limit_headers(5000, 20, reset_at)),
+    )
+
+    budget = rate_limiter.get_budget()
+    assert budget.limit == 5000
+    assert budget.remaining == 10
+
+
+def test_not_modified_responses_are_not_counted() -> None:
+    rate_limiter = rate_limit.RateLimiter("api.github.com")
+    reset_at = time.time() + 3600
+    rate_limiter.update(
+        get_response(headers=get_rate_limit_headers(5000, 10, reset_at)),
+    )
+    assert rate_limiter._get_delay("high", time.time()) == 0
+    assert rate_limiter.get_budget().remaining == 9
+
+    rate_limiter.update(get_response(304))
+    assert rate_limiter.get_budget().remaining == 10
+
+
+def test_low_priority_leaves_reserved_budget() -> None:
+    rate_limiter = rate_limit.RateLimiter("api.github.com")
+    now = time.time()
+    reserved = int(5000 * constants.RATE_LIMIT_RESERVED_RATIO)
+    rate_limiter.update(
+        get_response(headers=get_rate_limit_headers(5000, reserved, now + 60)),
+    )
+
+    assert rate_limiter._get_delay("low", now) > 0
+    assert rate_limiter._get_delay("high", now) == 0
+
+
+def test_exhausted_budget_waits_for_reset() -> None:
+    rate_limiter = rate_limit.RateLimiter("api.github.com")
+    now = time.time()
+    rate_limiter.update(get_response(headers=get_rate_limit_headers(5000, 0, now + 60)))
+
+    assert 0 < rate_limiter._get_delay("high", now) <= 60
+    # Once reset, the whole budget is available again
+    assert rate_limiter._get_delay("high", now + 61) == 0
+    assert rate_limiter.get_budget().remaining == 4999
+
+
+def test_throttled_response_blocks_requests() -> None:
+    rate_limiter = rate_limit.RateLimiter("circleci.com")
+    rate_limiter.update(get_response(429, headers={"Retry-After": "30"}))
+
+    budget = rate_limiter.get_budget()
+    assert budget.throttled_responses == 1
+    assert 29 < rate_limiter._get_delay("high", time.time()) <= 30
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import csv
+import datetime
+import typing
+
+from ci_benchmark_tooling import constants
+from ci_benchmark_tooling import report_writer
+from ci_benchmark_tooling import types
+
+
+if typing.TYPE_CHECKING:
+    import pathlib
+
+
+def get_workflow_data(workflow_id: str) -> types.WorkflowRunData:
+    created_at = datetime.datetime(2023, 6, 1, tzinfo=constants.UTC)
+    return types.WorkflowRunData(
+        workflow_id=workflow_id,
+        created_at=created_at,
+        commit_sha="0" * 40,
+        csv_data=[
+            types.CsvDataLine(
+                "GitHub",
+                "ubuntu-22.04",
+                "GitHub-Hosted",
+                2,
+                "CPython",
+                constants.CSV_BENCHMARKED_APPLICATION_STEP_NAME,
+                60,
+                "",
+            ),
+        ],
+        ci_provider="GitHub",
+        workflow_name="Benchmark CPython",
+        jobs=[
+            types.WorkflowJob(
+                "CPython",
+                created_at,
+                created_at + datetime.timedelta(minutes=1),
+                (),
+            ),
+        ],
+    )
+
+
+def read_report_times(path: pathlib.Path) -> list[str]:
+    with open(path) as f:
+        rows = list(csv.reader(f, delimiter=";"))
+    assert rows[0] == list(report_writer.CSV_HEADER)
+    return [row[6] for row in rows[1:]]
+
+
+def test_write_and_read_back(tmp_path: pathlib.Path) -> None:
+    report_path = tmp_path / "report.csv"
+    with report_writer.ReportWriter(report_path) as report:
+        report.write(get_workflow_data("1"))
+        report.write(get_workflow_data("2"))
+        assert list(report.read_workflows_data()) == [
+            get_workflow_data("1"),
+            get_workflow_data("2"),
+        ]
+        assert len(report.read_table()) == 2
+        assert not report_path.exists()
+        report.commit()
+
+    assert read_report_times(report_path) == ["60", "60"]
+    assert not report.checkpoint_path.exists()
+    assert not report.tmp_path.exists()
+
+
+def test_resume_interrupted_report(tmp_path: pathlib.Path) -> None:
+    report_path = tmp_path / "report.csv"
+    with report_writer.ReportWriter(
+        report_path,
+        parameters={"ids": ("1", "2")},
+    ) as report:
+        report.write(get_workflow_data("1"))
+    # Rows written after the last checkpoint entry, by an interrupted write
+    with open(report.tmp_path, "a") as f:
+        f.write("GitHub;ubuntu-22.04;GitHub-Hosted;2;CPyt")
+
+    with report_writer.ReportWriter(
+        report_path,
+        parameters={"ids": ("1", "2")},
+    ) as report:
+        assert report.workflows_ids == {"1"}
+        report.write(get_workflow_data("2"))
+        report.commit()
+
+    assert read_report_times(report_path) == ["60", "60"]
+
+
+def test_discard_checkpoint_of_other_parameters(tmp_path: pathlib.Path) -> None:
+    report_path = tmp_path / "report.csv"
+    with report_writer.ReportWriter(report_path, parameters={"ids": ["1"]}) as report:
+        report.write(get_workflow_data("1"))
+
+    with report_writer.ReportWriter(report_path, parameters={"ids": ["2"]}) as report:
+        assert report.workflows_ids == set()
+        report.write(get_workflow_data("2"))
+        assert [w.workflow_id for w in report.read_workflows_data()] == ["2"]
+        report.commit()
+
+    assert read_report_times(report_path) == ["60"]
+
+
+def test_append_to_existing_report(tmp_path: pathlib.Path) -> None:
+    report_path = tmp_path / "report.csv"
+    with report_writer.ReportWriter(report_path) as report:
+        report.write(get_workflow_data("1"))
+        report.commit()
+
+    with report_writer.ReportWriter(report_path, append=True) as report:
+        report.write(get_workflow_data("2"))
+        report.commit()
+
+    assert read_report_times(report_path) == ["60", "60"]
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import typing
+
+from ci_benchmark_tooling import store
+from ci_benchmark_tooling import types
+
+
+if typing.TYPE_CHECKING:
+    import pathlib
+
+
+def get_record(
+    workflow_id: str,
+    run_timestamp: int,
+    runner_cores: int,
+    time_spent_in_secs: int,
+) -> types.BenchmarkRecord:
+    return types.BenchmarkRecord(
+        ci_provider="GitHub",
+        runner_os="ubuntu-22.04",
+        runner_type="GitHub-Hosted",
+        runner_cores=runner_cores,
+        tested_repository="CPython",
+        step_name="Build",
+        time_spent_in_secs=time_spent_in_secs,
+        additional_infos="",
+        run_timestamp=run_timestamp,
+        commit_sha="0" * 40,
+        workflow_id=workflow_id,
+    )
+
+
+def test_runs_times(tmp_path: pathlib.Path) -> None:
+    benchmark_store = store.BenchmarkStore(tmp_path)
+    assert benchmark_store.get_runs_times(("runner_cores",)) == {}
+
+    benchmark_store.append(
+        [
+            # Appended before an older run
+            get_record("latest", 200, 2, 30),
+            get_record("latest", 200, 2, 32),
+            get_record("latest", 200, 4, 15),
+            get_record("oldest", 100, 2, 60),
+            get_record("oldest", 100, 2, 1),
+            # Same creation date as the oldest run
+            get_record("other", 100, 2, 10),
+        ],
+    )
+
+    assert benchmark_store.get_runs_times(("runner_cores",)) == {
+        (2,): [
+            store.RunTime(100, "oldest", 61),
+            store.RunTime(100, "other", 10),
+            store.RunTime(200, "latest", 62),
+        ],
+        (4,): [store.RunTime(200, "latest", 15)],
+    }
+    assert benchmark_store.get_runs_times(("ci_provider", "step_name")) == {
+        ("GitHub", "Build"): [
+            store.RunTime(100, "oldest", 61),
+            store.RunTime(100, "other", 10),
+            store.RunTime(200, "latest", 77),
+        ],
+    }
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import datetime
+
+import pytest
+
+from ci_benchmark_tooling import constants
+from ci_benchmark_tooling import types
+from ci_benchmark_tooling import workflow_graph
+
+
+CREATED_AT = datetime.datetime(2023, 6, 1, tzinfo=constants.UTC)
+
+
+def get_job(
+    name: str,
+    started_after_secs: int | None,
+    duration_secs: int,
+    dependencies: tuple[str, ...] = (),
+) -> types.WorkflowJob:
+    if started_after_secs is None:
+        return types.WorkflowJob(name, None, None, dependencies)
+
+    started_at = CREATED_AT + datetime.timedelta(seconds=started_after_secs)
+    return types.WorkflowJob(
+        name,
+        started_at,
+        started_at + datetime.timedelta(seconds=duration_secs),
+        dependencies,
+    )
+
+
+def get_workflow_data(jobs: list[types.WorkflowJob]) -> types.WorkflowRunData:
+    return types.WorkflowRunData(
+        workflow_id="1",
+        created_at=CREATED_AT,
+        commit_sha="0" * 40,
+        csv_data=[],
+        ci_provider="CircleCI",
+        workflow_name="Benchmark CPython",
+        jobs=jobs,
+    )
+
+
+def test_critical_path() -> None:
+    jobs = [
+        get_job("lint", 10, 30),
+        get_job("build", 10, 100),
+        get_job("test", 110, 60, ("build", "lint")),
+        get_job("docs", 40, 20, ("lint",)),
+        # Dependencies outside of the workflow run are ignored
+        get_job("deploy", 170, 10, ("test", "approval")),
+    ]
+    assert workflow_graph.get_critical_path(jobs) == (
+        ("build", "test", "deploy"),
+        170.0,
+    )
+
+
+def test_critical_path_of_jobs_that_did_not_run() -> None:
+    assert workflow_graph.get_critical_path([]) == ((), 0.0)
+    assert workflow_graph.get_critical_path([get_job("build", None, 0)]) == (
+        ("build",),
+        0.0,
+    )
+
+
+def test_workflow_graph_analysis() -> None:
+    analysis = workflow_graph.get_workflow_graph_analysis(
+        get_workflow_data(
+            [
+                get_job("build", 20, 100),
+                get_job("lint", 20, 50),
+                get_job("test", 120, 60, ("build",)),
+            ],
+        ),
+    )
+
+    assert analysis.jobs == 3
+    assert analysis.wall_clock_secs == 180
+    assert analysis.running_secs == 160
+    assert analysis.jobs_secs == 210
+    assert analysis.critical_path == ("build", "test")
+    assert analysis.parallelism == pytest.approx(210 / 160)
+
+
+def test_workflows_graph_analyses_skip_cycles() -> None:
+    analyses = workflow_graph.get_workflows_graph_analyses(
+        [
+            get_workflow_data(
+                [get_job("a", 0, 10, ("b",)), get_job("b", 0, 10, ("a",))],
+            ),
+            get_workflow_data([get_job("a", 0, 10)]),
+        ],
+    )
+    assert len(analyses) == 1
+    assert workflow_graph.get_providers_parallelism(analyses) == {"CircleCI": 1.0}